@@ -0,0 +1,10 @@
+import importlib
+
+__all__ = ["AsyncConverter", "ConversionResult", "aconvert"]
+
+
+def __getattr__(name):
+    # Loaded on first use, so ``import jupdeck`` doesn't pull in pandas and python-pptx
+    if name in __all__:
+        return getattr(importlib.import_module("jupdeck.core.aio"), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
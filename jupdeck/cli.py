@@ -2,9 +2,402 @@
 """CLI script to parse a notebook and generate a PowerPoint report."""
 
 import argparse
+import json
+import sys
+import time
+from dataclasses import asdict
+from functools import partial
 from pathlib import Path
 
-from jupdeck.core import parser, renderer
+from jupdeck.core import (
+    budget,
+    build,
+    charts,
+    combine,
+    events,
+    inspector,
+    linked_media,
+    parser,
+    preview,
+    renderer,
+    scheduler,
+    serialization,
+    slide_index,
+    split,
+    workqueue,
+)
+from jupdeck.core.slide_cache import SlideCache
+
+MB = 1024 * 1024
+EXIT_BUDGET_EXCEEDED = 3
+
+
+def _print_summary(parsed, ppt_renderer, output: Path) -> None:
+    if parsed.get("skipped_cells"):
+        print(f"Skipped {parsed['skipped_cells']} hidden cell(s)")
+    if ppt_renderer.overflowing_slides:
+        slides = ", ".join(str(n) for n in ppt_renderer.overflowing_slides)
+        print(f"⚠️ Content may overflow on slide(s): {slides}")
+    print(f"✅ Report generated: {output}")
+
+
+def _print_previews(previews) -> None:
+    for preview_renderer in previews:
+        print(f"✅ Preview saved: {preview_renderer.output_path}")
+
+
+def _add_budget_arguments(subparser, reporting: bool = True) -> None:
+    group = subparser.add_argument_group("resource budgets")
+    group.add_argument("--max-image-mb", type=float,
+                       help="Image bytes per deck; further images become placeholders")
+    group.add_argument("--max-table-rows", type=int,
+                       help="Rows parsed per table; longer tables are truncated")
+    group.add_argument("--max-output-mb", type=float,
+                       help="Cell output bytes per notebook; further outputs become placeholders")
+    group.add_argument("--timeout", type=float,
+                       help="Seconds of parsing per notebook; remaining cells are skipped")
+    if not reporting:
+        return
+    group.add_argument("--budget-report", action="store_true",
+                       help="Print every budget decision")
+    group.add_argument("--fail-on-budget", action="store_true",
+                       help=f"Exit with status {EXIT_BUDGET_EXCEEDED} if any budget was exceeded")
+
+
+def _add_slide_cache_argument(subparser) -> None:
+    subparser.add_argument("--slide-cache", type=Path, nargs="?", const=True, default=None,
+                           metavar="DIR",
+                           help="Reuse slides rendered by earlier runs "
+                                "(default DIR: ~/.cache/jupdeck/slides)")
+
+
+def _slide_cache_from_args(args) -> SlideCache | None:
+    if args.slide_cache is None:
+        return None
+    return SlideCache(None if args.slide_cache is True else args.slide_cache)
+
+
+def _add_selection_arguments(subparser) -> None:
+    group = subparser.add_argument_group("slide selection",
+                                         "Parse and render only some of the slides")
+    group.add_argument("--slides", type=slide_index.parse_slide_ranges, metavar="RANGES",
+                       help="Slide numbers to convert, e.g. 10-20 or 1-3,7,40-")
+    group.add_argument("--section", action="append", default=[], metavar="TITLE",
+                       help="Convert the section (or slide) with this title; repeatable")
+    group.add_argument("--cache-index", action="store_true",
+                       help="Keep the notebook's slide index in <notebook>"
+                            f"{slide_index.INDEX_SUFFIX}")
+
+
+def _parse(input_path: Path, args, limits, reporter=None) -> dict:
+    """Parse the whole notebook, or only the slides selected by --slides/--section."""
+    slides = getattr(args, "slides", None)
+    sections = getattr(args, "section", None)
+    if not slides and not sections:
+        return parser.parse_notebook(input_path, budget=limits, reporter=reporter)
+    parsed = slide_index.parse_notebook_slides(input_path, slides or (), sections or (),
+                                               budget=limits, cache_index=args.cache_index,
+                                               reporter=reporter)
+    print(f"Selected slide(s) {slide_index.format_slide_numbers(parsed['selected_slides'])} "
+          f"of {parsed['total_slides']}")
+    return parsed
+
+
+def _add_charts_argument(subparser) -> None:
+    subparser.add_argument("--charts", choices=charts.MODES, default="tagged",
+                           help="Draw tables as native charts: only on slides with a chart "
+                                "directive (tagged, the default), also for any simple "
+                                "numeric table (auto), or never (off)")
+
+
+def _add_output_notes_argument(subparser) -> None:
+    subparser.add_argument("--output-notes", action="store_true",
+                           help="Add the first and last lines each code cell printed to "
+                                "the speaker notes")
+
+
+def _add_link_media_argument(subparser) -> None:
+    subparser.add_argument("--link-media", action="store_true",
+                           help="Write images once to <deck>_media/ next to the deck and "
+                                "link to them instead of embedding them")
+
+
+def _linked_media_dir(output_path: Path, args):
+    return linked_media.media_dir(output_path) if args.link_media else None
+
+
+def _preview_renderer(output_path: Path, input_path: Path, args) -> preview.HtmlPreviewRenderer:
+    return preview.HtmlPreviewRenderer(
+        output_path=output_path,
+        include_speaker_notes=not args.no_speaker_notes,
+        include_attribution=not args.no_attribution,
+        input_path=input_path,
+        charts=args.charts,
+        output_notes=args.output_notes,
+    )
+
+
+def _preview_is_stale(args, built_path: Path) -> bool:
+    """Whether ``convert --preview`` has to run although the deck is up to date."""
+    preview_path = getattr(args, "preview", None)
+    return bool(preview_path) and (not preview_path.exists() or not built_path.exists() or
+                                   preview_path.stat().st_mtime < built_path.stat().st_mtime)
+
+
+def _add_reproducible_argument(subparser) -> None:
+    subparser.add_argument("--reproducible", action="store_true",
+                           help="Write byte-for-byte identical files for identical content "
+                                "(fixed timestamps, honouring SOURCE_DATE_EPOCH)")
+
+
+def _add_event_arguments(subparser) -> None:
+    group = subparser.add_argument_group("progress", "Report progress while converting")
+    group.add_argument("--events", type=Path, metavar="FILE",
+                       help="Append progress events to FILE as JSON lines (- for stdout)")
+    group.add_argument("--progress", action="store_true",
+                       help="Show progress and an ETA on stderr")
+    group.add_argument("--metrics", type=Path, metavar="FILE",
+                       help="Keep Prometheus text-format metrics in FILE")
+
+
+def _reporter_from_args(args) -> events.EventReporter:
+    sinks = []
+    if args.events:
+        stream = sys.stdout if str(args.events) == "-" \
+            else args.events.open("a", encoding="utf-8")
+        sinks.append(events.JsonLinesSink(stream))
+    if args.progress:
+        sinks.append(events.ProgressDisplay(sys.stderr))
+    if args.metrics:
+        sinks.append(events.MetricsFile(args.metrics))
+    return events.EventReporter(*sinks)
+
+
+def _deck_bytes(output_path: Path, args) -> int:
+    """Size of a converted notebook's deck, or of all its parts when split."""
+    if _split_policy_from_args(args) is None:
+        return output_path.stat().st_size
+    index = json.loads(split.index_path(output_path).read_text(encoding="utf-8"))
+    return sum((output_path.parent / part["path"]).stat().st_size for part in index["parts"])
+
+
+def _add_split_arguments(subparser) -> None:
+    group = subparser.add_argument_group("splitting",
+                                         "Write <output>_partN.pptx decks and an "
+                                         "<output>_parts.json index instead of one deck")
+    group.add_argument("--split-slides", type=int, metavar="N",
+                       help="At most N slides per part")
+    group.add_argument("--split-mb", type=float, metavar="MB",
+                       help="At most about MB megabytes per part")
+    group.add_argument("--split-sections", action="store_true",
+                       help="Start a new part at every section directive")
+
+
+def _split_policy_from_args(args) -> split.SplitPolicy | None:
+    policy = split.SplitPolicy(
+        max_slides=args.split_slides,
+        max_bytes=int(args.split_mb * MB) if args.split_mb is not None else None,
+        by_section=args.split_sections,
+    )
+    return None if policy.is_unlimited else policy
+
+
+def _budget_from_args(args) -> budget.Budget | None:
+    limits = budget.Budget(
+        max_image_bytes=int(args.max_image_mb * MB) if args.max_image_mb is not None else None,
+        max_table_rows=args.max_table_rows,
+        max_output_bytes=int(args.max_output_mb * MB) if args.max_output_mb is not None else None,
+        max_seconds=args.timeout,
+    )
+    return None if limits.is_unlimited else limits
+
+
+def _finish_budget(decisions, args) -> None:
+    if args.budget_report:
+        print(budget.format_report(decisions))
+    elif decisions:
+        print(f"⚠️ {len(decisions)} budget limit(s) hit (see --budget-report)")
+    if decisions and args.fail_on_budget:
+        sys.exit(EXIT_BUDGET_EXCEEDED)
+
+
+def _build_options(args, limits, policy=None) -> dict:
+    """Options that change the rendered deck, recorded in the build manifest."""
+    return {
+        "include_speaker_notes": not args.no_speaker_notes,
+        "include_attribution": not args.no_attribution,
+        "budget": asdict(limits) if limits else None,
+        "split": asdict(policy) if policy else None,
+        "slides": getattr(args, "slides", None),
+        "sections": getattr(args, "section", None) or None,
+        "reproducible": args.reproducible,
+        "charts": args.charts,
+        "output_notes": args.output_notes,
+        "link_media": args.link_media,
+    }
+
+
+def _build_target(output_path: Path, args) -> tuple:
+    """(file the build manifest tracks, options recorded with it) for an output deck."""
+    limits = _budget_from_args(args)
+    policy = _split_policy_from_args(args)
+    built_path = split.index_path(output_path) if policy else output_path
+    return built_path, _build_options(args, limits, policy)
+
+
+def _convert(input_path: Path, output_path: Path, args,
+             manifest: build.BuildManifest | None = None,
+             slide_cache: SlideCache | None = None,
+             reporter: events.EventReporter | None = None):
+    """
+    Convert one notebook unless the manifest says its deck is up to date.
+    Returns the budget decisions made, or None when the notebook was skipped.
+    """
+    reporter = reporter or events.EventReporter()
+    built_path, options = _build_target(output_path, args)
+    if manifest is not None and not args.force and not _preview_is_stale(args, built_path) and \
+            manifest.is_up_to_date(input_path, built_path, options):
+        print(f"⏭️ Up to date: {built_path}")
+        reporter.emit("notebook_skipped", notebook=str(input_path))
+        return None
+
+    start = time.perf_counter()
+    reporter.emit("notebook_started", notebook=str(input_path))
+    try:
+        decisions, slides = _convert_notebook(input_path, output_path, args, manifest,
+                                              slide_cache, reporter)
+    except Exception as e:
+        reporter.emit("notebook_failed", notebook=str(input_path),
+                      error=f"{type(e).__name__}: {e}")
+        raise
+    reporter.emit("notebook_finished", notebook=str(input_path), slides=slides,
+                  seconds=round(time.perf_counter() - start, 6),
+                  bytes=_deck_bytes(output_path, args))
+    return decisions
+
+
+def _convert_notebook(input_path: Path, output_path: Path, args, manifest, slide_cache,
+                      reporter: events.EventReporter):
+    """Parse and render one notebook. Returns (budget decisions, slides written)."""
+    limits = _budget_from_args(args)
+    policy = _split_policy_from_args(args)
+    built_path, options = _build_target(output_path, args)
+
+    # Parse the notebook
+    parsed = _parse(input_path, args, limits, reporter)
+    previews = [_preview_renderer(args.preview, input_path, args)] \
+        if getattr(args, "preview", None) else []
+
+    if policy:
+        index = split.split_presentation(
+            parsed, output_path, policy,
+            workers=args.workers,
+            include_speaker_notes=not args.no_speaker_notes,
+            include_attribution=not args.no_attribution,
+            input_path=input_path,
+            budget=limits,
+            slide_cache=slide_cache,
+            reporter=reporter,
+            reproducible=args.reproducible,
+            charts=args.charts,
+            output_notes=args.output_notes,
+            linked_media_dir=_linked_media_dir(output_path, args),
+        )
+        if manifest is not None:
+            manifest.record(input_path, built_path, options)
+            manifest.save()
+        for part in index.parts:
+            print(f"  {part.path}: slides {part.first_slide}-{part.last_slide}")
+        for preview_renderer in previews:
+            preview_renderer.render_presentation(parsed)
+        _print_summary(parsed, index, built_path)
+        _print_previews(previews)
+        return index.budget_decisions, index.parts[-1].last_slide
+
+    # Render to PowerPoint
+    ppt_renderer = renderer.PowerPointRenderer(
+        output_path = output_path,
+        include_speaker_notes = not args.no_speaker_notes,
+        include_attribution = not args.no_attribution,
+        input_path = input_path,
+        workers = args.workers,
+        budget = limits,
+        slide_cache = slide_cache,
+        reporter = reporter,
+        reproducible = args.reproducible,
+        charts = args.charts,
+        output_notes = args.output_notes,
+        linked_media_dir = _linked_media_dir(output_path, args),
+        )
+    # One parse, and one set of slide groups, for the deck and its preview
+    renderer.render_with_backends(parsed, [ppt_renderer] + previews)
+
+    if manifest is not None:
+        manifest.record(input_path, output_path, options)
+        manifest.save()
+    _print_summary(parsed, ppt_renderer, output_path)
+    _print_previews(previews)
+    decisions = parsed.get("budget_decisions", []) + ppt_renderer.budget_tracker.decisions
+    return decisions, len(ppt_renderer.prs.slides)
+
+
+def _convert_scheduled(input_path: Path, output_path: Path, args):
+    """Scheduler job: convert one notebook in a worker process; the parent records the build."""
+    return _convert(input_path, output_path, args, slide_cache=_slide_cache_from_args(args))
+
+
+def _batch_scheduled(args, manifest: build.BuildManifest, reporter: events.EventReporter):
+    """
+    Convert the batch in worker processes under the memory ceiling.
+    Returns (built, skipped, budget decisions).
+    """
+    jobs = []
+    for input_path in args.inputs:
+        output_path = args.output_dir / f"{input_path.stem}.pptx"
+        built_path, options = _build_target(output_path, args)
+        if not args.force and manifest.is_up_to_date(input_path, built_path, options):
+            print(f"⏭️ Up to date: {built_path}")
+            reporter.emit("notebook_skipped", notebook=str(input_path))
+        else:
+            jobs.append((input_path, output_path))
+
+    def started(report):
+        reporter.emit("notebook_started", notebook=str(report.input_path))
+
+    def finished(report):
+        notebook = str(report.input_path)
+        if report.error:
+            reporter.emit("notebook_failed", notebook=notebook, error=report.error)
+            return
+        deck_bytes = _deck_bytes(report.output_path, args)
+        built_path, _ = _build_target(report.output_path, args)
+        reporter.emit("deck_saved", path=str(built_path), bytes=deck_bytes)
+        reporter.emit("notebook_finished", notebook=notebook, seconds=round(report.seconds, 6),
+                      bytes=deck_bytes)
+
+    reports = scheduler.run_scheduled(
+        jobs,
+        partial(_convert_scheduled, args=args),
+        workers=args.parallel,
+        memory_limit=int(args.memory_limit * MB) if args.memory_limit else None,
+        on_finished=finished,
+        on_started=started,
+    )
+    decisions, failed = [], 0
+    for report in reports:
+        if report.error:
+            failed += 1
+            print(f"❌ {report.input_path}: {report.error}")
+            continue
+        built_path, options = _build_target(report.output_path, args)
+        manifest.record(report.input_path, built_path, options)
+        decisions += report.result
+    manifest.save()
+    if args.memory_report:
+        print(scheduler.format_report(reports))
+    if failed:
+        print(f"⚠️ {failed} notebook(s) failed")
+    return len(reports) - failed, len(args.inputs) - len(jobs), decisions
 
 
 def main():
@@ -17,23 +410,304 @@ def main():
     convert_parser.add_argument("output", type=Path, help="Path to output PowerPoint file (.pptx)")
     convert_parser.add_argument("--no-speaker-notes", action="store_true", help="Exclude speaker notes from slides")
     convert_parser.add_argument("--no-attribution", action="store_true", help="Exclude attribution from slides")
-    
+    convert_parser.add_argument("-j", "--workers", type=int, default=1,
+                                help="Render slides in this many worker processes")
+    convert_parser.add_argument("--force", action="store_true",
+                                help="Rebuild even if the deck is up to date")
+    convert_parser.add_argument("--preview", type=Path, metavar="HTML",
+                                help="Also write an HTML preview of the slides, "
+                                     "from the same parse")
+    _add_slide_cache_argument(convert_parser)
+    _add_split_arguments(convert_parser)
+    _add_selection_arguments(convert_parser)
+    _add_charts_argument(convert_parser)
+    _add_output_notes_argument(convert_parser)
+    _add_link_media_argument(convert_parser)
+    _add_reproducible_argument(convert_parser)
+    _add_event_arguments(convert_parser)
+    _add_budget_arguments(convert_parser)
+
+    # Batch subcommand: one deck per notebook, skipping unchanged notebooks
+    batch_parser = subparsers.add_parser("batch", help="Convert many notebooks, one deck each")
+    batch_parser.add_argument("inputs", type=Path, nargs="+", help="Notebooks to convert")
+    batch_parser.add_argument("-o", "--output-dir", type=Path, required=True,
+                              help="Directory for the decks (<notebook name>.pptx)")
+    batch_parser.add_argument("--no-speaker-notes", action="store_true",
+                              help="Exclude speaker notes from slides")
+    batch_parser.add_argument("--no-attribution", action="store_true",
+                              help="Exclude attribution from slides")
+    batch_parser.add_argument("-j", "--workers", type=int, default=1,
+                              help="Render slides in this many worker processes")
+    batch_parser.add_argument("--force", action="store_true",
+                              help="Rebuild every deck, even if up to date")
+    _add_slide_cache_argument(batch_parser)
+    _add_split_arguments(batch_parser)
+    schedule_group = batch_parser.add_argument_group(
+        "scheduling", "Convert several notebooks at once, largest first")
+    schedule_group.add_argument("--parallel", type=int, metavar="N",
+                                help="Notebooks converted at once in worker processes")
+    schedule_group.add_argument("--memory-limit", type=float, metavar="MB",
+                                help="Start a notebook only while the predicted memory of "
+                                     "those running stays under MB")
+    schedule_group.add_argument("--memory-report", action="store_true",
+                                help="Print predicted and actual peak memory per notebook")
+    _add_charts_argument(batch_parser)
+    _add_output_notes_argument(batch_parser)
+    _add_link_media_argument(batch_parser)
+    _add_reproducible_argument(batch_parser)
+    _add_event_arguments(batch_parser)
+    _add_budget_arguments(batch_parser)
+
+    # Parse subcommand: save the parsed notebook for a later render stage
+    parse_parser = subparsers.add_parser("parse", help="Parse notebook to an intermediate file")
+    parse_parser.add_argument("input", type=Path, help="Path to input notebook (.ipynb)")
+    parse_parser.add_argument("output", type=Path,
+                              help="Path to parsed output (.jdeck for binary, otherwise JSON)")
+
+    # Render subcommand: render a file written by `jupdeck parse`
+    render_parser = subparsers.add_parser("render", help="Render a parsed notebook to PowerPoint")
+    render_parser.add_argument("input", type=Path, help="Path to parsed notebook (.jdeck or JSON)")
+    render_parser.add_argument("output", type=Path, help="Path to output PowerPoint file (.pptx)")
+    render_parser.add_argument("--no-speaker-notes", action="store_true",
+                               help="Exclude speaker notes from slides")
+    render_parser.add_argument("--no-attribution", action="store_true",
+                               help="Exclude attribution from slides")
+    _add_charts_argument(render_parser)
+    _add_output_notes_argument(render_parser)
+    _add_link_media_argument(render_parser)
+    _add_reproducible_argument(render_parser)
+
+    # Preview subcommand: the slide structure as HTML, without building a deck
+    preview_parser = subparsers.add_parser("preview", help="Preview the slides as HTML")
+    preview_parser.add_argument("input", type=Path,
+                                help="Notebook (.ipynb) or parsed notebook (.jdeck or JSON)")
+    preview_parser.add_argument("-o", "--output", type=Path,
+                                help="Path to the HTML file (default: <input>.html)")
+    preview_parser.add_argument("--no-speaker-notes", action="store_true",
+                                help="Leave out speaker notes")
+    preview_parser.add_argument("--no-attribution", action="store_true",
+                                help="Leave out the attribution slide")
+    _add_charts_argument(preview_parser)
+    _add_output_notes_argument(preview_parser)
+
+    # Combine subcommand: many notebooks into one deck
+    combine_parser = subparsers.add_parser("combine", help="Combine notebooks into one deck")
+    combine_parser.add_argument("inputs", type=Path, nargs="*",
+                                help="Notebooks to combine, in order")
+    combine_parser.add_argument("-o", "--output", type=Path, required=True,
+                                help="Path to output PowerPoint file (.pptx)")
+    combine_parser.add_argument("--manifest", type=Path,
+                                help="File listing the notebooks (and section titles) in order")
+    combine_parser.add_argument("--section-dividers", action="store_true",
+                                help="Add a section header slide before each notebook")
+    combine_parser.add_argument("-j", "--workers", type=int, default=1,
+                                help="Number of parser and renderer processes, "
+                                     "sharing one pool (default: 1)")
+    combine_parser.add_argument("--no-speaker-notes", action="store_true",
+                                help="Exclude speaker notes from slides")
+    combine_parser.add_argument("--no-attribution", action="store_true",
+                                help="Exclude attribution from slides")
+    _add_slide_cache_argument(combine_parser)
+    _add_charts_argument(combine_parser)
+    _add_output_notes_argument(combine_parser)
+    _add_link_media_argument(combine_parser)
+    _add_reproducible_argument(combine_parser)
+    _add_event_arguments(combine_parser)
+    _add_budget_arguments(combine_parser)
+
+    # Submit subcommand: add conversion jobs to a shared work queue
+    submit_parser = subparsers.add_parser("submit", help="Queue notebooks for jupdeck workers")
+    submit_parser.add_argument("inputs", type=Path, nargs="+", help="Notebooks to convert")
+    submit_parser.add_argument("--queue", type=Path, required=True,
+                               help="Queue directory shared with the workers")
+    submit_parser.add_argument("-o", "--output-dir", type=Path,
+                               help="Directory for the decks (default: next to each notebook)")
+    submit_parser.add_argument("--no-speaker-notes", action="store_true",
+                               help="Exclude speaker notes from slides")
+    submit_parser.add_argument("--no-attribution", action="store_true",
+                               help="Exclude attribution from slides")
+    _add_budget_arguments(submit_parser, reporting=False)
+
+    # Worker subcommand: convert jobs from a shared work queue
+    worker_parser = subparsers.add_parser("worker", help="Convert jobs from a work queue")
+    worker_parser.add_argument("--queue", type=Path, required=True,
+                               help="Queue directory shared with other workers")
+    worker_parser.add_argument("--poll", type=float, default=workqueue.DEFAULT_POLL_INTERVAL,
+                               help="Seconds between checks of an empty queue")
+    worker_parser.add_argument("--stale-after", type=float,
+                               default=workqueue.DEFAULT_STALE_AFTER,
+                               help="Seconds without a heartbeat before another worker's "
+                                    "claim is retried")
+    worker_parser.add_argument("--max-attempts", type=int,
+                               default=workqueue.DEFAULT_MAX_ATTEMPTS,
+                               help="Claims per job before it is marked failed")
+    worker_parser.add_argument("--max-jobs", type=int, help="Exit after this many jobs")
+    worker_parser.add_argument("--exit-when-idle", action="store_true",
+                               help="Exit when no job is pending instead of waiting")
+
+    # Inspect subcommand: summarise a deck without loading it, for CI checks
+    inspect_parser = subparsers.add_parser("inspect", help="Summarise a generated deck")
+    inspect_parser.add_argument("deck", type=Path, help="Path to the PowerPoint file (.pptx)")
+    inspect_parser.add_argument("--notebook", type=Path,
+                                help="Notebook (or parsed notebook) the deck was made from; "
+                                     "report content missing from the deck")
+    inspect_parser.add_argument("--json", action="store_true",
+                                help="Print the summary as JSON")
+
     args = parser_main.parse_args()
 
     if args.command == "convert":
-        # Parse the notebook
+        slide_cache = _slide_cache_from_args(args)
+        with _reporter_from_args(args) as reporter:
+            try:
+                decisions = _convert(args.input, args.output, args,
+                                     build.BuildManifest.for_output(args.output), slide_cache,
+                                     reporter)
+            except slide_index.SlideSelectionError as e:
+                parser_main.error(str(e))
+        if slide_cache and decisions is not None:
+            print(slide_cache.format_stats())
+        if decisions is not None:
+            _finish_budget(decisions, args)
+
+    elif args.command == "batch":
+        args.output_dir.mkdir(parents=True, exist_ok=True)
+        manifest = build.BuildManifest(args.output_dir)
+        slide_cache = _slide_cache_from_args(args)
+        built, skipped, decisions = 0, 0, []
+        start = time.perf_counter()
+        with _reporter_from_args(args) as reporter:
+            reporter.emit("batch_started", notebooks=len(args.inputs))
+            if args.parallel or args.memory_limit:
+                built, skipped, decisions = _batch_scheduled(args, manifest, reporter)
+                slide_cache = None  # its hits are counted in the worker processes
+            else:
+                for input_path in args.inputs:
+                    result = _convert(input_path, args.output_dir / f"{input_path.stem}.pptx",
+                                      args, manifest, slide_cache, reporter)
+                    if result is None:
+                        skipped += 1
+                    else:
+                        built += 1
+                        decisions += result
+            reporter.emit("batch_finished", built=built, skipped=skipped,
+                          failed=len(args.inputs) - built - skipped,
+                          seconds=round(time.perf_counter() - start, 6))
+        print(f"Built {built}, skipped {skipped} up-to-date notebook(s)")
+        if slide_cache and built:
+            print(slide_cache.format_stats())
+        _finish_budget(decisions, args)
+
+    elif args.command == "parse":
         parsed = parser.parse_notebook(args.input)
+        parsed["source"] = args.input.name
+        serialization.save(parsed, args.output)
+        print(f"✅ Parsed notebook saved: {args.output}")
 
-        # Render to PowerPoint
+    elif args.command == "render":
+        parsed = serialization.load(args.input)
         ppt_renderer = renderer.PowerPointRenderer(
             output_path = args.output,
             include_speaker_notes = not args.no_speaker_notes,
             include_attribution = not args.no_attribution,
-            input_path = args.input
+            input_path = Path(parsed.get("source", args.input.name)),
+            reproducible = args.reproducible,
+            charts = args.charts,
+            output_notes = args.output_notes,
+            linked_media_dir = _linked_media_dir(args.output, args),
             )
         ppt_renderer.render_presentation(parsed)
+        _print_summary(parsed, ppt_renderer, args.output)
+
+    elif args.command == "preview":
+        start = time.perf_counter()
+        if args.input.suffix == ".ipynb":
+            parsed, input_path = parser.parse_notebook(args.input), args.input
+        else:
+            parsed = serialization.load(args.input)
+            input_path = Path(parsed.get("source", args.input.name))
+        output = args.output or args.input.with_suffix(".html")
+        preview_renderer = _preview_renderer(output, input_path, args)
+        preview_renderer.render_presentation(parsed)
+        print(f"✅ Preview saved: {output} ({len(preview_renderer.slides)} slide(s) in "
+              f"{(time.perf_counter() - start) * 1000:.0f} ms)")
+
+    elif args.command == "combine":
+        entries = combine.read_manifest(args.manifest) if args.manifest else []
+        entries += [combine.ManifestEntry(path) for path in args.inputs]
+        if not entries:
+            parser_main.error("combine needs input notebooks or --manifest")
+
+        with _reporter_from_args(args) as reporter:
+            ppt_renderer = combine.combine_notebooks(
+                entries,
+                args.output,
+                section_dividers=args.section_dividers,
+                workers=args.workers,
+                include_speaker_notes=not args.no_speaker_notes,
+                include_attribution=not args.no_attribution,
+                budget=_budget_from_args(args),
+                slide_cache=_slide_cache_from_args(args),
+                reporter=reporter,
+                reproducible=args.reproducible,
+                charts=args.charts,
+                output_notes=args.output_notes,
+                linked_media_dir=_linked_media_dir(args.output, args),
+            )
+        print(f"Combined {len(entries)} notebook(s)")
+        _print_summary({}, ppt_renderer, args.output)
+        if ppt_renderer.slide_cache:
+            print(ppt_renderer.slide_cache.format_stats())
+        _finish_budget(ppt_renderer.budget_tracker.decisions, args)
+
+    elif args.command == "submit":
+        queue = workqueue.WorkQueue(args.queue)
+        options = workqueue.job_options(
+            include_speaker_notes=not args.no_speaker_notes,
+            include_attribution=not args.no_attribution,
+            budget=_budget_from_args(args),
+        )
+        for input_path in args.inputs:
+            output_dir = args.output_dir or input_path.parent
+            job = queue.submit(input_path, output_dir / f"{input_path.stem}.pptx", options)
+            print(f"Queued {job.id}: {job.input_path} -> {job.output_path}")
+
+    elif args.command == "worker":
+        def report(job):
+            if job.state == "done":
+                print(f"✅ {job.id}: {job.output_path} ({job.slides} slide(s))")
+            else:
+                print(f"❌ {job.id}: {job.error}")
+
+        queue = workqueue.WorkQueue(args.queue)
+        processed = workqueue.run_worker(
+            queue,
+            poll_interval=args.poll,
+            stale_after=args.stale_after,
+            max_attempts=args.max_attempts,
+            max_jobs=args.max_jobs,
+            exit_when_idle=args.exit_when_idle,
+            on_finished=report,
+        )
+        counts = ", ".join(f"{count} {state}" for state, count in queue.counts().items())
+        print(f"Ran {processed} job(s); queue: {counts}")
+
+    elif args.command == "inspect":
+        summary = inspector.inspect_deck(args.deck)
+        issues = [f"missing image in {where}" for where in summary.missing_images]
+        if args.notebook:
+            parsed = serialization.load(args.notebook) if args.notebook.suffix != ".ipynb" \
+                else parser.parse_notebook(args.notebook)
+            issues = inspector.compare_with_notebook(summary, parsed)
 
-        print(f"✅ Report generated: {args.output}")
+        if args.json:
+            print(json.dumps({**asdict(summary), "issues": issues}, indent=2))
+        else:
+            print(summary.format())
+            for issue in issues:
+                print(f"⚠️ {issue}")
+        if issues:
+            sys.exit(1)
 
 
 if __name__ == "__main__":
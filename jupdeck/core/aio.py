@@ -0,0 +1,165 @@
+# aio.py
+"""Asyncio API for converting notebooks without blocking the event loop.
+
+``aconvert`` reads the notebook and writes the deck in threads (``asyncio.to_thread``)
+and runs the CPU-heavy parse and render stages in an executor: the loop's default
+thread pool unless one is given. Pass a ``ProcessPoolExecutor`` to convert several
+notebooks in parallel on multiple cores.
+
+Cancelling a conversion stops it at the next stage boundary. A stage that is
+already running in an executor cannot be interrupted, but its result is
+discarded and the output file is never written, or left half-written: the deck
+goes to a temporary file that is renamed into place.
+
+``AsyncConverter`` shares one executor and one semaphore between conversions,
+so a service can await many at once while only a few run at a time::
+
+    converter = AsyncConverter(max_concurrency=4)
+    results = await converter.convert_many([("a.ipynb", "a.pptx"), ("b.ipynb", "b.pptx")])
+"""
+
+import asyncio
+import os
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import nbformat
+
+from jupdeck.core import parser
+from jupdeck.core.budget import Budget, BudgetDecision
+from jupdeck.core.renderer import PowerPointRenderer
+
+
+@dataclass
+class ConversionResult:
+    output_path: Path
+    slides: int
+    skipped_cells: int = 0
+    overflowing_slides: List[int] = field(default_factory=list)
+    budget_decisions: List[BudgetDecision] = field(default_factory=list)
+
+
+def parse_stage(notebook_text: str, source: str, budget: Optional[Budget] = None) -> Dict[str, Any]:
+    """Parse notebook file contents; runs in the executor."""
+    nb = nbformat.reads(notebook_text, as_version=4)
+    return parser.parse_notebook_node(nb, source, budget)
+
+
+def render_stage(parsed: Dict[str, Any], input_path: Path, output_path: Path,
+                 include_speaker_notes: bool = True, include_attribution: bool = True,
+                 budget: Optional[Budget] = None) -> Tuple[bytes, ConversionResult]:
+    """
+    Render a parsed notebook and return the .pptx contents; runs in the executor.
+    Exported table files are written next to ``output_path`` by this stage.
+    """
+    ppt_renderer = PowerPointRenderer(
+        output_path=output_path,
+        include_speaker_notes=include_speaker_notes,
+        include_attribution=include_attribution,
+        input_path=input_path,
+        budget=budget,
+    )
+    ppt_renderer.build_presentation(parsed)
+    result = ConversionResult(
+        output_path=output_path,
+        slides=len(ppt_renderer.prs.slides),
+        skipped_cells=parsed.get("skipped_cells", 0),
+        overflowing_slides=ppt_renderer.overflowing_slides,
+        budget_decisions=parsed.get("budget_decisions", []) + ppt_renderer.budget_tracker.decisions,
+    )
+    return ppt_renderer.to_bytes(), result
+
+
+def convert_file(input_path: Path, output_path: Path, include_speaker_notes: bool = True,
+                 include_attribution: bool = True,
+                 budget: Optional[Budget] = None) -> ConversionResult:
+    """Convert a notebook synchronously, as the stages above do; the deck is written atomically."""
+    input_path, output_path = Path(input_path), Path(output_path)
+    parsed = parser.parse_notebook(input_path, budget=budget)
+    data, result = render_stage(parsed, input_path, output_path,
+                                include_speaker_notes, include_attribution, budget)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    write_atomically(output_path, data)
+    return result
+
+
+def write_atomically(path: Path, data: bytes) -> None:
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{id(data):x}.tmp")
+    try:
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+async def aconvert(
+    input_path,
+    output_path,
+    *,
+    include_speaker_notes: bool = True,
+    include_attribution: bool = True,
+    budget: Optional[Budget] = None,
+    executor: Optional[Executor] = None,
+    semaphore: Optional[asyncio.Semaphore] = None,
+) -> ConversionResult:
+    """
+    Convert a notebook to a presentation without blocking the event loop.
+
+    ``executor`` runs the parse and render stages (default: the loop's thread
+    pool) and ``semaphore``, when given, is held for the whole conversion.
+    """
+    if semaphore is not None:
+        async with semaphore:
+            return await aconvert(
+                input_path, output_path, include_speaker_notes=include_speaker_notes,
+                include_attribution=include_attribution, budget=budget, executor=executor)
+
+    input_path, output_path = Path(input_path), Path(output_path)
+    loop = asyncio.get_running_loop()
+
+    notebook_text = await asyncio.to_thread(input_path.read_text, encoding="utf-8")
+    parsed = await loop.run_in_executor(
+        executor, parse_stage, notebook_text, input_path.name, budget)
+    data, result = await loop.run_in_executor(executor, partial(
+        render_stage, parsed, input_path, output_path,
+        include_speaker_notes, include_attribution, budget))
+    await asyncio.to_thread(write_atomically, output_path, data)
+    return result
+
+
+class AsyncConverter:
+    """Runs conversions on a shared executor, at most ``max_concurrency`` at a time."""
+
+    def __init__(self, max_concurrency: int = 4, executor: Optional[Executor] = None,
+                 **options):
+        self.executor = executor
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.options = options  # default keyword arguments for aconvert
+
+    async def convert(self, input_path, output_path, **options) -> ConversionResult:
+        return await aconvert(input_path, output_path, executor=self.executor,
+                              semaphore=self.semaphore, **{**self.options, **options})
+
+    async def convert_many(self, jobs: Iterable[Tuple[Any, Any]],
+                           return_exceptions: bool = False) -> List[Any]:
+        """
+        Convert ``(input_path, output_path)`` pairs concurrently, returning results
+        in order. With ``return_exceptions`` a failed conversion's exception takes
+        the place of its result; without it the first failure cancels the other
+        conversions, as cancelling ``aconvert`` does, and is raised once they
+        have stopped.
+        """
+        tasks = [asyncio.ensure_future(self.convert(input_path, output_path))
+                 for input_path, output_path in jobs]
+        if return_exceptions:
+            return await asyncio.gather(*tasks, return_exceptions=True)
+        try:
+            return await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
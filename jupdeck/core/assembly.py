@@ -0,0 +1,200 @@
+# assembly.py
+"""Render slides in worker processes and assemble them into one presentation.
+
+Each worker renders a chunk of slide groups with its own PowerPointRenderer and
+returns self-contained slide parts: the slide's shape tree XML, its speaker
+notes XML and the media and charts it refers to. The main process then adds one
+slide per part to its own presentation, re-creates the media relationships
+(storing each distinct image once) and chart parts, and rewrites the
+relationship ids in the XML. Slide ids are assigned by the main presentation
+exactly as a sequential render would, and workers are told the id of each slide
+they render so any file names derived from it (e.g. exported tables) match too.
+"""
+
+import hashlib
+import math
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from lxml import etree
+from pptx.opc.constants import CONTENT_TYPE as CT
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.oxml import parse_xml
+from pptx.oxml.ns import qn
+from pptx.parts.chart import ChartPart
+
+from jupdeck.core import linked_media
+from jupdeck.core.models import ParsedCell
+
+CHUNKS_PER_WORKER = 4  # smaller chunks balance uneven slides across workers
+_RELATIONSHIP_ATTRIBUTES = (qn("r:embed"), qn("r:link"), qn("r:id"))
+
+
+@dataclass
+class SlidePart:
+    layout_index: int
+    shapes_xml: bytes  # the slide's <p:spTree>
+    image_rels: Dict[str, str] = field(default_factory=dict)  # rId in shapes_xml -> media sha1
+    # rId in shapes_xml -> (chart XML, embedded workbook or None)
+    chart_rels: Dict[str, Tuple[bytes, Optional[bytes]]] = field(default_factory=dict)
+    notes_xml: Optional[bytes] = None  # <p:txBody> of the notes placeholder
+    overflow: bool = False
+
+
+@dataclass
+class RenderedChunk:
+    slides: List[SlidePart]
+    media: Dict[str, bytes]  # sha1 -> image bytes, each distinct image once
+
+
+def extract_slide_part(slide, layout_index: int, media: Dict[str, bytes],
+                       linked=None) -> SlidePart:
+    """
+    Capture a rendered slide as a SlidePart, adding its images to ``media``.
+    Images linked from the ``linked`` sidecar (see ``linked_media``) are read
+    back, so a part can be inserted into a deck that embeds its images.
+    """
+    part = SlidePart(layout_index, etree.tostring(slide.shapes._spTree))
+
+    for rId, rel in slide.part.rels.items():
+        if rel.reltype == RT.IMAGE and (not rel.is_external or linked is not None):
+            blob = linked.read(rel.target_ref) if rel.is_external else rel.target_part.blob
+            sha1 = hashlib.sha1(blob).hexdigest()
+            media.setdefault(sha1, blob)
+            part.image_rels[rId] = sha1
+        elif rel.reltype == RT.CHART:
+            chart_part = rel.target_part
+            xlsx_part = chart_part.chart_workbook.xlsx_part
+            part.chart_rels[rId] = (chart_part.blob, xlsx_part.blob if xlsx_part else None)
+
+    if slide.has_notes_slide:
+        notes_placeholder = slide.notes_slide.notes_placeholder
+        if notes_placeholder is not None:
+            part.notes_xml = etree.tostring(notes_placeholder._element.txBody)
+    return part
+
+
+def last_slide_part(renderer, media: Dict[str, bytes]) -> SlidePart:
+    """The renderer's most recently added slide as a SlidePart."""
+    slide = renderer.prs.slides[-1]
+    part = extract_slide_part(slide, renderer.prs.slide_layouts.index(slide.slide_layout), media,
+                              renderer.linked_media)
+    part.overflow = bool(renderer.overflowing_slides) and \
+        renderer.overflowing_slides[-1] == len(renderer.prs.slides)
+    return part
+
+
+def render_chunk(parsed_contents: List[ParsedCell], options: dict,
+                 slide_ids: List[int]) -> RenderedChunk:
+    """Worker entry point: render slide groups and return them as slide parts."""
+    from jupdeck.core.renderer import PowerPointRenderer  # avoids a circular import
+
+    renderer = PowerPointRenderer(**options)
+    renderer.slide_ids = list(slide_ids)
+
+    media: Dict[str, bytes] = {}
+    slides = []
+    for parsed_content in parsed_contents:
+        renderer._render_parsed_contents(parsed_content)
+        slides.append(last_slide_part(renderer, media))
+    return RenderedChunk(slides, media)
+
+
+def insert_slide_part(renderer, part: SlidePart, media: Dict[str, bytes]):
+    """Append a slide built from ``part`` to the renderer's presentation."""
+    slide = renderer._add_slide(renderer.prs.slide_layouts[part.layout_index])
+
+    rId_map = {}
+    for old_rId, sha1 in part.image_rels.items():
+        rId_map[old_rId] = renderer.relate_image(slide, media[sha1], sha1)
+    for old_rId, (chart_xml, xlsx_blob) in part.chart_rels.items():
+        rId_map[old_rId] = slide.part.relate_to(_chart_part(slide.part.package, chart_xml,
+                                                            xlsx_blob), RT.CHART)
+
+    shapes = parse_xml(part.shapes_xml)
+    set_mode = linked_media.link if renderer.linked_media is not None else linked_media.embed
+    for blip in shapes.iter(qn("a:blip")):
+        set_mode(blip)  # the part may come from a deck that linked its images, or didn't
+    if rId_map:
+        for element in shapes.iter():
+            for attribute in _RELATIONSHIP_ATTRIBUTES:
+                rId = element.get(attribute)
+                if rId in rId_map:
+                    element.set(attribute, rId_map[rId])
+    old_shapes = slide.shapes._spTree
+    old_shapes.getparent().replace(old_shapes, shapes)
+
+    if part.notes_xml is not None:
+        notes_shape = slide.notes_slide.notes_placeholder._element
+        notes_shape.replace(notes_shape.txBody, parse_xml(part.notes_xml))
+
+    if part.overflow:
+        renderer.overflowing_slides.append(len(renderer.prs.slides))
+    return slide
+
+
+def _chart_part(package, chart_xml: bytes, xlsx_blob: Optional[bytes]) -> ChartPart:
+    # The chart XML refers to its workbook by an rId of the worker's chart part;
+    # update_from_xlsx_blob relates the new workbook and rewrites that rId
+    chart_part = ChartPart.load(package.next_partname(ChartPart.partname_template),
+                                CT.DML_CHART, package, chart_xml)
+    if xlsx_blob is not None:
+        chart_part._element.externalData.getparent().remove(chart_part._element.externalData)
+        chart_part.chart_workbook.update_from_xlsx_blob(xlsx_blob)
+    return chart_part
+
+
+def next_slide_id(prs) -> int:
+    return prs.slides._sldIdLst._next_id
+
+
+def chunk(items: list, n_chunks: int) -> List[list]:
+    size = max(1, math.ceil(len(items) / n_chunks))
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def _rendered_parts(futures):
+    for future in futures:  # in order, so slides are assembled in sequence
+        rendered = future.result()
+        for part in rendered.slides:
+            yield part, rendered.media
+
+
+def render_in_parallel(renderer, parsed_contents: List[ParsedCell], workers: int,
+                       executor: Optional[Executor] = None) -> None:
+    """
+    Render slide groups in ``workers`` processes and assemble them into ``renderer``.
+    Slides found in the renderer's slide cache are copied in directly; the rest
+    are rendered by the workers and added to the cache. A process pool is started
+    for the call unless ``executor`` is given.
+    """
+    first_id = next_slide_id(renderer.prs)
+    keys = [renderer.slide_cache_key(parsed_content) for parsed_content in parsed_contents]
+    cached = {}
+    for index, key in enumerate(keys):
+        entry = renderer.slide_cache.get(key) if key else None
+        if entry is not None:
+            cached[index] = entry
+
+    to_render = [index for index in range(len(parsed_contents)) if index not in cached]
+    chunks = chunk(to_render, workers * CHUNKS_PER_WORKER)
+    options = renderer.worker_options()
+
+    pool = nullcontext(executor) if executor else ProcessPoolExecutor(max_workers=workers)
+    with pool as executor:
+        futures = [executor.submit(render_chunk, [parsed_contents[i] for i in indices], options,
+                                   [first_id + i for i in indices])
+                   for indices in chunks]
+        rendered = _rendered_parts(futures)
+        for index, key in enumerate(keys):
+            if index in cached:
+                insert_slide_part(renderer, *cached.pop(index))
+                renderer.slide_rendered(cached=True)
+                continue
+            part, media = next(rendered)
+            insert_slide_part(renderer, part, media)
+            if key:
+                renderer.slide_cache.put(key, part, media)
+            renderer.slide_rendered(cached=False if key else None)
@@ -0,0 +1,182 @@
+# budget.py
+"""Resource limits for oversized or hostile notebooks.
+
+A Budget sets the limits; a BudgetTracker counts usage against them while a
+notebook is parsed (table rows, output bytes, wall time) or a deck is rendered
+(image bytes), degrades content that goes over (truncating tables, replacing
+outputs and images with placeholders, skipping the rest of a notebook) and
+records a BudgetDecision for each step so the CLI can report it or fail.
+"""
+
+import re
+import time
+from dataclasses import dataclass, replace
+from typing import Any, Dict, List, Optional
+
+from jupdeck.core.lazy import ImageSpan
+from jupdeck.core.models import ParsedCell
+
+_ROW_END = re.compile(r"</tr\s*>", re.IGNORECASE)
+_TBODY_START = re.compile(r"<tbody[^>]*>", re.IGNORECASE)
+
+
+@dataclass
+class Budget:
+    max_image_bytes: Optional[int] = None   # decoded image bytes per deck
+    max_table_rows: Optional[int] = None    # data rows parsed per table
+    max_output_bytes: Optional[int] = None  # cell output bytes per notebook
+    max_seconds: Optional[float] = None     # parse time per notebook
+
+    @property
+    def is_unlimited(self) -> bool:
+        return all(limit is None for limit in
+                   (self.max_image_bytes, self.max_table_rows,
+                    self.max_output_bytes, self.max_seconds))
+
+
+@dataclass
+class BudgetDecision:
+    limit: str   # "image_bytes", "table_rows", "output_bytes" or "wall_time"
+    action: str  # "truncated", "placeholder" or "skipped"
+    detail: str
+    cell_index: Optional[int] = None  # notebook cell, for parser decisions
+    source: Optional[str] = None      # notebook name, when known
+
+    def __str__(self) -> str:
+        where = f"{self.source}: " if self.source else ""
+        if self.cell_index is not None:
+            where += f"cell {self.cell_index}: "
+        return f"{where}{self.limit} {self.action} - {self.detail}"
+
+
+def placeholder(text: str) -> str:
+    return f"[{text}]"
+
+
+def output_size(output: Dict[str, Any]) -> int:
+    """Approximate size in bytes of one cell output."""
+    size = len(output.get("text", "")) if isinstance(output.get("text"), str) else 0
+    for value in output.get("data", {}).values():
+        if isinstance(value, str):
+            size += len(value)
+        elif isinstance(value, ImageSpan):
+            size += value.length
+    return size
+
+
+def image_size(image) -> int:
+    """Decoded size of an image, estimated from its base64 length when not decoded."""
+    if image.blob is not None:
+        return len(image.blob)
+    if image.span is not None:
+        return image.span.length * 3 // 4
+    return len(image.data) * 3 // 4
+
+
+def truncate_html_table(html: str, max_rows: int) -> str:
+    """Cut html after the first ``max_rows`` body rows of its first table."""
+    body = _TBODY_START.search(html)
+    start = body.end() if body else 0
+    rows_to_keep = max_rows if body else max_rows + 1  # no tbody: keep the header row too
+    for count, match in enumerate(_ROW_END.finditer(html, start), start=1):
+        if count == rows_to_keep:
+            return html[:match.end()] + ("</tbody>" if body else "") + "</table>"
+    return html
+
+
+def count_table_rows(html: str) -> int:
+    """Number of body rows in html (all rows when there is no <tbody>)."""
+    body = _TBODY_START.search(html)
+    rows = len(_ROW_END.findall(html, body.end() if body else 0))
+    return rows if body else max(0, rows - 1)
+
+
+class BudgetTracker:
+    def __init__(self, budget: Optional[Budget] = None, source: Optional[str] = None):
+        self.budget = budget or Budget()
+        self.source = source
+        self.decisions: List[BudgetDecision] = []
+        self.image_bytes = 0
+        self.output_bytes = 0
+        self.slide_groups = 0  # slide groups seen by apply_image_budget
+        self.started = time.monotonic()
+
+    def _record(self, limit, action, detail, cell_index=None) -> None:
+        self.decisions.append(BudgetDecision(limit, action, detail, cell_index, self.source))
+
+    # --- parser limits ---------------------------------------------------
+
+    def out_of_time(self) -> bool:
+        limit = self.budget.max_seconds
+        return limit is not None and time.monotonic() - self.started > limit
+
+    def skip_remaining(self, n_cells: int, cell_index: int) -> ParsedCell:
+        """Record that the rest of the notebook was skipped and return a placeholder cell."""
+        detail = f"{n_cells} remaining cell(s) skipped after {self.budget.max_seconds}s"
+        self._record("wall_time", "skipped", detail, cell_index)
+        return ParsedCell(type="markdown", bullets=[placeholder(f"Time budget exceeded: {detail}")])
+
+    def allow_outputs(self, outputs: List[Dict[str, Any]], cell_index: Optional[int]) -> bool:
+        """Count a cell's outputs; False means they should be replaced by a placeholder."""
+        size = sum(output_size(output) for output in outputs)
+        limit = self.budget.max_output_bytes
+        if limit is not None and self.output_bytes + size > limit:
+            self._record("output_bytes", "placeholder",
+                         f"{size} bytes of output dropped (limit {limit} per notebook)", cell_index)
+            return False
+        self.output_bytes += size
+        return True
+
+    def limit_table_html(self, html: str, cell_index: Optional[int]) -> str:
+        limit = self.budget.max_table_rows
+        if limit is None:
+            return html
+        n_rows = count_table_rows(html)
+        if n_rows <= limit:
+            return html
+        self._record("table_rows", "truncated",
+                     f"table cut from {n_rows} to {limit} rows before parsing", cell_index)
+        return truncate_html_table(html, limit)
+
+    # --- renderer limits -------------------------------------------------
+
+    def apply_image_budget(self, parsed_contents: List[ParsedCell]) -> List[ParsedCell]:
+        """
+        Replace the images past the deck's image-byte limit with placeholder bullets.
+        Images count in deck order at their decoded size, so this runs after SVG and
+        PDF figures are converted to the PNGs that are embedded. Slide groups that
+        change are copied, so the caller's cells are left as they are.
+        """
+        limit = self.budget.max_image_bytes
+        if limit is None:
+            return parsed_contents
+
+        result = []
+        for parsed_content in parsed_contents:
+            self.slide_groups += 1
+            kept, dropped = [], 0
+            for image in parsed_content.images:
+                size = image_size(image)
+                if self.image_bytes + size > limit:
+                    dropped += 1
+                    continue
+                self.image_bytes += size
+                kept.append(image)
+            if dropped:
+                self._record("image_bytes", "placeholder",
+                             f"{dropped} image(s) on slide group {self.slide_groups} replaced "
+                             f"(limit {limit} bytes per deck)")
+                parsed_content = replace(
+                    parsed_content, images=kept,
+                    bullets=parsed_content.bullets + [placeholder(
+                        f"{dropped} image(s) omitted: deck image budget exceeded")])
+            result.append(parsed_content)
+        return result
+
+
+def format_report(decisions: List[BudgetDecision]) -> str:
+    if not decisions:
+        return "No budget limits were hit."
+    lines = [f"{len(decisions)} budget decision(s):"]
+    lines.extend(f"  - {decision}" for decision in decisions)
+    return "\n".join(lines)
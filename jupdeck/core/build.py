@@ -0,0 +1,108 @@
+# build.py
+"""Build manifest for skipping notebooks that have not changed since the last run.
+
+Each output directory holds a ``.jupdeck-build.json`` recording, for every deck
+built there, the SHA-256 of the notebook it came from, the jupdeck version and
+the render options. A deck is up to date, in the style of ``make``, when it
+exists and all three still match. Inputs whose size and modification time are
+unchanged are not hashed again.
+"""
+
+import hashlib
+import json
+import os
+from dataclasses import asdict, dataclass
+from importlib import metadata
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+MANIFEST_NAME = ".jupdeck-build.json"
+MANIFEST_VERSION = 1
+_HASH_CHUNK = 1024 * 1024
+
+
+def jupdeck_version() -> str:
+    try:
+        return metadata.version("jupdeck")
+    except metadata.PackageNotFoundError:  # running from a source tree
+        return "unknown"
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with Path(path).open("rb") as f:
+        while chunk := f.read(_HASH_CHUNK):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@dataclass
+class BuildRecord:
+    input_path: str
+    input_sha256: str
+    input_size: int
+    input_mtime_ns: int
+    version: str
+    options: Dict[str, Any]
+
+
+class BuildManifest:
+    def __init__(self, directory: Path):
+        self.path = Path(directory) / MANIFEST_NAME
+        self.records: Dict[str, BuildRecord] = {}  # output file name -> record
+        if self.path.exists():
+            self._load()
+
+    def _load(self) -> None:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return  # an unreadable manifest only means everything is rebuilt
+        if data.get("manifest_version") != MANIFEST_VERSION:
+            return
+        self.records = {name: BuildRecord(**record)
+                        for name, record in data.get("outputs", {}).items()}
+
+    @staticmethod
+    def for_output(output_path: Path) -> "BuildManifest":
+        return BuildManifest(Path(output_path).parent)
+
+    def is_up_to_date(self, input_path: Path, output_path: Path,
+                      options: Optional[Dict[str, Any]] = None) -> bool:
+        record = self.records.get(Path(output_path).name)
+        if record is None or not Path(output_path).exists():
+            return False
+        if record.version != jupdeck_version() or record.options != _normalise(options):
+            return False
+        stat = Path(input_path).stat()
+        if (stat.st_size, stat.st_mtime_ns) == (record.input_size, record.input_mtime_ns):
+            return True
+        if stat.st_size != record.input_size:
+            return False
+        return file_sha256(input_path) == record.input_sha256  # touched but not changed
+
+    def record(self, input_path: Path, output_path: Path,
+               options: Optional[Dict[str, Any]] = None) -> None:
+        stat = Path(input_path).stat()
+        self.records[Path(output_path).name] = BuildRecord(
+            input_path=str(input_path),
+            input_sha256=file_sha256(input_path),
+            input_size=stat.st_size,
+            input_mtime_ns=stat.st_mtime_ns,
+            version=jupdeck_version(),
+            options=_normalise(options),
+        )
+
+    def save(self) -> None:
+        data = {
+            "manifest_version": MANIFEST_VERSION,
+            "outputs": {name: asdict(record) for name, record in sorted(self.records.items())},
+        }
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(data, indent=2, sort_keys=True), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+
+
+def _normalise(options: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Options as they read back from JSON, so a fresh dict compares equal to a stored one."""
+    return json.loads(json.dumps(options or {}, sort_keys=True, default=str))
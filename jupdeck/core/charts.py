@@ -0,0 +1,135 @@
+# charts.py
+"""Native PowerPoint charts from the tables notebooks print.
+
+A slide's table becomes a chart when its cell carries a ``chart`` directive
+(``chart`` picks the chart type, ``chart-line``, ``chart-column``,
+``chart-bar`` and ``chart-pie`` choose one), or, with the ``auto`` mode, for
+any simple numeric table. The chart takes the table's place, and on a slide
+with a ``chart`` directive also replaces the slide's images, which are usually
+a raster plot of the same data. The chart keeps the numbers in the deck as
+vector graphics and an embedded workbook instead of a PNG.
+
+A table can be charted when, after an optional first column of labels (a
+pandas index or any non-numeric column), every column is numeric. Missing
+values become gaps.
+"""
+
+import math
+import numbers
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from pptx.chart.data import CategoryChartData
+from pptx.enum.chart import XL_CHART_TYPE, XL_LEGEND_POSITION
+
+from jupdeck.core.models import ParsedCell
+
+MODES = ("off", "tagged", "auto")
+CHART_TYPES = {
+    "column": XL_CHART_TYPE.COLUMN_CLUSTERED,
+    "bar": XL_CHART_TYPE.BAR_CLUSTERED,
+    "line": XL_CHART_TYPE.LINE_MARKERS,
+    "pie": XL_CHART_TYPE.PIE,
+}
+MAX_SERIES = 12
+MAX_POINTS = 1000
+LINE_AFTER_POINTS = 12  # more categories than this read better as a line
+
+
+@dataclass
+class ChartSpec:
+    kind: str  # a key of CHART_TYPES
+    categories: List[Any]
+    series: Dict[str, List[Optional[float]]]
+    replaces_images: bool = False  # set by a chart directive
+
+    def chart_data(self) -> CategoryChartData:
+        data = CategoryChartData()
+        data.categories = self.categories
+        for name, values in self.series.items():
+            data.add_series(name, values)
+        return data
+
+    @property
+    def chart_type(self):
+        return CHART_TYPES[self.kind]
+
+    @property
+    def has_legend(self) -> bool:
+        return self.kind == "pie" or len(self.series) > 1
+
+
+def _number(value) -> Optional[float]:
+    """``value`` as a float, None for a missing value; raises ValueError if not numeric."""
+    if value is None:
+        return None
+    if isinstance(value, numbers.Number) and not isinstance(value, bool):
+        number = float(value)
+        return None if math.isnan(number) else number
+    raise ValueError(value)
+
+
+def _is_numeric_column(table: List[Dict[str, Any]], column: str) -> bool:
+    try:
+        for row in table:
+            _number(row.get(column))
+    except (ValueError, TypeError):
+        return False
+    return True
+
+
+def _label(value) -> Any:
+    if isinstance(value, numbers.Number) and not isinstance(value, bool):
+        return value.item() if hasattr(value, "item") else value  # numpy scalars
+    return "" if value is None else str(value)
+
+
+def chart_spec(table, kind: str = "auto") -> Optional[ChartSpec]:
+    """The chart for ``table`` (a list of records), or None if it can't be charted."""
+    if not table or not isinstance(table, list) or len(table) > MAX_POINTS:
+        return None
+    columns = list(table[0].keys())
+    if not columns:
+        return None
+    label_column = None
+    if str(columns[0]).startswith("Unnamed") or not _is_numeric_column(table, columns[0]):
+        label_column = columns[0]
+        columns = columns[1:]
+    if not columns or len(columns) > MAX_SERIES or \
+            not all(_is_numeric_column(table, column) for column in columns):
+        return None
+
+    if kind not in CHART_TYPES:
+        kind = "line" if len(table) > LINE_AFTER_POINTS else "column"
+    if kind == "pie":
+        columns = columns[:1]
+    categories = [_label(row.get(label_column)) for row in table] if label_column \
+        else list(range(1, len(table) + 1))
+    series = {str(column): [_number(row.get(column)) for row in table] for column in columns}
+    return ChartSpec(kind, categories, series)
+
+
+def chart_for(parsed_content: ParsedCell, mode: str = "tagged") -> Optional[ChartSpec]:
+    """The chart to draw in place of a slide group's table, under ``mode``."""
+    if mode == "off" or not parsed_content.table:
+        return None
+    directive = parsed_content.metadata.get("chart")
+    if directive:
+        spec = chart_spec(parsed_content.table, directive)
+        if spec:
+            spec.replaces_images = True
+        return spec
+    if mode == "auto":
+        return chart_spec(parsed_content.table)
+    return None
+
+
+def add_chart(slide, spec: ChartSpec, box) -> None:
+    """Draw ``spec`` on ``slide`` inside ``box``."""
+    frame = slide.shapes.add_chart(spec.chart_type, box.left, box.top, box.width, box.height,
+                                   spec.chart_data())
+    chart = frame.chart
+    chart.has_legend = spec.has_legend
+    if chart.has_legend:
+        chart.legend.position = XL_LEGEND_POSITION.BOTTOM
+        chart.legend.include_in_layout = False
@@ -0,0 +1,143 @@
+# combine.py
+"""Combine several notebooks into a single presentation."""
+
+import json
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import nullcontext
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from jupdeck.core import parser
+from jupdeck.core.budget import Budget
+from jupdeck.core.events import EventReporter
+from jupdeck.core.renderer import PowerPointRenderer
+from jupdeck.core.slide_cache import SlideCache
+
+
+@dataclass
+class ManifestEntry:
+    path: Path
+    section: Optional[str] = None  # divider title, defaults to the notebook name
+
+
+def read_manifest(manifest_path: Path) -> List[ManifestEntry]:
+    """
+    Read the ordered list of notebooks to combine.
+
+    JSON manifests hold a list (or ``{"notebooks": [...]}``) of paths or of
+    ``{"path": ..., "section": ...}`` objects. Any other file is read as text with
+    one notebook per line, optionally followed by ``| Section title``; blank lines
+    and lines starting with ``#`` are ignored. Relative paths are resolved against
+    the manifest's directory.
+    """
+    manifest_path = Path(manifest_path)
+    base = manifest_path.parent
+    text = manifest_path.read_text(encoding="utf-8")
+
+    entries = []
+    if manifest_path.suffix == ".json":
+        data = json.loads(text)
+        items = data.get("notebooks", []) if isinstance(data, dict) else data
+        for item in items:
+            if isinstance(item, str):
+                item = {"path": item}
+            entries.append(ManifestEntry(base / item["path"], item.get("section")))
+    else:
+        for line in text.splitlines():
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            path, _, section = (part.strip() for part in line.partition("|"))
+            entries.append(ManifestEntry(base / path, section or None))
+    return entries
+
+
+def parse_notebooks(paths: Sequence[Path], workers: int = 1,
+                    budget: Optional[Budget] = None,
+                    executor: Optional[Executor] = None) -> List[Dict[str, Any]]:
+    """
+    Parse notebooks in parallel worker processes, returning results in input order.
+    A process pool is started for the call unless ``executor`` is given.
+    """
+    parse = partial(parser.parse_notebook, budget=budget)
+    if workers <= 1 or len(paths) <= 1:
+        return [parse(path) for path in paths]
+    pool = nullcontext(executor) if executor else ProcessPoolExecutor(max_workers=workers)
+    with pool as executor:
+        return list(executor.map(parse, paths))
+
+
+def attribution_name(paths: Sequence[Path]) -> str:
+    names = [Path(path).name for path in paths]
+    if len(names) == 1:
+        return names[0]
+    if len(names) <= 3:
+        return ", ".join(names[:-1]) + " and " + names[-1]
+    return f"{len(names)} notebooks"
+
+
+def combine_notebooks(
+    entries: Sequence[ManifestEntry],
+    output_path: Path,
+    section_dividers: bool = False,
+    workers: int = 1,
+    include_speaker_notes: bool = True,
+    include_attribution: bool = True,
+    budget: Optional[Budget] = None,
+    slide_cache: Optional[SlideCache] = None,
+    reporter: Optional[EventReporter] = None,
+    reproducible: bool = False,
+    charts: str = "tagged",
+    output_notes: bool = False,
+    linked_media_dir: Optional[Path] = None,
+) -> PowerPointRenderer:
+    """
+    Render several notebooks, in order, into one presentation.
+
+    All notebooks share one renderer, so an image that appears in several
+    notebooks is stored in the deck once, and a single attribution slide
+    closes the deck. Budget decisions from parsing and rendering are collected
+    in the renderer's ``budget_tracker``. Progress is reported per notebook as
+    its slides are added. With ``workers`` > 1, parsing and rendering share one
+    process pool.
+    """
+    reporter = reporter or EventReporter()
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else nullcontext()
+    with pool as executor:
+        parsed_notebooks = parse_notebooks([entry.path for entry in entries], workers, budget,
+                                           executor)
+
+        ppt_renderer = PowerPointRenderer(
+            output_path=output_path,
+            include_speaker_notes=include_speaker_notes,
+            include_attribution=include_attribution,
+            workers=workers,
+            budget=budget,
+            slide_cache=slide_cache,
+            reporter=reporter,
+            reproducible=reproducible,
+            charts=charts,
+            output_notes=output_notes,
+            linked_media_dir=linked_media_dir,
+            executor=executor,
+        )
+        for parsed in parsed_notebooks:
+            ppt_renderer.budget_tracker.decisions.extend(parsed.get("budget_decisions", []))
+
+        reporter.emit("batch_started", notebooks=len(entries))
+        for entry, parsed in zip(entries, parsed_notebooks):
+            start = time.perf_counter()
+            reporter.emit("notebook_started", notebook=str(entry.path))
+            if section_dividers:
+                ppt_renderer.render_section_divider(entry.section or Path(entry.path).stem)
+            slides = ppt_renderer.add_notebook(parsed)
+            reporter.emit("notebook_finished", notebook=str(entry.path), slides=slides,
+                          seconds=round(time.perf_counter() - start, 6))
+
+    if include_attribution:
+        ppt_renderer.render_attribution(attribution_name([entry.path for entry in entries]))
+    ppt_renderer.save()
+    return ppt_renderer
@@ -0,0 +1,179 @@
+# directives.py
+"""Read slide directives from notebook cells in a cheap first pass.
+
+Directives come from three places, all of which can be read without parsing
+markdown or touching cell outputs:
+
+- cell tags, e.g. ``jupdeck-hide`` or ``jupdeck-hide-tables``
+- cell metadata, e.g. ``{"jupdeck": {"hide_tables": true}}`` or the
+  ``slideshow.slide_type == "skip"`` setting used by Jupyter slideshows
+- html comments in markdown cells, e.g. ``<!-- jupdeck: new-slide, hide-images -->``
+
+Output filters (``hide-outputs``, ``hide-images``, ``hide-tables``) given on a
+markdown cell apply to the code cells that follow it on the same slide, that
+is, until the next markdown cell with a level-1 heading or a cell with a
+``new-slide`` or ``section`` directive.
+
+A ``section`` directive starts a new slide and marks it as the first slide of a
+section, where ``--split-sections`` may cut the deck. A ``chart`` directive
+(or ``chart-line``, ``chart-column``, ``chart-bar``, ``chart-pie``) draws the
+slide's table as a native chart; see ``jupdeck.core.charts``.
+"""
+
+import re
+from dataclasses import dataclass, replace
+from typing import Any, Dict, List, Tuple
+
+TAG_PREFIX = "jupdeck-"
+COMMENT_PATTERN = re.compile(r"<!--\s*jupdeck:\s*(.*?)\s*-->", re.DOTALL)
+# An ATX "# " heading or a setext "===" underline; cells without one have no level-1 title
+TITLE_CANDIDATE = re.compile(r"^ {0,3}(?:#(?:[ \t]|$)|=+[ \t]*$)", re.MULTILINE)
+
+# Output mime types dropped by the hide-images / hide-tables directives
+IMAGE_MIME_PREFIXES = ("image/",)
+TABLE_MIME_TYPES = ("text/html",)
+
+
+@dataclass
+class CellDirectives:
+    hide: bool = False          # drop the whole cell
+    hide_outputs: bool = False  # keep the cell, drop all of its outputs
+    hide_images: bool = False   # drop image outputs
+    hide_tables: bool = False   # drop html (table) outputs
+    new_slide: bool = False     # start a new slide at this cell
+    section: bool = False       # start a new section (and slide) at this cell
+    chart: str = ""             # chart type for the slide's table, "auto" to pick one
+
+    def apply(self, name: str) -> None:
+        """Switch on the directive called ``name`` (e.g. "hide-tables")."""
+        attr = name.strip().lower().replace("-", "_")
+        if attr == "skip":
+            attr = "hide"
+        if attr == "chart" or attr.startswith("chart_"):
+            self.chart = attr[len("chart_"):] or "auto"
+        elif attr in self.__dataclass_fields__:
+            setattr(self, attr, True)
+
+    @property
+    def filters_outputs(self) -> bool:
+        return self.hide_outputs or self.hide_images or self.hide_tables
+
+
+def read_directives(cell) -> CellDirectives:
+    """Collect the directives for a single notebook cell."""
+    directives = CellDirectives()
+    metadata = cell.get("metadata", {})
+
+    for tag in metadata.get("tags", []):
+        if tag.startswith(TAG_PREFIX):
+            directives.apply(tag[len(TAG_PREFIX):])
+
+    settings = metadata.get("jupdeck")
+    for key, value in (settings.items() if isinstance(settings, dict) else ()):
+        if key == "chart" and isinstance(value, str):
+            directives.apply(f"chart-{value}")  # e.g. {"jupdeck": {"chart": "line"}}
+        elif value:
+            directives.apply(key)
+
+    slideshow = metadata.get("slideshow")
+    if isinstance(slideshow, dict) and slideshow.get("slide_type") == "skip":
+        directives.hide = True
+
+    if cell.get("cell_type") == "markdown":
+        source = cell.get("source", "")
+        if "jupdeck:" in source:
+            for match in COMMENT_PATTERN.finditer(source):
+                for name in re.split(r"[,\s]+", match.group(1)):
+                    if name:
+                        directives.apply(name)
+
+    return directives
+
+
+def filter_outputs(cell, directives: CellDirectives):
+    """
+    Return a shallow copy of a code cell without the outputs hidden by
+    ``directives``. The original cell is left untouched.
+    """
+    if not directives.filters_outputs or cell.get("cell_type") != "code":
+        return cell
+
+    outputs = []
+    if not directives.hide_outputs:
+        for output in cell.get("outputs", []):
+            data = output.get("data")
+            if data is None:
+                outputs.append(output)
+                continue
+            kept = {
+                mime: value for mime, value in data.items()
+                if not (directives.hide_images and mime.startswith(IMAGE_MIME_PREFIXES))
+                and not (directives.hide_tables and mime in TABLE_MIME_TYPES)
+            }
+            if kept:
+                outputs.append({**output, "data": kept})
+
+    filtered = type(cell)(cell)
+    filtered["outputs"] = outputs
+    return filtered
+
+
+def starts_slide(cell, directives: CellDirectives) -> Tuple[bool, str]:
+    """
+    ``(starts, title)``: whether ``merge_slide_groups`` will start a new slide at
+    this visible cell, as it does for a non-empty level-1 title, a ``new-slide``
+    or a ``section`` directive, and the cell's title. Markdown is only parsed
+    when a line looks like a level-1 heading.
+    """
+    from jupdeck.core import parser  # the parser imports this module
+
+    title = ""
+    if cell.get("cell_type") == "markdown" and TITLE_CANDIDATE.search(cell.get("source", "")):
+        title = parser.parse_markdown_cell(cell).title or ""
+    return bool(title or directives.new_slide or directives.section), title
+
+
+def select_cells(cells: List[Any]) -> Tuple[List[Tuple[int, Any, CellDirectives]], int]:
+    """
+    First pass over the notebook cells.
+
+    Returns ``(index, cell, directives)`` for each visible cell, with hidden
+    outputs already removed, and the number of cells that were skipped.
+    """
+    selected = []
+    skipped = 0
+    slide_filters = CellDirectives()  # output filters set by the slide's markdown cells
+
+    for index, cell in enumerate(cells):
+        directives = read_directives(cell)
+        if directives.hide:
+            skipped += 1
+            continue
+        if slide_filters.filters_outputs and starts_slide(cell, directives)[0]:
+            slide_filters = CellDirectives()
+        if cell.get("cell_type") == "markdown":
+            slide_filters.hide_outputs |= directives.hide_outputs
+            slide_filters.hide_images |= directives.hide_images
+            slide_filters.hide_tables |= directives.hide_tables
+        elif slide_filters.filters_outputs:
+            directives = replace(
+                directives,
+                hide_outputs=directives.hide_outputs or slide_filters.hide_outputs,
+                hide_images=directives.hide_images or slide_filters.hide_images,
+                hide_tables=directives.hide_tables or slide_filters.hide_tables,
+            )
+        selected.append((index, filter_outputs(cell, directives), directives))
+
+    return selected, skipped
+
+
+def directive_metadata(directives: CellDirectives) -> Dict[str, Any]:
+    """Directives that must survive parsing, stored in ``ParsedCell.metadata``."""
+    metadata = {}
+    if directives.new_slide:
+        metadata["new_slide"] = True
+    if directives.section:
+        metadata["section"] = True
+    if directives.chart:
+        metadata["chart"] = directives.chart
+    return metadata
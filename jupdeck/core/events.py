@@ -0,0 +1,285 @@
+# events.py
+"""Structured progress events from long-running conversions.
+
+The parser, the renderer and the CLI report what they are doing through one
+``EventReporter``, which passes each event to its sinks:
+
+- ``JsonLinesSink`` writes one JSON object per event
+- ``ProgressDisplay`` keeps a live progress line with an ETA on a terminal
+- ``MetricsFile`` maintains counters and writes them to a file in the
+  Prometheus text format (e.g. for node_exporter's textfile collector)
+
+Events are a name, a timestamp and keyword fields:
+
+==================  ===========================================================
+batch_started       notebooks
+notebook_started    notebook
+parse_started       notebook, cells
+parse_finished      notebook, cells, seconds
+render_started      slides
+slide_rendered      slide, cached (True/False when a slide cache is used)
+deck_saved          path, bytes
+notebook_finished   notebook, slides, seconds, bytes (of its own deck)
+notebook_skipped    notebook (its deck is up to date)
+notebook_failed     notebook, error
+batch_finished      built, skipped, failed, seconds
+==================  ===========================================================
+
+A reporter without sinks ignores events, so reporting costs nothing unless it
+is switched on.
+"""
+
+import json
+import os
+import sys
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, TextIO
+
+PROGRESS_INTERVAL = 0.1  # seconds between redraws of the progress line
+METRICS_INTERVAL = 5.0   # seconds between metrics file writes during a deck
+
+
+@dataclass
+class Event:
+    name: str
+    time: float
+    fields: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"event": self.name, "time": self.time, **self.fields}
+
+
+class EventSink(ABC):
+    """Receives every event a reporter emits; ``close`` is called once at the end."""
+
+    @abstractmethod
+    def handle(self, event: Event) -> None:
+        """Process one event."""
+
+    def close(self) -> None:
+        pass
+
+
+class EventReporter:
+    def __init__(self, *sinks: EventSink):
+        self.sinks: List[EventSink] = list(sinks)
+
+    def emit(self, name: str, **fields) -> None:
+        if not self.sinks:
+            return
+        event = Event(name, time.time(), fields)
+        for sink in self.sinks:
+            sink.handle(event)
+
+    def close(self) -> None:
+        for sink in self.sinks:
+            sink.close()
+
+    def __enter__(self) -> "EventReporter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class JsonLinesSink(EventSink):
+    def __init__(self, stream: TextIO):
+        self.stream = stream
+
+    def handle(self, event: Event) -> None:
+        self.stream.write(json.dumps(event.to_dict(), default=str) + "\n")
+        self.stream.flush()
+
+    def close(self) -> None:
+        if self.stream not in (sys.stdout, sys.stderr):
+            self.stream.close()
+
+
+def _format_seconds(seconds: float) -> str:
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}h{seconds % 3600 // 60:02d}m"
+    if seconds >= 60:
+        return f"{seconds // 60}m{seconds % 60:02d}s"
+    return f"{seconds}s"
+
+
+class ProgressDisplay(EventSink):
+    """A single progress line, redrawn in place, with an ETA for the whole run."""
+
+    def __init__(self, stream: TextIO = sys.stderr):
+        self.stream = stream
+        self.notebooks: Optional[int] = None  # total, when known
+        self.finished = 0  # notebooks finished, skipped or failed
+        self.notebook = ""
+        self.slides = 0  # slides in the deck being rendered
+        self.rendered = 0
+        self.render_started: Optional[float] = None
+        self.notebook_started: Optional[float] = None
+        self.notebook_seconds: List[float] = []
+        self._drawn = 0.0
+        self._width = 0
+
+    def eta(self, now: float) -> Optional[float]:
+        current = 0.0
+        if self.slides and self.rendered and self.render_started is not None:
+            rate = self.rendered / max(now - self.render_started, 1e-9)
+            current = (self.slides - self.rendered) / rate
+        remaining = (self.notebooks or 0) - self.finished - (1 if self.notebook else 0)
+        if remaining > 0:
+            if not self.notebook_seconds:
+                return None
+            current += remaining * sum(self.notebook_seconds) / len(self.notebook_seconds)
+        return current
+
+    def line(self, now: float) -> str:
+        parts = []
+        if self.notebooks:
+            parts.append(f"[{self.finished}/{self.notebooks}]")
+        if self.notebook:
+            parts.append(self.notebook)
+        if self.slides:
+            parts.append(f"slide {self.rendered}/{self.slides}")
+        eta = self.eta(now)
+        if eta is not None and (self.slides or self.notebooks):
+            parts.append(f"ETA {_format_seconds(eta)}")
+        return " ".join(parts)
+
+    def _draw(self, now: float, force: bool = False) -> None:
+        if not force and now - self._drawn < PROGRESS_INTERVAL:
+            return
+        self._drawn = now
+        text = self.line(now)
+        self.stream.write("\r" + text.ljust(self._width))
+        self.stream.flush()
+        self._width = len(text)
+
+    def handle(self, event: Event) -> None:
+        fields = event.fields
+        force = True
+        if event.name == "batch_started":
+            self.notebooks = fields.get("notebooks")
+        elif event.name == "notebook_started":
+            self.notebook = Path(str(fields.get("notebook", ""))).name
+            self.notebook_started = event.time
+            self.slides = self.rendered = 0
+        elif event.name == "render_started":
+            self.slides += fields.get("slides", 0)
+            if self.render_started is None or not self.rendered:
+                self.render_started = event.time
+        elif event.name == "slide_rendered":
+            self.rendered += 1
+            force = False
+        elif event.name in ("notebook_finished", "notebook_skipped", "notebook_failed"):
+            self.finished += 1
+            if event.name == "notebook_finished" and self.notebook_started is not None:
+                self.notebook_seconds.append(event.time - self.notebook_started)
+            self.notebook, self.slides, self.rendered = "", 0, 0
+            self.render_started = self.notebook_started = None
+        else:
+            return
+        self._draw(event.time, force)
+
+    def close(self) -> None:
+        if self._width:
+            self.stream.write("\r" + " " * self._width + "\r")
+            self.stream.flush()
+
+
+METRICS = {
+    # name: (type, help)
+    "jupdeck_notebooks_total": ("counter", "Notebooks processed, by result."),
+    "jupdeck_notebooks_in_progress": ("gauge", "Notebooks being converted."),
+    "jupdeck_slides_rendered_total": ("counter", "Slides added to decks."),
+    "jupdeck_slide_cache_hits_total": ("counter", "Slides copied from the slide cache."),
+    "jupdeck_slide_cache_misses_total": ("counter", "Slides rendered after a slide cache miss."),
+    "jupdeck_bytes_written_total": ("counter", "Bytes of decks written."),
+    "jupdeck_errors_total": ("counter", "Notebooks whose conversion failed."),
+    "jupdeck_notebook_duration_seconds": ("summary", "Time to convert one notebook."),
+    "jupdeck_last_event_timestamp_seconds": ("gauge", "Unix time of the latest event."),
+}
+
+
+class MetricsFile(EventSink):
+    """Counters in the Prometheus text format, rewritten atomically as they change."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.notebooks = {"ok": 0, "failed": 0, "skipped": 0}
+        self.in_progress = 0
+        self.slides = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.bytes_written = 0
+        self.errors = 0
+        self.duration_sum = 0.0
+        self.duration_count = 0
+        self.last_event = 0.0
+        self._written = 0.0
+
+    def handle(self, event: Event) -> None:
+        fields = event.fields
+        self.last_event = event.time
+        if event.name == "notebook_started":
+            self.in_progress += 1
+        elif event.name == "slide_rendered":
+            self.slides += 1
+            if fields.get("cached") is True:
+                self.cache_hits += 1
+            elif fields.get("cached") is False:
+                self.cache_misses += 1
+        elif event.name == "deck_saved":
+            self.bytes_written += fields.get("bytes", 0)
+        elif event.name == "notebook_finished":
+            self.in_progress = max(0, self.in_progress - 1)
+            self.notebooks["ok"] += 1
+            self.duration_sum += fields.get("seconds", 0.0)
+            self.duration_count += 1
+        elif event.name == "notebook_failed":
+            self.in_progress = max(0, self.in_progress - 1)
+            self.notebooks["failed"] += 1
+            self.errors += 1
+        elif event.name == "notebook_skipped":
+            self.notebooks["skipped"] += 1
+        if event.name != "slide_rendered" or event.time - self._written >= METRICS_INTERVAL:
+            self.write()
+
+    def samples(self) -> Dict[str, List[tuple]]:
+        """Metric name -> [(suffix and labels, value)]."""
+        return {
+            "jupdeck_notebooks_total": [(f'{{result="{result}"}}', count)
+                                        for result, count in self.notebooks.items()],
+            "jupdeck_notebooks_in_progress": [("", self.in_progress)],
+            "jupdeck_slides_rendered_total": [("", self.slides)],
+            "jupdeck_slide_cache_hits_total": [("", self.cache_hits)],
+            "jupdeck_slide_cache_misses_total": [("", self.cache_misses)],
+            "jupdeck_bytes_written_total": [("", self.bytes_written)],
+            "jupdeck_errors_total": [("", self.errors)],
+            "jupdeck_notebook_duration_seconds": [("_sum", round(self.duration_sum, 6)),
+                                                  ("_count", self.duration_count)],
+            "jupdeck_last_event_timestamp_seconds": [("", round(self.last_event, 3))],
+        }
+
+    def format(self) -> str:
+        lines = []
+        for name, samples in self.samples().items():
+            kind, help_text = METRICS[name]
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.extend(f"{name}{suffix} {value}" for suffix, value in samples)
+        return "\n".join(lines) + "\n"
+
+    def write(self) -> None:
+        self._written = time.time()
+        tmp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        try:
+            tmp_path.write_text(self.format(), encoding="utf-8")
+            os.replace(tmp_path, self.path)
+        except OSError:
+            tmp_path.unlink(missing_ok=True)  # metrics must never break a conversion
+
+    def close(self) -> None:
+        self.write()
@@ -0,0 +1,235 @@
+# inspector.py
+"""Inspect a generated deck without loading it into python-pptx.
+
+``inspect_deck`` streams each slide's XML out of the .pptx ZIP with
+``iterparse``, clearing elements as it goes, and reads only the relationship
+files it needs. Image parts are checked against the ZIP's central directory,
+never read, so memory use doesn't grow with the size of the deck's media.
+
+``compare_with_notebook`` checks a deck against the parsed notebook it was made
+from and reports slides, titles, images and tables that went missing.
+"""
+
+import posixpath
+import zipfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from lxml import etree
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.oxml.ns import qn
+
+from jupdeck.core import media
+from jupdeck.core.renderer import merge_slide_groups
+
+CONTENT_LAYOUT = "Title and Content"
+ATTRIBUTION_TEXT = "automatically created from"
+TRUNCATION_TEXT = "Table truncated. See full data in '"
+_TITLE_TYPES = ("title", "ctrTitle")
+_REL = "{http://schemas.openxmlformats.org/package/2006/relationships}Relationship"
+_SHAPES = (qn("p:sp"), qn("p:pic"), qn("p:graphicFrame"))
+
+
+@dataclass
+class SlideSummary:
+    number: int
+    title: str = ""
+    layout: str = ""
+    pictures: int = 0
+    missing_images: List[str] = field(default_factory=list)  # targets absent from the deck
+    linked_images: List[str] = field(default_factory=list)  # targets outside the deck
+    table_rows: List[int] = field(default_factory=list)  # data rows of each table
+    charts: int = 0
+    truncated_tables: List[str] = field(default_factory=list)  # exported .xlsx file names
+    placeholders: List[str] = field(default_factory=list)  # "[...]" bullets for omitted content
+    has_notes: bool = False
+    is_attribution: bool = False
+
+
+@dataclass
+class DeckSummary:
+    path: str
+    slides: List[SlideSummary] = field(default_factory=list)
+    media_files: int = 0
+    media_bytes: int = 0
+
+    @property
+    def pictures(self) -> int:
+        return sum(slide.pictures for slide in self.slides)
+
+    @property
+    def tables(self) -> int:
+        return sum(len(slide.table_rows) for slide in self.slides)
+
+    @property
+    def missing_images(self) -> List[str]:
+        return [f"slide {slide.number}: {target}"
+                for slide in self.slides for target in slide.missing_images]
+
+    def format(self) -> str:
+        lines = [
+            f"{self.path}: {len(self.slides)} slide(s), {self.pictures} picture(s) "
+            f"({self.media_files} media file(s), {self.media_bytes / 1024 / 1024:.1f} MB), "
+            f"{self.tables} table(s)"
+        ]
+        for slide in self.slides:
+            details = []
+            if slide.pictures:
+                details.append(f"{slide.pictures} picture(s)")
+            if slide.linked_images:
+                details.append(f"{len(slide.linked_images)} linked")
+            for rows in slide.table_rows:
+                details.append(f"table with {rows} row(s)")
+            if slide.charts:
+                details.append(f"{slide.charts} chart(s)")
+            details.extend(f"truncated table -> {name}" for name in slide.truncated_tables)
+            details.extend(slide.placeholders)
+            if slide.missing_images:
+                details.append(f"{len(slide.missing_images)} missing image(s)")
+            label = slide.title or ("(attribution)" if slide.is_attribution else "(untitled)")
+            lines.append(f"  {slide.number:>3}. {label}"
+                         + (f" - {', '.join(details)}" if details else ""))
+        return "\n".join(lines)
+
+
+def _read_rels(archive: zipfile.ZipFile, part_name: str) -> Dict[str, tuple]:
+    """rId -> (relationship type, target part name or external URL, is external)."""
+    directory, name = posixpath.split(part_name)
+    rels_name = posixpath.join(directory, "_rels", f"{name}.rels")
+    if rels_name not in archive.NameToInfo:
+        return {}
+    rels = {}
+    for rel in etree.fromstring(archive.read(rels_name)).iter(_REL):
+        external = rel.get("TargetMode") == "External"
+        target = rel.get("Target")
+        if not external:
+            target = posixpath.normpath(posixpath.join(directory, target))
+        rels[rel.get("Id")] = (rel.get("Type"), target, external)
+    return rels
+
+
+def _text(element) -> str:
+    return "".join(t.text or "" for t in element.iter(qn("a:t")))
+
+
+def _layout_name(archive: zipfile.ZipFile, part_name: str, cache: Dict[str, str]) -> str:
+    if part_name not in cache:
+        c_sld = next(etree.fromstring(archive.read(part_name)).iter(qn("p:cSld")), None)
+        cache[part_name] = c_sld.get("name", "") if c_sld is not None else ""
+    return cache[part_name]
+
+
+def _inspect_slide(archive: zipfile.ZipFile, part_name: str, number: int,
+                   layouts: Dict[str, str]) -> SlideSummary:
+    summary = SlideSummary(number)
+    rels = _read_rels(archive, part_name)
+    for reltype, target, _ in rels.values():
+        if reltype == RT.SLIDE_LAYOUT:
+            summary.layout = _layout_name(archive, target, layouts)
+        elif reltype == RT.NOTES_SLIDE:
+            summary.has_notes = True
+
+    with archive.open(part_name) as stream:
+        for _, element in etree.iterparse(stream, events=("end",), tag=_SHAPES):
+            if element.getparent().tag not in (qn("p:spTree"), qn("p:grpSp")):
+                continue  # nested inside a shape already handled
+            if element.tag == qn("p:pic"):
+                summary.pictures += 1
+                for blip in element.iter(qn("a:blip")):
+                    rel = rels.get(blip.get(qn("r:embed")) or blip.get(qn("r:link")))
+                    if rel is not None and rel[2]:
+                        summary.linked_images.append(rel[1])
+                    elif rel is None or rel[1] not in archive.NameToInfo:
+                        summary.missing_images.append(rel[1] if rel else "(no relationship)")
+            elif element.tag == qn("p:graphicFrame"):
+                for table in element.iter(qn("a:tbl")):
+                    rows = sum(1 for child in table if child.tag == qn("a:tr"))
+                    summary.table_rows.append(max(0, rows - 1))  # minus the header row
+                summary.charts += sum(1 for _ in element.iter(qn("c:chart")))
+            else:
+                ph = next(element.iter(qn("p:ph")), None)
+                text = _text(element)
+                if ph is not None and ph.get("type") in _TITLE_TYPES:
+                    summary.title = text
+                else:
+                    if TRUNCATION_TEXT in text:
+                        summary.truncated_tables.append(
+                            text.split(TRUNCATION_TEXT, 1)[1].rstrip("'"))
+                    if ATTRIBUTION_TEXT in text:
+                        summary.is_attribution = True
+                    summary.placeholders.extend(
+                        paragraph_text for paragraph_text in
+                        (_text(p) for p in element.iter(qn("a:p")))
+                        if paragraph_text.startswith("[") and paragraph_text.endswith("]"))
+            element.clear()
+            while element.getprevious() is not None:
+                del element.getparent()[0]
+    return summary
+
+
+def inspect_deck(deck_path: Path) -> DeckSummary:
+    """Summarise a .pptx deck by streaming its slide XML."""
+    summary = DeckSummary(str(deck_path))
+    with zipfile.ZipFile(deck_path) as archive:
+        presentation = "ppt/presentation.xml"
+        rels = _read_rels(archive, presentation)
+        slide_parts = []
+        with archive.open(presentation) as stream:
+            for _, element in etree.iterparse(stream, events=("end",), tag=qn("p:sldId")):
+                slide_parts.append(rels[element.get(qn("r:id"))][1])
+                element.clear()
+
+        layouts: Dict[str, str] = {}
+        for number, part_name in enumerate(slide_parts, start=1):
+            summary.slides.append(_inspect_slide(archive, part_name, number, layouts))
+
+        for info in archive.infolist():
+            if info.filename.startswith("ppt/media/"):
+                summary.media_files += 1
+                summary.media_bytes += info.file_size
+    return summary
+
+
+def _expected_images(group) -> int:
+    return sum(1 for image in group.images if not image.is_empty
+               and image.mime_type in media.OUTPUT_PREFERENCE)
+
+
+def compare_with_notebook(summary: DeckSummary, parsed_notebook: dict,
+                          deck_dir: Optional[Path] = None) -> List[str]:
+    """
+    Differences between a deck and the parsed notebook it was made from: missing
+    slides, changed titles, dropped images or tables, and missing exported tables
+    or linked images. Section dividers and the attribution slide are ignored.
+    """
+    groups = merge_slide_groups(parsed_notebook.get("cells", []))
+    slides = [slide for slide in summary.slides
+              if slide.layout in ("", CONTENT_LAYOUT) and not slide.is_attribution]
+    deck_dir = Path(deck_dir) if deck_dir else Path(summary.path).parent
+
+    issues = []
+    if len(slides) != len(groups):
+        issues.append(f"expected {len(groups)} content slide(s), found {len(slides)}")
+
+    for group, slide in zip(groups, slides):
+        where = f"slide {slide.number}"
+        if (group.title or "") != slide.title:
+            issues.append(f"{where}: title {slide.title!r}, expected {group.title or ''!r}")
+        # A chart directive's chart replaces the slide's images as well as its table
+        expected_images = 0 if slide.charts and group.metadata.get("chart") \
+            else _expected_images(group)
+        if slide.pictures < expected_images:
+            issues.append(f"{where}: {expected_images - slide.pictures} of "
+                          f"{expected_images} image(s) dropped")
+        if group.table and not slide.table_rows and not slide.charts:
+            issues.append(f"{where}: table dropped")
+        for name in slide.truncated_tables:
+            if not (deck_dir / name).exists():
+                issues.append(f"{where}: exported table {name} is missing")
+        for target in slide.linked_images:
+            if "://" not in target and not (deck_dir / target).exists():
+                issues.append(f"{where}: linked image {target} is missing")
+        issues.extend(f"{where}: {text}" for text in slide.placeholders)
+    issues.extend(f"missing image in {where}" for where in summary.missing_images)
+    return issues
@@ -0,0 +1,378 @@
+# layout.py
+"""Choose slide layouts and font sizes so slide content fits its boxes.
+
+Text is measured with per-font glyph-width tables. A table is built once per
+font family (from the font file when one can be found, otherwise from built-in
+Calibri-like metrics) and line-wrap results are memoised, so planning a slide
+costs a few dictionary lookups per bullet once the caches are warm.
+"""
+
+import math
+import struct
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence
+
+from pptx.util import Emu, Inches, Pt
+
+from jupdeck.core.models import ImageData, ParsedCell
+
+DEFAULT_FONT = "Calibri"
+
+BULLET_FONT_SIZES = (18, 16, 14, 12, 11, 10)  # largest first
+TITLE_FONT_SIZES = (44, 36, 32, 28, 24)
+TABLE_FONT_SIZES = (12, 11, 10)
+LINE_SPACING = 1.2  # line height as a multiple of the font size
+BULLET_SPACING_PT = 8  # space_before + space_after of each bullet
+BULLET_INDENT = Inches(0.4)  # bullet character and hanging indent
+TEXT_INSETS = Inches(0.2)  # left + right insets of a text frame
+MAX_TABLE_ROWS = 10  # data rows shown before a table is truncated
+
+# Approximate advance widths (fraction of an em) for Calibri, the default theme font.
+_FALLBACK_WIDTHS = {
+    " ": 0.226, "a": 0.479, "b": 0.525, "c": 0.423, "d": 0.525, "e": 0.498, "f": 0.305,
+    "g": 0.471, "h": 0.525, "i": 0.229, "j": 0.239, "k": 0.455, "l": 0.229, "m": 0.799,
+    "n": 0.525, "o": 0.527, "p": 0.525, "q": 0.525, "r": 0.349, "s": 0.391, "t": 0.335,
+    "u": 0.525, "v": 0.452, "w": 0.715, "x": 0.433, "y": 0.453, "z": 0.395,
+    "A": 0.579, "B": 0.544, "C": 0.533, "D": 0.615, "E": 0.488, "F": 0.459, "G": 0.631,
+    "H": 0.623, "I": 0.252, "J": 0.319, "K": 0.520, "L": 0.420, "M": 0.855, "N": 0.646,
+    "O": 0.662, "P": 0.517, "Q": 0.673, "R": 0.543, "S": 0.459, "T": 0.487, "U": 0.642,
+    "V": 0.567, "W": 0.890, "X": 0.519, "Y": 0.487, "Z": 0.468,
+    ".": 0.252, ",": 0.250, ":": 0.268, ";": 0.268, "!": 0.326, "?": 0.463, "'": 0.221,
+    '"': 0.401, "-": 0.306, "(": 0.303, ")": 0.303, "/": 0.386, "%": 0.715, "&": 0.682,
+    **{digit: 0.507 for digit in "0123456789"},
+}
+_FALLBACK_DEFAULT_WIDTH = 0.5
+_WIDE_CODEPOINT = 0x2E80  # CJK and later blocks are roughly one em wide
+
+
+class GlyphWidths(dict):
+    """Advance widths in ems for one font, filled in lazily per character."""
+
+    def __init__(self, font_path: Optional[str] = None):
+        super().__init__()
+        self._font = None
+        if font_path:
+            try:
+                from PIL import ImageFont
+                self._font = ImageFont.truetype(font_path, 1000)
+            except Exception:
+                self._font = None  # fall back to built-in metrics
+
+    def __missing__(self, char: str) -> float:
+        if self._font is not None:
+            width = self._font.getlength(char) / 1000
+        elif char in _FALLBACK_WIDTHS:
+            width = _FALLBACK_WIDTHS[char]
+        else:
+            width = 1.0 if ord(char) >= _WIDE_CODEPOINT else _FALLBACK_DEFAULT_WIDTH
+        self[char] = width
+        return width
+
+
+@lru_cache(maxsize=None)
+def glyph_widths(family: str = DEFAULT_FONT, font_path: Optional[str] = None) -> GlyphWidths:
+    """Return the (cached) glyph-width table for a font family."""
+    if font_path is None:
+        try:
+            from pptx.text.fonts import FontFiles
+            font_path = FontFiles.find(family, False, False)
+        except Exception:
+            font_path = None  # no system font directory on this platform
+    return GlyphWidths(font_path)
+
+
+@lru_cache(maxsize=65536)
+def text_width_em(text: str, family: str = DEFAULT_FONT) -> float:
+    """Width of ``text`` in ems."""
+    widths = glyph_widths(family)
+    return sum(widths[char] for char in text)
+
+
+@lru_cache(maxsize=65536)
+def word_widths_em(text: str, family: str = DEFAULT_FONT) -> tuple:
+    """Widths in ems of the words on each line of ``text``."""
+    return tuple(tuple(text_width_em(word, family) for word in line.split())
+                 for line in text.split("\n"))
+
+
+@lru_cache(maxsize=262144)
+def wrap_line_count(text: str, size_pt: float, width_emu: int, family: str = DEFAULT_FONT) -> int:
+    """Number of lines ``text`` wraps to at ``size_pt`` in a box ``width_emu`` wide."""
+    if width_emu <= 0:
+        return max(1, len(text))
+    max_em = Emu(width_emu).pt / size_pt
+    space = glyph_widths(family)[" "]
+    lines = 0
+
+    for line in word_widths_em(text, family):
+        lines += 1
+        used = 0.0
+        for word_em in line:
+            needed = word_em if used == 0 else used + space + word_em
+            if needed <= max_em:
+                used = needed
+            elif word_em <= max_em:
+                lines += 1
+                used = word_em
+            else:
+                # A single word wider than the box is broken across lines; the
+                # last piece fills its line when the word is an exact multiple
+                extra = math.ceil(word_em / max_em) - 1
+                lines += extra if used == 0 else extra + 1
+                used = word_em - extra * max_em
+    return lines
+
+
+def text_height_emu(paragraphs: Sequence[str], size_pt: float, width_emu: int,
+                    spacing_pt: float = 0, family: str = DEFAULT_FONT) -> int:
+    """Height needed to set ``paragraphs`` in a box ``width_emu`` wide."""
+    lines = sum(wrap_line_count(p, size_pt, width_emu, family) for p in paragraphs)
+    points = lines * size_pt * LINE_SPACING + len(paragraphs) * spacing_pt
+    return Emu(math.ceil(points * Pt(1)))
+
+
+def text_fits(paragraphs: Sequence[str], size_pt: float, width_emu: int, height_emu: int,
+              spacing_pt: float = 0, family: str = DEFAULT_FONT) -> bool:
+    """Like ``text_height_emu(...) <= height_emu``, but stops once the box is full."""
+    budget = Emu(height_emu).pt - len(paragraphs) * spacing_pt + 1e-6  # float tolerance
+    line_height = size_pt * LINE_SPACING
+    used = 0.0
+    for paragraph in paragraphs:
+        used += wrap_line_count(paragraph, size_pt, width_emu, family) * line_height
+        if used > budget:
+            return False
+    return True
+
+
+def largest_fitting_size(sizes: Sequence[int], paragraphs: Sequence[str], width_emu: int,
+                         height_emu: int, spacing_pt: float = 0,
+                         family: str = DEFAULT_FONT) -> Optional[int]:
+    """Binary search ``sizes`` (largest first) for the largest size whose text fits."""
+    low, high = 0, len(sizes) - 1
+    found = None
+    while low <= high:
+        mid = (low + high) // 2
+        if text_fits(paragraphs, sizes[mid], width_emu, height_emu, spacing_pt, family):
+            found = sizes[mid]
+            high = mid - 1
+        else:
+            low = mid + 1
+    return found
+
+
+_JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7,
+                     0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+_JPEG_HEADER_BYTES = 64 * 1024
+
+
+def _jpeg_size(header: bytes) -> Optional[tuple]:
+    """(width, height) from the first start-of-frame segment of a JPEG header."""
+    i = 2  # after the SOI marker
+    while i + 9 <= len(header):
+        if header[i] != 0xFF:
+            return None
+        marker = header[i + 1]
+        if marker in _JPEG_SOF_MARKERS:
+            height, width = struct.unpack(">HH", header[i + 5:i + 9])
+            return width, height
+        i += 2 + struct.unpack(">H", header[i + 2:i + 4])[0]
+    return None
+
+
+def image_aspect_ratio(image: ImageData) -> float:
+    """Width / height of an image, read from its PNG, GIF or JPEG header when possible."""
+    if not image.is_empty:
+        try:
+            if image.mime_type == "image/png":
+                width, height = struct.unpack(">II", image.head(24)[16:24])
+            elif image.mime_type == "image/gif":
+                width, height = struct.unpack("<HH", image.head(10)[6:10])
+            elif image.mime_type == "image/jpeg":
+                width, height = _jpeg_size(image.head(_JPEG_HEADER_BYTES)) or (0, 0)
+            else:
+                width = height = 0
+            if width and height:
+                return width / height
+        except Exception:
+            pass
+    return 4 / 3
+
+
+@dataclass
+class Box:
+    left: int
+    top: int
+    width: int
+    height: int
+
+    def fit(self, aspect_ratio: float) -> "Box":
+        """Largest box with ``aspect_ratio`` centred inside this one."""
+        width, height = self.width, int(self.width / aspect_ratio)
+        if height > self.height:
+            width, height = int(self.height * aspect_ratio), self.height
+        return Box(self.left + (self.width - width) // 2,
+                   self.top + (self.height - height) // 2, width, height)
+
+    def split_columns(self, ratio: float = 0.5, gap: int = Inches(0.25)) -> List["Box"]:
+        left_width = int((self.width - gap) * ratio)
+        return [Box(self.left, self.top, left_width, self.height),
+                Box(self.left + left_width + gap, self.top,
+                    self.width - left_width - gap, self.height)]
+
+    def split_rows(self, ratio: float = 0.5, gap: int = Inches(0.2)) -> List["Box"]:
+        top_height = int((self.height - gap) * ratio)
+        return [Box(self.left, self.top, self.width, top_height),
+                Box(self.left, self.top + top_height + gap,
+                    self.width, self.height - top_height - gap)]
+
+    def grid(self, count: int, gap: int = Inches(0.2)) -> List["Box"]:
+        """Split into ``count`` cells, as close to square as possible."""
+        cols = 1
+        while cols * cols < count:
+            cols += 1
+        rows = -(-count // cols)
+        cell_width = (self.width - gap * (cols - 1)) // cols
+        cell_height = (self.height - gap * (rows - 1)) // rows
+        return [Box(self.left + (i % cols) * (cell_width + gap),
+                    self.top + (i // cols) * (cell_height + gap),
+                    cell_width, cell_height) for i in range(count)]
+
+
+@dataclass
+class SlideLayout:
+    name: str
+    title_font_size: Optional[int] = None  # None keeps the template size
+    bullet_box: Optional[Box] = None
+    bullet_font_size: int = BULLET_FONT_SIZES[-1]
+    image_boxes: List[Box] = field(default_factory=list)
+    table_box: Optional[Box] = None
+    table_font_size: int = TABLE_FONT_SIZES[-1]
+    table_rows: int = 0  # data rows that fit in table_box
+    overflow: bool = False  # content could not be made to fit
+
+
+class LayoutEngine:
+    """
+    Plan the position and font sizes of everything on a content slide.
+
+    Layouts are tried in order of preference for the kinds of content on the
+    slide, and the first one whose text fits (at the largest font size that fits)
+    is chosen. If nothing fits, the roomiest layout is used at the smallest font
+    size and the plan is flagged as overflowing.
+    """
+
+    def __init__(self, slide_width: int = Inches(10), slide_height: int = Inches(7.5),
+                 font_family: str = DEFAULT_FONT):
+        self.slide_width = slide_width
+        self.slide_height = slide_height
+        self.font_family = font_family
+        margin = Inches(0.5)
+        self.title_box = Box(margin, Inches(0.3), slide_width - 2 * margin, Inches(1.25))
+        self.content_box = Box(margin, Inches(1.75), slide_width - 2 * margin,
+                               slide_height - Inches(1.75) - margin)
+
+    def plan(self, parsed_content: ParsedCell) -> SlideLayout:
+        bullets = parsed_content.bullets
+        images = [image for image in parsed_content.images if not image.is_empty]
+        table = parsed_content.table if isinstance(parsed_content.table, list) else None
+
+        best = None
+        for candidate in self._candidates(bool(bullets), len(images), table):
+            self._fit_bullets(candidate, bullets)
+            self._fit_table(candidate, table)
+            if not candidate.overflow:
+                best = candidate
+                break
+            if best is None:
+                best = candidate
+
+        best.image_boxes = [box.fit(image_aspect_ratio(image))
+                            for box, image in zip(best.image_boxes, images)]
+        best.title_font_size = self._fit_title(parsed_content.title)
+        return best
+
+    def _candidates(self, has_bullets: bool, n_images: int, table) -> List[SlideLayout]:
+        content = self.content_box
+        has_table = bool(table)
+
+        if not n_images and not has_table:
+            return [SlideLayout("bullets", bullet_box=content)]
+        if not has_bullets and not has_table:
+            return [SlideLayout("images", image_boxes=content.grid(n_images))]
+        if not has_bullets and not n_images:
+            return [SlideLayout("table", table_box=content)]
+
+        candidates = []
+        if has_bullets and n_images and not has_table:
+            text, media = content.split_columns()
+            candidates.append(SlideLayout("text_left_images_right", bullet_box=text,
+                                          image_boxes=media.grid(n_images)))
+            text, media = content.split_rows(0.35)
+            candidates.append(SlideLayout("text_top_images_bottom", bullet_box=text,
+                                          image_boxes=media.grid(n_images)))
+        elif has_bullets and has_table and not n_images:
+            for ratio in (0.35, 0.5):
+                text, grid = content.split_rows(ratio)
+                candidates.append(SlideLayout("text_top_table_bottom",
+                                              bullet_box=text, table_box=grid))
+        elif has_table and n_images and not has_bullets:
+            grid, media = content.split_columns(0.6)
+            candidates.append(SlideLayout("table_left_images_right", table_box=grid,
+                                          image_boxes=media.grid(n_images)))
+        else:
+            text, bottom = content.split_rows(0.35)
+            grid, media = bottom.split_columns(0.6)
+            candidates.append(SlideLayout("text_top_table_images_bottom", bullet_box=text,
+                                          table_box=grid, image_boxes=media.grid(n_images)))
+        return candidates
+
+    def _fit_bullets(self, layout: SlideLayout, bullets: List[str]) -> None:
+        if not bullets or layout.bullet_box is None:
+            return
+        box = layout.bullet_box
+        width = box.width - BULLET_INDENT - TEXT_INSETS
+        size = largest_fitting_size(BULLET_FONT_SIZES, bullets, width, box.height,
+                                    BULLET_SPACING_PT, self.font_family)
+        layout.bullet_font_size = size or BULLET_FONT_SIZES[-1]
+        layout.overflow = size is None
+
+    def _fit_table(self, layout: SlideLayout, table) -> None:
+        if not table or layout.table_box is None:
+            return
+        n_rows = min(len(table), MAX_TABLE_ROWS)
+        for size in TABLE_FONT_SIZES:
+            row_height = Pt(size * LINE_SPACING) + Inches(0.1)  # text + cell margins
+            rows_that_fit = layout.table_box.height // row_height - 1  # minus header
+            if rows_that_fit >= n_rows:
+                layout.table_font_size = size
+                layout.table_rows = n_rows
+                return
+        layout.table_font_size = TABLE_FONT_SIZES[-1]
+        layout.table_rows = max(1, int(rows_that_fit))
+        # Rows that don't fit are truncated (and exported), so this is not an overflow
+
+    def _fit_title(self, title: Optional[str]) -> Optional[int]:
+        if not title:
+            return None
+        size = largest_fitting_size(TITLE_FONT_SIZES, [title], self.title_box.width - TEXT_INSETS,
+                                    self.title_box.height, 0, self.font_family)
+        if size == TITLE_FONT_SIZES[0]:
+            return None
+        return size or TITLE_FONT_SIZES[-1]
+
+
+def clear_caches() -> None:
+    """Drop all cached font metrics and wrap results."""
+    glyph_widths.cache_clear()
+    text_width_em.cache_clear()
+    word_widths_em.cache_clear()
+    wrap_line_count.cache_clear()
+
+
+def cache_info() -> Dict[str, object]:
+    return {
+        "text_width_em": text_width_em.cache_info(),
+        "word_widths_em": word_widths_em.cache_info(),
+        "wrap_line_count": wrap_line_count.cache_info(),
+    }
@@ -0,0 +1,133 @@
+# lazy.py
+"""Memory-mapped notebook reading with lazy image payloads.
+
+``load_notebook_lazily`` maps the .ipynb file and finds the base64 payloads of
+PNG, JPEG and GIF outputs before the JSON is parsed. Each payload is replaced
+by an ``ImageSpan`` that records where it lies in the file, so neither the JSON
+parser nor the parsed cells hold a copy of the image. A span is only decoded
+when its bytes are needed: the renderer writes them straight into the package
+part as the deck is saved, one image at a time.
+
+Spans hold the file's path, size and modification time rather than the map
+itself, so they pickle cheaply to worker processes, which map the file again.
+Decoding a span after its notebook has changed raises ``ValueError``.
+"""
+
+import binascii
+import hashlib
+import mmap
+import os
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, List, Tuple
+
+import nbformat
+
+_PAYLOAD = re.compile(rb'"(image/(?:png|jpeg|gif))"\s*:\s*"')
+_ESCAPED_NEWLINE = b"\\n"
+TOKEN_PREFIX = "\x00jupdeck-span:"  # written into the JSON as "\u0000jupdeck-span:<n>"
+MIN_SPAN_BYTES = 1024  # smaller payloads stay inline
+
+
+@lru_cache(maxsize=32)
+def _map(path: str, size: int, mtime_ns: int) -> mmap.mmap:
+    stat = os.stat(path)
+    if (stat.st_size, stat.st_mtime_ns) != (size, mtime_ns):
+        raise ValueError(f"{path} has changed since it was parsed")
+    with open(path, "rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+@dataclass(frozen=True)
+class ImageSpan:
+    """A base64 image payload at ``[start, end)`` of a notebook file."""
+
+    path: str
+    start: int
+    end: int
+    size: int      # file size and modification time when parsed
+    mtime_ns: int
+
+    @property
+    def length(self) -> int:
+        return self.end - self.start
+
+    def view(self) -> memoryview:
+        """The base64 payload, without copying it out of the map."""
+        return memoryview(_map(self.path, self.size, self.mtime_ns))[self.start:self.end]
+
+    def decode(self) -> bytes:
+        return binascii.a2b_base64(self.view())
+
+    def head(self, n_bytes: int) -> bytes:
+        return binascii.a2b_base64(self.view()[:-(-n_bytes // 3) * 4])[:n_bytes]
+
+    def digest(self) -> str:
+        """SHA1 of the base64 payload, identifying the image without decoding it."""
+        return hashlib.sha1(self.view()).hexdigest()
+
+    def __str__(self) -> str:
+        return str(self.view(), "ascii")  # the payload as it appeared in the notebook
+
+
+def _find_payloads(buffer, path: str, stat) -> Tuple[List[bytes], List[Tuple[ImageSpan, int]]]:
+    """Split the file around lazy payloads: (JSON pieces, [(span, end of JSON string)])."""
+    pieces, spans = [], []
+    position = 0
+    match = _PAYLOAD.search(buffer)
+    while match:
+        start = match.end()
+        string_end = buffer.find(b'"', start)
+        if string_end < 0:
+            break
+        end = string_end
+        while buffer[end - 2:end] == _ESCAPED_NEWLINE:
+            end -= 2
+        if end - start >= MIN_SPAN_BYTES and buffer.find(b"\\", start, end) < 0:
+            pieces.append(buffer[position:start])
+            pieces.append(b"\\u0000jupdeck-span:%d" % len(spans))
+            spans.append((ImageSpan(path, start, end, stat.st_size, stat.st_mtime_ns),
+                          string_end))
+            position = string_end
+        match = _PAYLOAD.search(buffer, string_end + 1)
+    pieces.append(buffer[position:])
+    return pieces, spans
+
+
+def _restore(value: Any, spans, buffer) -> Any:
+    """Put the original strings back wherever a token is not an output's image payload."""
+    if isinstance(value, dict):
+        for key, item in value.items():
+            value[key] = _restore(item, spans, buffer)
+    elif isinstance(value, list):
+        for i, item in enumerate(value):
+            value[i] = _restore(item, spans, buffer)
+    elif isinstance(value, str) and value.startswith(TOKEN_PREFIX):
+        span, string_end = spans[int(value[len(TOKEN_PREFIX):])]
+        return str(buffer[span.start:string_end], "ascii").replace("\\n", "\n")
+    return value
+
+
+def load_notebook_lazily(notebook_path: Path) -> nbformat.NotebookNode:
+    """
+    Load a notebook whose output image payloads are ``ImageSpan`` objects
+    instead of base64 strings.
+    """
+    path = str(Path(notebook_path).resolve())
+    stat = os.stat(path)
+    if stat.st_size == 0:
+        raise nbformat.reader.NotJSONError("Notebook does not appear to be JSON: ''")
+    buffer = _map(path, stat.st_size, stat.st_mtime_ns)
+
+    pieces, spans = _find_payloads(buffer, path, stat)
+    nb = nbformat.reads(b"".join(pieces).decode("utf-8"), as_version=4)
+
+    for cell in nb.cells:
+        for output in cell.get("outputs", []):
+            data = output.get("data", {})
+            for mime_type, payload in data.items():
+                if isinstance(payload, str) and payload.startswith(TOKEN_PREFIX):
+                    data[mime_type] = spans[int(payload[len(TOKEN_PREFIX):])][0]
+    return _restore(nb, spans, buffer)
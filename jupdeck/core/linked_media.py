@@ -0,0 +1,87 @@
+# linked_media.py
+"""Keep a deck's images in a sidecar directory and link to them.
+
+Embedding hundreds of high-resolution figures makes a deck large and slow to
+save, since every image is compressed into the .pptx again. In linked mode each
+distinct image is written once to ``<deck>_media/``, named by the SHA1 of its
+bytes, and pictures refer to it through an external relationship whose target
+is the path relative to the deck. The deck and its media directory can be
+moved together; PowerPoint and LibreOffice resolve the links against the
+deck's own location.
+
+Files are only written when missing, so rebuilding a deck rewrites none of its
+unchanged images, and names are the same in every run (and in every process,
+for split decks rendered in parallel).
+"""
+
+import hashlib
+import os
+from pathlib import Path
+from typing import Dict
+
+from pptx.oxml.ns import qn
+from pptx.parts.image import Image
+
+MEDIA_DIR_SUFFIX = "_media"
+
+
+def media_dir(output_path: Path) -> Path:
+    """The sidecar directory for a deck: ``deck.pptx`` -> ``deck_media``."""
+    output_path = Path(output_path)
+    return output_path.with_name(f"{output_path.stem}{MEDIA_DIR_SUFFIX}")
+
+
+class LinkedMedia:
+    """Images written to ``directory`` for a deck saved at ``deck_path``."""
+
+    def __init__(self, directory: Path, deck_path: Path):
+        self.directory = Path(directory)
+        self.deck_dir = Path(deck_path).parent  # link targets are relative to it
+        self.files_written = 0
+        self._targets: Dict[str, str] = {}  # sha1 -> link target
+
+    def target_for(self, blob: bytes, sha1: str | None = None, ext: str | None = None) -> str:
+        """
+        The link target of the file holding ``blob``, written the first time it's
+        seen. The file extension is read from the image unless ``ext`` is given.
+        """
+        sha1 = sha1 or hashlib.sha1(blob).hexdigest()
+        target = self._targets.get(sha1)
+        if target is None:
+            path = self.directory / f"{sha1}.{ext or Image.from_blob(blob).ext}"
+            if not path.exists() or path.stat().st_size != len(blob):
+                self.directory.mkdir(parents=True, exist_ok=True)
+                tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+                tmp_path.write_bytes(blob)
+                os.replace(tmp_path, path)
+                self.files_written += 1
+            target = Path(os.path.relpath(path, self.deck_dir)).as_posix()
+            self._targets[sha1] = target
+        return target
+
+    def read(self, target: str) -> bytes:
+        """The bytes of a linked image, from its link target."""
+        return (self.deck_dir / target).read_bytes()
+
+
+def add_linked_picture(slide, rId: str, box, description: str = "") -> None:
+    """Add a picture showing the external image of relationship ``rId`` inside ``box``."""
+    shapes = slide.shapes
+    shape_id = shapes._next_shape_id
+    pic = shapes._grpSp.add_pic(shape_id, f"Picture {shape_id - 1}", description, rId,
+                                box.left, box.top, box.width, box.height)
+    link(pic.blipFill.blip)
+
+
+def link(blip) -> None:
+    """Turn an ``<a:blip>`` that embeds its image into one that links to it."""
+    rId = blip.attrib.pop(qn("r:embed"), None)
+    if rId is not None:
+        blip.set(qn("r:link"), rId)
+
+
+def embed(blip) -> None:
+    """Inverse of ``link``."""
+    rId = blip.attrib.pop(qn("r:link"), None)
+    if rId is not None:
+        blip.set(qn("r:embed"), rId)
@@ -0,0 +1,245 @@
+# media.py
+"""Recognise image outputs and convert the ones PowerPoint can't embed.
+
+PNG, JPEG and GIF are embedded as they are. SVG and PDF figures (e.g. from
+``set_matplotlib_formats("svg")``) are rasterised to PNG by the first converter
+that is available: ``cairosvg`` or ``rsvg-convert``/``inkscape`` for SVG, and
+PyMuPDF or ``pdftoppm`` for PDF. Conversions run in a process pool and are
+cached on disk by content hash, so a figure is only converted once across runs.
+"""
+
+import base64
+import hashlib
+import os
+import shutil
+import subprocess
+import tempfile
+import urllib.parse
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import nullcontext
+from dataclasses import replace
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from jupdeck.core.budget import placeholder
+from jupdeck.core.lazy import ImageSpan
+from jupdeck.core.models import ImageData, ParsedCell
+
+NATIVE_TYPES = ("image/png", "image/jpeg", "image/gif")
+VECTOR_TYPES = ("image/svg+xml", "application/pdf")
+# Preferred representation when an output carries the same figure in several formats
+OUTPUT_PREFERENCE = NATIVE_TYPES + VECTOR_TYPES
+TEXT_TYPES = ("image/svg+xml",)  # stored as text in notebooks, not base64
+RASTER_DPI = 150
+CONVERTER_VERSION = 1  # bump to invalidate cached conversions
+
+MIME_ALIASES = {"image/jpg": "image/jpeg", "image/svg": "image/svg+xml"}
+
+
+class MediaConversionError(Exception):
+    pass
+
+
+def output_image(data: Dict[str, object]) -> Optional[ImageData]:
+    """The best image in a display_data/execute_result output's mime bundle, if any."""
+    for mime_type in OUTPUT_PREFERENCE:
+        payload = data.get(mime_type)
+        if not payload:
+            continue
+        if isinstance(payload, ImageSpan):  # from a lazily loaded notebook
+            return ImageData(mime_type=mime_type, span=payload)
+        if isinstance(payload, list):  # multiline strings in older notebooks
+            payload = "".join(payload)
+        if mime_type in TEXT_TYPES:
+            payload = base64.b64encode(payload.encode("utf-8")).decode("ascii")
+        return ImageData(mime_type=mime_type, data=payload.replace("\n", ""))
+    return None
+
+
+def data_uri_image(url: str) -> Optional[ImageData]:
+    """An image from a ``data:`` URI, keeping its real mime type."""
+    if not url.startswith("data:"):
+        return None
+    header, _, payload = url[len("data:"):].partition(",")
+    mime_type, *params = header.split(";")
+    mime_type = MIME_ALIASES.get(mime_type.lower(), mime_type.lower())
+    if mime_type not in OUTPUT_PREFERENCE:
+        return None
+    if "base64" not in params:
+        payload = base64.b64encode(urllib.parse.unquote_to_bytes(payload)).decode("ascii")
+    return ImageData(mime_type=mime_type, data=payload)
+
+
+def needs_conversion(image: ImageData) -> bool:
+    return image.mime_type not in NATIVE_TYPES and not image.is_empty
+
+
+def content_key(mime_type: str, source: bytes) -> str:
+    return hashlib.sha256(mime_type.encode() + b"\0" + source).hexdigest()
+
+
+# --- converters ---------------------------------------------------------------
+
+def _run(command: List[str], source: bytes, suffix: str) -> bytes:
+    """Run a converter command; ``{src}``, ``{out}`` and ``{dpi}`` are filled in."""
+    with tempfile.TemporaryDirectory(prefix="jupdeck-media-") as tmp:
+        source_path, out = Path(tmp) / f"figure{suffix}", Path(tmp) / "out"
+        source_path.write_bytes(source)
+        subprocess.run([part.format(src=source_path, out=out, dpi=RASTER_DPI) for part in command],
+                       check=True, capture_output=True, timeout=60)
+        return out.with_suffix(".png").read_bytes()
+
+
+def svg_to_png(svg: bytes) -> bytes:
+    try:
+        import cairosvg
+        return cairosvg.svg2png(bytestring=svg, dpi=RASTER_DPI)
+    except ImportError:
+        pass
+    if shutil.which("rsvg-convert"):
+        return _run(["rsvg-convert", "--dpi-x", "{dpi}", "--dpi-y", "{dpi}",
+                     "-o", "{out}.png", "{src}"], svg, ".svg")
+    if shutil.which("inkscape"):
+        return _run(["inkscape", "--export-type=png", "--export-dpi={dpi}",
+                     "--export-filename={out}.png", "{src}"], svg, ".svg")
+    raise MediaConversionError("SVG figures need cairosvg, rsvg-convert or inkscape")
+
+
+def pdf_to_png(pdf: bytes) -> bytes:
+    try:
+        import fitz  # PyMuPDF
+        with fitz.open(stream=pdf, filetype="pdf") as document:
+            return document[0].get_pixmap(dpi=RASTER_DPI).tobytes("png")
+    except ImportError:
+        pass
+    if shutil.which("pdftoppm"):
+        return _run(["pdftoppm", "-png", "-singlefile", "-r", "{dpi}", "{src}", "{out}"],
+                    pdf, ".pdf")
+    raise MediaConversionError("PDF figures need PyMuPDF or pdftoppm")
+
+
+CONVERTERS: Dict[str, Callable[[bytes], bytes]] = {
+    "image/svg+xml": svg_to_png,
+    "application/pdf": pdf_to_png,
+}
+
+
+def convert(mime_type: str, source: bytes) -> Tuple[Optional[bytes], Optional[str]]:
+    """Worker entry point: (PNG bytes, None), or (None, reason) when conversion failed."""
+    converter = CONVERTERS.get(mime_type)
+    if converter is None:
+        return None, f"no converter for {mime_type}"
+    try:
+        return converter(source), None
+    except (MediaConversionError, OSError, subprocess.SubprocessError, ValueError) as e:
+        return None, str(e) or type(e).__name__
+
+
+# --- cached pipeline ----------------------------------------------------------
+
+def default_cache_dir() -> Path:
+    if os.environ.get("JUPDECK_CACHE_DIR"):
+        return Path(os.environ["JUPDECK_CACHE_DIR"]) / "media"
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "jupdeck" / "media"
+
+
+class MediaPipeline:
+    """Converts images that need it, once per distinct payload, with an on-disk cache."""
+
+    def __init__(self, cache_dir: Optional[Path] = None, workers: int = 1,
+                 executor: Optional[Executor] = None):
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir()
+        self.workers = workers
+        self.executor = executor  # a process pool to reuse instead of starting one
+        self.converted = 0
+        self.cache_hits = 0
+        self.failures: Dict[str, str] = {}  # content hash -> reason
+
+    def _cache_path(self, digest: str) -> Path:
+        return self.cache_dir / f"{digest}-v{CONVERTER_VERSION}-{RASTER_DPI}dpi.png"
+
+    def _read_cache(self, digest: str) -> Optional[bytes]:
+        try:
+            return self._cache_path(digest).read_bytes()
+        except OSError:
+            return None
+
+    def _write_cache(self, digest: str, png: bytes) -> None:
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            path = self._cache_path(digest)
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            tmp_path.write_bytes(png)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass  # the cache is an optimisation only
+
+    def convert_images(self, images: List[ImageData]) -> Dict[str, Optional[bytes]]:
+        """Map the content hash of each image that needs conversion to its PNG (None if failed)."""
+        pending: Dict[str, Tuple[str, bytes]] = {}  # content hash -> (mime type, source)
+        results: Dict[str, Optional[bytes]] = {}
+        for image in images:
+            if not needs_conversion(image):
+                continue
+            source = image.to_bytes()
+            digest = content_key(image.mime_type, source)
+            if digest in results or digest in pending:
+                continue
+            cached = self._read_cache(digest)
+            if cached is not None:
+                self.cache_hits += 1
+                results[digest] = cached
+            else:
+                pending[digest] = (image.mime_type, source)
+
+        if not pending:
+            return results
+        jobs = list(pending.values())
+        if self.workers > 1 and len(jobs) > 1:
+            pool = nullcontext(self.executor) if self.executor else \
+                ProcessPoolExecutor(max_workers=min(self.workers, len(jobs)))
+            with pool as executor:
+                outcomes = list(executor.map(convert, *zip(*jobs)))
+        else:
+            outcomes = [convert(*job) for job in jobs]
+
+        for digest, (png, reason) in zip(pending, outcomes):
+            results[digest] = png
+            if png is None:
+                self.failures[digest] = reason
+            else:
+                self.converted += 1
+                self._write_cache(digest, png)
+        return results
+
+    def prepare(self, parsed_contents: List[ParsedCell]) -> List[ParsedCell]:
+        """
+        Replace vector images with their PNG conversions. Images that could not
+        be converted become a placeholder bullet. Changed cells are copied.
+        """
+        images = [image for parsed in parsed_contents for image in parsed.images]
+        if not any(needs_conversion(image) for image in images):
+            return parsed_contents
+        converted = self.convert_images(images)
+
+        result = []
+        for parsed_content in parsed_contents:
+            if not any(needs_conversion(image) for image in parsed_content.images):
+                result.append(parsed_content)
+                continue
+            kept, omitted = [], []
+            for image in parsed_content.images:
+                if not needs_conversion(image):
+                    kept.append(image)
+                    continue
+                png = converted.get(content_key(image.mime_type, image.to_bytes()))
+                if png is None:
+                    omitted.append(image.mime_type)
+                else:
+                    kept.append(ImageData("image/png", blob=png))
+            bullets = parsed_content.bullets + [
+                placeholder(f"{mime_type} figure omitted: it could not be converted")
+                for mime_type in omitted]
+            result.append(replace(parsed_content, images=kept, bullets=bullets))
+        return result
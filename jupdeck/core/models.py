@@ -1,11 +1,47 @@
+import base64
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Literal, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Literal, Optional, Union
+
+if TYPE_CHECKING:
+    from jupdeck.core.lazy import ImageSpan
 
 
 @dataclass
 class ImageData:
     mime_type: str
-    data: str  # base64-encoded image string
+    data: str = ""  # base64-encoded image string
+    blob: Optional[Union[bytes, memoryview]] = field(default=None, repr=False)  # raw bytes
+    span: Optional["ImageSpan"] = None  # base64 payload in a mapped notebook, decoded lazily
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.data and not self.blob and not (self.span and self.span.length)
+
+    def to_bytes(self) -> bytes:
+        """Decoded image bytes, from ``blob`` or ``span`` when set and ``data`` otherwise."""
+        if self.blob is not None:
+            return bytes(self.blob)
+        if self.span is not None:
+            return self.span.decode()
+        return base64.b64decode(self.data)
+
+    def head(self, n_bytes: int) -> bytes:
+        """The first ``n_bytes`` of the decoded image, without decoding the rest."""
+        if self.blob is not None:
+            return bytes(self.blob[:n_bytes])
+        if self.span is not None:
+            return self.span.head(n_bytes)
+        return base64.b64decode(self.data[:-(-n_bytes // 3) * 4])[:n_bytes]
+
+    def __deepcopy__(self, memo) -> "ImageData":
+        # Image payloads are never modified, so copies share them
+        return ImageData(self.mime_type, self.data, self.blob, self.span)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        if isinstance(self.blob, memoryview):
+            state["blob"] = bytes(self.blob)  # views of a memory map can't be pickled
+        return state
 
 @dataclass
 class SlideContent:
@@ -28,7 +64,8 @@ class ParsedCell:
     code: Optional[str] = None          # source code (cleaned or annotated)
     images: List[ImageData] = field(default_factory=list)  # base64 or file path
     table: Optional[List[Dict[str, Any]]] = None  # structured table data
-    raw_outputs: Optional[List[Dict[str, Any]]] = None  # full outputs if needed
+    raw_outputs: Optional[List[Dict[str, Any]]] = None  # outputs, without text in text_output
+    text_output: Optional[str] = None  # head and tail of the printed text
     metadata: Dict[str, Any] = field(default_factory=dict)  # magic commands, tags
 
     def merge_cells(self, others: List["ParsedCell"]) -> "ParsedCell":
@@ -38,6 +75,7 @@ class ParsedCell:
         merged_raw_outputs = self.raw_outputs[:] if self.raw_outputs else []
 
         final_table = self.table
+        text_outputs = [self.text_output] if self.text_output else []
         for other in others:
             merged_bullets.extend(other.bullets)
             merged_paragraphs.extend(other.paragraphs)
@@ -46,6 +84,8 @@ class ParsedCell:
                 merged_raw_outputs.extend(other.raw_outputs)
             if not final_table and other.table:
                 final_table = other.table
+            if other.text_output:
+                text_outputs.append(other.text_output)
 
         merged_metadata = {**self.metadata}
         for other in others:
@@ -61,5 +101,6 @@ class ParsedCell:
             images=merged_images,
             table=final_table,
             raw_outputs=merged_raw_outputs,
+            text_output="\n".join(text_outputs) or None,
             metadata=merged_metadata
         )
@@ -2,14 +2,18 @@
 """Functions to parse .ipynb files."""
 
 import io
+import time
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Collection, Dict, List
 
 import mistune
 import nbformat
 import pandas as pd
 
-from jupdeck.core.models import ImageData, ParsedCell
+from jupdeck.core import directives, lazy, media, text_output
+from jupdeck.core.budget import Budget, BudgetTracker, placeholder
+from jupdeck.core.events import EventReporter
+from jupdeck.core.models import ParsedCell
 
 
 def load_notebook(notebook_path: Path) -> nbformat.NotebookNode:
@@ -17,46 +21,93 @@ def load_notebook(notebook_path: Path) -> nbformat.NotebookNode:
     with notebook_path.open("r", encoding="utf-8") as f:
         return nbformat.read(f, as_version=4)
 
-def parse_notebook(notebook_path: Path) -> Dict[str, Any]:
-    """Full notebook parsing pipeline."""
-    nb = load_notebook(notebook_path)
-    cell_data = extract_cells(nb)
-    return {"metadata": nb.metadata, "cells": cell_data}
+def parse_notebook(notebook_path: Path, budget: Budget | None = None,
+                   reporter: EventReporter | None = None) -> Dict[str, Any]:
+    """
+    Full notebook parsing pipeline. Output images are read lazily from a memory
+    map of the notebook, so the file must not change before the deck is rendered.
+    """
+    nb = lazy.load_notebook_lazily(notebook_path)
+    return parse_notebook_node(nb, Path(notebook_path).name, budget, reporter=reporter)
+
+def parse_notebook_node(nb: nbformat.NotebookNode, source: str | None = None,
+                        budget: Budget | None = None,
+                        cells: Collection[int] | None = None,
+                        reporter: EventReporter | None = None) -> Dict[str, Any]:
+    """
+    Parse an already loaded notebook; ``source`` names it in budget decisions
+    and progress events. With ``cells``, only the cells at those indices are parsed.
+    """
+    reporter = reporter or EventReporter()
+    start = time.perf_counter()
+    tracker = BudgetTracker(budget, source=source) if budget else None
+    selected, skipped = directives.select_cells(nb.cells)
+    if cells is not None:
+        selected = [entry for entry in selected if entry[0] in cells]
+    reporter.emit("parse_started", notebook=source, cells=len(selected))
+    cell_data = parse_selected_cells(selected, tracker)
+    reporter.emit("parse_finished", notebook=source, cells=len(cell_data),
+                  seconds=round(time.perf_counter() - start, 6))
+    parsed = {"metadata": nb.metadata, "cells": cell_data, "skipped_cells": skipped}
+    if tracker:
+        parsed["budget_decisions"] = tracker.decisions
+    return parsed
 
 def extract_cells(nb: nbformat.NotebookNode) -> List[ParsedCell]:
-    """Parse all notebook cells into a list of ParsedCell objects."""
+    """Parse all visible notebook cells into a list of ParsedCell objects."""
+    selected, _ = directives.select_cells(nb.cells)
+    return parse_selected_cells(selected)
+
+def parse_selected_cells(selected, budget: BudgetTracker | None = None) -> List[ParsedCell]:
+    """Parse the cells returned by ``directives.select_cells``."""
     parsed = []
 
-    for cell in nb.cells:
+    for position, (index, cell, cell_directives) in enumerate(selected):
+        if budget and budget.out_of_time():
+            parsed.append(budget.skip_remaining(len(selected) - position, index))
+            break
+
         cell_type = cell.get("cell_type")
 
         if cell_type == "markdown":
             parsed_cell = parse_markdown_cell(cell)
         elif cell_type == "code":
-            parsed_cell = parse_code_cell(cell)
+            parsed_cell = parse_code_cell(cell, budget, index)
         else:
             # Optionally skip or log unsupported cell types
             continue
 
+        parsed_cell.metadata.update(directives.directive_metadata(cell_directives))
         parsed.append(parsed_cell)
         
     return parsed
 
 
 
-def parse_code_cell(cell) -> ParsedCell:
+def parse_code_cell(cell, budget: BudgetTracker | None = None,
+                    cell_index: int | None = None) -> ParsedCell:
     outputs = cell.get("outputs", [])
     images = []
     table = None
 
+    if budget and not budget.allow_outputs(outputs, cell_index):
+        return ParsedCell(
+            type="code",
+            code=cell.get("source", "").strip(),
+            bullets=[placeholder("Output omitted: notebook output budget exceeded")],
+            raw_outputs=[],
+        )
+
     for output in outputs:
         if output.get("output_type") in ("display_data", "execute_result"):
-            img_data = output.get("data", {}).get("image/png")
-            if img_data:
-                images.append(ImageData(mime_type="image/png", data=img_data))
+            image = media.output_image(output.get("data", {}))
+            if image:
+                images.append(image)
 
             html = output.get("data", {}).get("text/html")
             if html and "<table" in html:
+                if budget:
+                    html = budget.limit_table_html(html, cell_index)
                 try:
                     dfs = pd.read_html(io.StringIO(html))
                     if dfs:
@@ -64,14 +115,26 @@ def parse_code_cell(cell) -> ParsedCell:
                 except Exception:
                     pass  # Silently ignore if read_html fails
 
+    # Printed text is kept as a bounded excerpt; the full streams are not held on to
     return ParsedCell(
         type="code",
         code=cell.get("source", "").strip(),
         images=images,
         table=table,
-        raw_outputs=outputs,
+        raw_outputs=[_without_text(output) for output in outputs],
+        text_output=text_output.capture_text_outputs(outputs),
     )
 
+def _without_text(output):
+    # Text that went into the excerpt isn't kept a second time
+    if output.get("output_type") == "stream":
+        return {"output_type": "stream", "name": output.get("name")}
+    if output.get("output_type") in ("display_data", "execute_result") and \
+            text_output.output_text(output):
+        data = {mime: value for mime, value in output["data"].items() if mime != "text/plain"}
+        return {**output, "data": data}
+    return output
+
 def parse_markdown_cell(cell) -> ParsedCell:
     markdown = mistune.create_markdown(renderer="ast")
     ast = markdown(cell.source)
@@ -91,14 +154,9 @@ def parse_markdown_cell(cell) -> ParsedCell:
             for child in node.get("children", []):
                 if child["type"] == "image":
                     url = child.get("attrs", {}).get("url", "")
-                    if url and url.startswith("data:image/"):
-                        try:
-                            header, bytestring = url.split(",", 1)
-                            images.append(
-                                ImageData(mime_type="image/png", 
-                                          data=bytestring))
-                        except Exception:
-                            pass  # skip images that cannot be decoded
+                    image = media.data_uri_image(url) if url else None
+                    if image:
+                        images.append(image)
             paragraphs.append(flatten_ast_as_text(node.get("children", [])))
         elif node["type"] == "list":
             for item in node.get("children", []):
@@ -114,32 +172,100 @@ def parse_markdown_cell(cell) -> ParsedCell:
         images=images
     )
 
+_GROUP_TYPES = ("paragraph", "block_text", "list_item", "strong", "emphasis")
+
+
+class _Group:
+    """
+    The text of one list of AST children: its parts joined by spaces, then
+    stripped. Parts are written to the output as soon as they are known to be
+    non-empty, so each character is copied once however deep the nesting.
+    """
+    __slots__ = ("parent", "started", "empties", "url")
+
+    def __init__(self, parent: "_Group | None", url: str | None = None):
+        self.parent = parent  # the group this one is a part of
+        self.started = False  # a non-empty part has been written
+        self.empties = 0  # empty parts since the last non-empty one
+        self.url = url  # set for a link's label
+
+    def start_part(self, out: List[str]) -> None:
+        """Write the separator before a non-empty part, starting enclosing groups as needed."""
+        group = self
+        while group is not None:
+            if group.started:
+                out.append(" " * (1 + group.empties))
+                group.empties = 0
+                return
+            group.started = True  # a group's leading separators are stripped
+            group = group.parent
+
+    def empty_part(self) -> None:
+        if self.started:  # leading empty parts are stripped; trailing ones never written
+            self.empties += 1
+
+
 def flatten_ast_as_text(children):
-    parts = []
-    for child in children:
+    """
+    Plain text of mistune AST nodes: the text of each node joined by spaces
+    and stripped at every level, with links as ``label (url)``. Iterative and
+    linear in the size of the tree, so deep nesting can't exhaust the stack.
+    """
+    out: List[str] = []
+    stack = [(_Group(None), iter(children))]
+    while stack:
+        group, remaining = stack[-1]
+        child = next(remaining, None)
+        if child is None:
+            stack.pop()
+            parent = group.parent
+            if group.url is not None:  # a link: "label (url)", never empty
+                if group.started:
+                    out.append(f" ({group.url})")
+                elif parent.started:
+                    parent.start_part(out)
+                    out.append(f" ({group.url})")
+                else:  # an empty label's space is stripped off the front
+                    parent.start_part(out)
+                    out.append(f"({group.url})")
+            elif parent is not None and not group.started:
+                parent.empty_part()
+            continue
+
         ctype = child.get("type")
         if ctype == "text":
-            parts.append(child.get("raw", child.get("text", "")).strip())
+            text = child.get("raw", child.get("text", "")).strip()
+            if text:
+                group.start_part(out)
+                out.append(text)
+            else:
+                group.empty_part()
         elif ctype == "link":
-            label = flatten_ast_as_text(child.get("children", []))
             url = child.get("attrs", {}).get("url", "")
-            parts.append(f"{label} ({url})")
-        elif ctype in ("paragraph", "block_text", "list_item", "strong", "emphasis"):
-            inner = flatten_ast_as_text(child.get("children", []))
-            parts.append(inner)
+            stack.append((_Group(group, url), iter(child.get("children", []))))
+        elif ctype in _GROUP_TYPES:
+            stack.append((_Group(group), iter(child.get("children", []))))
         elif "children" in child:
-            parts.append(flatten_ast_as_text(child["children"]))
-    return " ".join(parts).strip()
+            stack.append((_Group(group), iter(child["children"])))
+    return "".join(out)
 
 if __name__ == "__main__":
     import argparse
     import json
 
+    from jupdeck.core import serialization
+
     parser = argparse.ArgumentParser(
         description="Parse a Jupyter notebook and print structured output."
     )
     parser.add_argument("notebook_path", type=Path, help="Path to the Jupyter .ipynb file")
+    parser.add_argument("-o", "--output", type=Path,
+                        help="Save to this file (.jdeck for binary, otherwise JSON)")
     args = parser.parse_args()
 
     parsed = parse_notebook(args.notebook_path)
-    print(json.dumps(parsed, indent=2, ensure_ascii=False))
+    if args.output:
+        serialization.save(parsed, args.output)
+    else:
+        data = serialization.notebook_to_dict(parsed, include_raw_outputs=True)
+        print(json.dumps(data, indent=2, ensure_ascii=False, default=str))
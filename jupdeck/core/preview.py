@@ -0,0 +1,228 @@
+# preview.py
+"""HTML preview of a deck's slide structure.
+
+``HtmlPreviewRenderer`` draws the same merged slide groups as
+``PowerPointRenderer`` into one HTML file. Each slide is a 960x720 px box (the
+10x7.5 in slide at 96 px per inch) holding its title, bullets, images, table or
+chart where the layout engine places them on the real slide, at the planned
+font sizes. Slides the layout engine could not fit are outlined in red, and the
+speaker notes follow each slide. Nothing is rasterised, compressed or zipped,
+so a preview takes milliseconds where a deck takes seconds.
+
+Images are referenced without being decoded: base64 payloads, lazily read ones
+included, go into ``data:`` URIs as they are, streamed into the file one at a
+time on save. Raw image bytes (from a ``.jdeck`` file) are written once to a
+sidecar directory, as for linked media. SVG figures are shown as they are; PDF
+figures, which browsers can't show inline, become a labelled box.
+"""
+
+import html
+from dataclasses import replace
+from pathlib import Path
+from typing import List, Optional, TextIO, Union
+
+from pptx.util import Inches
+
+from jupdeck.core import charts, linked_media, media
+from jupdeck.core.layout import Box, LayoutEngine
+from jupdeck.core.models import ImageData, ParsedCell
+from jupdeck.core.renderer import (
+    IMAGE_EXTENSIONS,
+    PowerPointRenderer,
+    RendererBackend,
+    speaker_notes,
+)
+
+SLIDE_WIDTH = Inches(10)
+SLIDE_HEIGHT = Inches(7.5)
+EMU_PER_PX = 9525
+TITLE_FONT_SIZE = 44  # points, the template's title size
+BROWSER_TYPES = media.NATIVE_TYPES + ("image/svg+xml",)
+EXTENSIONS = {**IMAGE_EXTENSIONS, "image/svg+xml": "svg"}
+# Where PowerPointRenderer puts the text it adds outside the layout engine's boxes
+TRUNCATION_NOTE_BOX = Box(Inches(0.5), Inches(0.5), Inches(9), Inches(0.5))
+ATTRIBUTION_BOX = Box(Inches(1), Inches(2), Inches(8), Inches(1))
+SECTION_TITLE_BOX = Box(Inches(0.5), Inches(2.5), Inches(9), Inches(2))
+
+_STYLE = """
+body { margin: 0; padding: 16px; background: #e8e8e8; font-family: Calibri, Arial, sans-serif; }
+article { width: 960px; margin: 0 auto 24px; }
+header { font-size: 13px; color: #555; margin-bottom: 4px; }
+.slide { position: relative; width: 960px; height: 720px; background: #fff;
+         box-shadow: 0 1px 4px #999; overflow: hidden; }
+.slide.overflow { outline: 3px solid #d33; }
+.slide > * { position: absolute; box-sizing: border-box; margin: 0; overflow: hidden; }
+.title { display: flex; align-items: center; justify-content: center; text-align: center; }
+.bullets { padding-left: 1.2em; }
+.bullets li { margin: 2pt 0 6pt; }
+img { object-fit: contain; }
+table { border-collapse: collapse; }
+td, th { border: 1px solid #999; padding: 1px 4px; }
+th { background: #4472c4; color: #fff; }
+.figure, .chart { display: flex; align-items: center; justify-content: center;
+                  border: 1px dashed #999; color: #555; text-align: center; }
+.note { font-size: 12pt; color: #a60; }
+aside { font-size: 14px; white-space: pre-wrap; background: #fafafa; padding: 6px 8px;
+        border: 1px solid #ccc; border-top: 0; }
+"""
+
+
+def _px(emu: int) -> str:
+    return f"{emu / EMU_PER_PX:.1f}px"
+
+
+def _place(box: Box, font_size: Optional[int] = None) -> str:
+    """Inline style putting an element at ``box`` on the slide."""
+    style = (f"left:{_px(box.left)};top:{_px(box.top)};"
+             f"width:{_px(box.width)};height:{_px(box.height)}")
+    return style + (f";font-size:{font_size}pt" if font_size else "")
+
+
+class HtmlPreviewRenderer(RendererBackend):
+
+    def __init__(
+        self,
+        output_path: Path | None = None,
+        include_speaker_notes: bool = True,
+        include_attribution: bool = True,
+        input_path: Path | None = None,
+        charts: str = "tagged",
+        output_notes: bool = False,
+    ):
+        self.output_path = output_path
+        self.include_speaker_notes = include_speaker_notes
+        self.include_attribution = include_attribution
+        self.input_path = input_path
+        self.charts = charts  # as for PowerPointRenderer
+        self.output_notes = output_notes
+        self.layout_engine = LayoutEngine(SLIDE_WIDTH, SLIDE_HEIGHT)
+        # Each slide's HTML, with images left as ImageData until the file is written
+        self.slides: List[List[Union[str, ImageData]]] = []
+        self.overflowing_slides: List[int] = []  # 1-based numbers of slides that overflow
+        self._linked_media: linked_media.LinkedMedia | None = None  # for raw image bytes
+
+    def add_slide_groups(self, slide_groups: List[ParsedCell]) -> None:
+        for parsed_content in slide_groups:
+            self._render_slide(parsed_content)
+
+    def _render_slide(self, parsed_content: ParsedCell) -> None:
+        chart = charts.chart_for(parsed_content, self.charts)
+        if chart:
+            parsed_content = replace(
+                parsed_content, table=parsed_content.table[:1],
+                images=[] if chart.replaces_images else parsed_content.images)
+        layout = self.layout_engine.plan(parsed_content)
+        number = len(self.slides) + 1
+        if layout.overflow:
+            self.overflowing_slides.append(number)
+
+        out = self._open_slide(f"{layout.name}{' (overflow)' if layout.overflow else ''}",
+                               layout.overflow)
+        title_style = _place(self.layout_engine.title_box,
+                             layout.title_font_size or TITLE_FONT_SIZE)
+        out.append(f'<h2 class="title" style="{title_style}">'
+                   f'{html.escape(parsed_content.title or "")}</h2>')
+        if parsed_content.bullets and layout.bullet_box:
+            bullet_style = _place(layout.bullet_box, layout.bullet_font_size)
+            out.append(f'<ul class="bullets" style="{bullet_style}">')
+            out.extend(f"<li>{html.escape(bullet)}</li>" for bullet in parsed_content.bullets)
+            out.append("</ul>")
+
+        images = [image for image in parsed_content.images if not image.is_empty]
+        for image, box in zip(images, layout.image_boxes):
+            self._add_image(out, image, box)
+
+        if chart:
+            series = ", ".join(chart.series)
+            out.append(f'<div class="chart" style="{_place(layout.table_box)}">'
+                       f"{chart.kind} chart: {html.escape(series)} "
+                       f"({len(chart.categories)} points)</div>")
+        elif isinstance(parsed_content.table, list) and parsed_content.table:
+            self._add_table(out, parsed_content.table, layout)
+
+        notes = speaker_notes(parsed_content, self.output_notes) \
+            if self.include_speaker_notes else []
+        self._close_slide(out, notes)
+
+    def _add_image(self, out: list, image: ImageData, box: Box) -> None:
+        if image.mime_type not in BROWSER_TYPES:
+            out.append(f'<div class="figure" style="{_place(box)}">'
+                       f"{html.escape(image.mime_type)} figure</div>")
+            return
+        out.append(f'<img style="{_place(box)}" src="')
+        if image.data or image.span is not None:
+            out.append(image)  # its base64 payload is written as it is on save
+        else:
+            out.append(html.escape(self._media_target(image)))
+        out.append('">')
+
+    def _media_target(self, image: ImageData) -> str:
+        if self.output_path is None:
+            raise ValueError("Previewing raw image bytes needs the preview's output_path")
+        if self._linked_media is None:
+            self._linked_media = linked_media.LinkedMedia(
+                linked_media.media_dir(self.output_path), self.output_path)
+        return self._linked_media.target_for(bytes(image.blob),
+                                             ext=EXTENSIONS[image.mime_type])
+
+    def _add_table(self, out: list, table: list, layout) -> None:
+        headers = list(table[0].keys())
+        out.append(f'<table style="{_place(layout.table_box, layout.table_font_size)}">'
+                   "<tr>" + "".join(f"<th>{html.escape(str(h))}</th>" for h in headers) + "</tr>")
+        for row in table[:layout.table_rows]:
+            out.append("<tr>" + "".join(f"<td>{html.escape(str(row.get(h, '')))}</td>"
+                                        for h in headers) + "</tr>")
+        out.append("</table>")
+        if PowerPointRenderer._table_is_large(table, layout):
+            out.append(f'<p class="note" style="{_place(TRUNCATION_NOTE_BOX)}">'
+                       f"Table truncated: {len(table)} row(s) and {len(headers)} column(s) "
+                       "exported to a side file</p>")
+
+    def _open_slide(self, label: str, overflow: bool = False) -> list:
+        number = len(self.slides) + 1
+        out = [f'<article id="slide-{number}"><header>Slide {number} &middot; '
+               f'{html.escape(label)}</header>'
+               f'<section class="slide{" overflow" if overflow else ""}">']
+        self.slides.append(out)
+        return out
+
+    @staticmethod
+    def _close_slide(out: list, notes: List[str]) -> None:
+        out.append("</section>")
+        if notes:
+            out.append(f"<aside>{html.escape(chr(10).join(notes))}</aside>")
+        out.append("</article>")
+
+    def render_attribution(self, notebook_name: str) -> None:
+        out = self._open_slide("attribution")
+        out.append(f'<p style="{_place(ATTRIBUTION_BOX, 24)}">'
+                   f"This presentation was automatically created from "
+                   f"{html.escape(notebook_name)} using JupDeck.</p>")
+        self._close_slide(out, [])
+
+    def render_section_divider(self, title: str) -> None:
+        out = self._open_slide("section header")
+        out.append(f'<h1 class="title" style="{_place(SECTION_TITLE_BOX, TITLE_FONT_SIZE)}">'
+                   f"{html.escape(title)}</h1>")
+        self._close_slide(out, [])
+
+    def write(self, stream: TextIO) -> None:
+        """Write the preview's HTML to ``stream``, one image payload at a time."""
+        name = self.input_path.name if self.input_path else "notebook"
+        stream.write(f'<!DOCTYPE html>\n<html><head><meta charset="utf-8">'
+                     f"<title>{html.escape(name)} preview</title>"
+                     f"<style>{_STYLE}</style></head><body>\n")
+        for slide in self.slides:
+            for fragment in slide:
+                if isinstance(fragment, ImageData):
+                    stream.write(f"data:{fragment.mime_type};base64,")
+                    stream.write(fragment.data or str(fragment.span))
+                else:
+                    stream.write(fragment)
+            stream.write("\n")
+        stream.write("</body></html>\n")
+
+    def save(self) -> None:
+        if self.output_path:
+            with Path(self.output_path).open("w", encoding="utf-8") as f:
+                self.write(f)
@@ -1,22 +1,188 @@
 # renderer.py
 """Render parsed notebook content into a PowerPoint presentation."""
 
-import base64
+import hashlib
 import io
+import itertools
+import posixpath
+from abc import ABC, abstractmethod
+from concurrent.futures import Executor
 from copy import deepcopy
+from dataclasses import replace
 from pathlib import Path
-from typing import List
+from typing import Dict, List
 
 import pandas as pd
+import pptx
 from pptx import Presentation
 from pptx.enum.shapes import MSO_SHAPE_TYPE
 from pptx.enum.text import MSO_AUTO_SIZE
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.opc.packuri import PackURI
+from pptx.parts.image import Image, ImagePart
 from pptx.util import Inches, Pt
 
-from jupdeck.core.models import ParsedCell
+from jupdeck.core import assembly, charts, linked_media, media, reproducible
+from jupdeck.core.budget import Budget, BudgetTracker
+from jupdeck.core.build import jupdeck_version
+from jupdeck.core.events import EventReporter
+from jupdeck.core.layout import LayoutEngine, SlideLayout
+from jupdeck.core.lazy import ImageSpan
+from jupdeck.core.models import ImageData, ParsedCell
+from jupdeck.core.slide_cache import SlideCache, fingerprint
+from jupdeck.core.textframe import ParagraphStyle, write_paragraphs
+
+SECTION_HEADER_LAYOUT = 2  # "Section Header" in the default template
+IMAGE_EXTENSIONS = {"image/png": "png", "image/jpeg": "jpg", "image/gif": "gif"}
+
+
+def merge_slide_groups(parsed_cells: List[ParsedCell]) -> List[ParsedCell]:
+    """
+    Merge ParsedCells into logical slide groups based on heading structure.
+    A cell with a level-1 title (or a new-slide or section directive) starts a new slide;
+    following cells are merged into it until another one is found.
+    """
+    if not parsed_cells:
+        return []
+
+    merged = []
+    current = None
+
+    for cell in parsed_cells:
+        if (cell.type == "markdown" and cell.title) or cell.metadata.get("new_slide") \
+                or cell.metadata.get("section"):
+            if current:
+                merged.append(current)
+            current = deepcopy(cell)
+        elif current:
+            current = current.merge_cells([cell])
+        else:
+            # Skip or accumulate into empty first slide
+            current = deepcopy(cell)
+
+    if current:
+        merged.append(current)
+
+    return merged
+
+
+def notebook_cells(parsed_notebook: dict) -> List[ParsedCell]:
+    """The parsed cells of a parsed notebook dictionary, checking its shape."""
+    if not isinstance(parsed_notebook, dict):
+        raise TypeError(f"parsed_notebook must be a dict, got {type(parsed_notebook).__name__}")
+
+    parsed_cells = parsed_notebook.get("cells", [])
+
+    if not isinstance(parsed_cells, list):
+        raise TypeError(f"'cells' must be a list, got {type(parsed_cells).__name__}")
+    return parsed_cells
+
+
+def speaker_notes(parsed_content: ParsedCell, output_notes: bool = False) -> List[str]:
+    """The paragraphs of a slide group's speaker notes."""
+    paragraphs = parsed_content.paragraphs
+    if output_notes and parsed_content.text_output:
+        paragraphs = paragraphs + ["Output:"] + parsed_content.text_output.split("\n")
+    return paragraphs
+
+
+class RendererBackend(ABC):
+    """
+    Turns merged slide groups into an output file. The notebook-level steps,
+    merging cells into slide groups and closing with an attribution slide, are
+    shared; a backend draws slides, section dividers and the attribution slide,
+    and writes its file on ``save``.
+    """
+
+    output_path: Path | None = None
+    input_path: Path | None = None
+    include_attribution: bool = True
 
+    def render_presentation(self, parsed_notebook: dict) -> None:
+        """
+        Render a parsed notebook dictionary and save the result.
+        Expects a dict with keys 'metadata' and 'cells'.
+        """
+        self.build_presentation(parsed_notebook)
+        self.save()
+
+    def build_presentation(self, parsed_notebook: dict) -> None:
+        """Add the notebook's slides and the attribution slide without saving."""
+        self.add_notebook(parsed_notebook)
+        self.add_attribution()
+
+    def add_notebook(self, parsed_notebook: dict) -> int:
+        """
+        Append the slides for a parsed notebook without saving.
+        Returns the number of slides added.
+        """
+        slide_groups = self._merge_slide_groups(notebook_cells(parsed_notebook))
+        self.add_slide_groups(slide_groups)
+        return len(slide_groups)
+
+    def add_attribution(self) -> None:
+        if self.include_attribution:
+            self.render_attribution(self.input_path.name if self.input_path else "a notebook")
+
+    def _merge_slide_groups(self, parsed_cells: List[ParsedCell]) -> List[ParsedCell]:
+        return merge_slide_groups(parsed_cells)
+
+    @abstractmethod
+    def add_slide_groups(self, slide_groups: List[ParsedCell]) -> None:
+        """Add one slide per merged slide group."""
+
+    @abstractmethod
+    def render_attribution(self, notebook_name: str) -> None:
+        """Add the closing slide naming the notebook(s) the output was created from."""
+
+    @abstractmethod
+    def render_section_divider(self, title: str) -> None:
+        """Add a section header slide."""
+
+    @abstractmethod
+    def save(self) -> None:
+        """Write the output file."""
+
+
+def render_with_backends(parsed_notebook: dict, backends: List[RendererBackend]) -> None:
+    """
+    Render one parsed notebook with several backends, e.g. a deck and its
+    preview. The cells are merged into slide groups once and every backend
+    draws the same groups, which none of them modify.
+    """
+    slide_groups = merge_slide_groups(notebook_cells(parsed_notebook))
+    for backend in backends:
+        backend.add_slide_groups(slide_groups)
+        backend.add_attribution()
+        backend.save()
 
-class PowerPointRenderer:
+
+class LazyImagePart(ImagePart):
+    """
+    An image part whose bytes are decoded from an ImageSpan whenever they are
+    read, normally once as the package is saved, instead of being held in memory.
+    """
+
+    def __init__(self, partname, content_type, package, span: ImageSpan):
+        self._span = span
+        super().__init__(partname, content_type, package, None)
+
+
+    @property
+    def _blob(self) -> bytes:
+        return self._span.decode()
+
+    @_blob.setter
+    def _blob(self, blob) -> None:
+        pass  # the span is the only source of the bytes
+
+    def scale(self, scaled_cx, scaled_cy):
+        if scaled_cx and scaled_cy:  # skip decoding the image for its native size
+            return scaled_cx, scaled_cy
+        return super().scale(scaled_cx, scaled_cy)
+
+
+class PowerPointRenderer(RendererBackend):
 
     def __init__(
         self,
@@ -24,82 +190,89 @@ class PowerPointRenderer:
         include_speaker_notes: bool = True,
         include_attribution: bool = True,
         input_path: Path | None = None,
+        workers: int = 1,
+        budget: Budget | None = None,
+        slide_cache: SlideCache | None = None,
+        reporter: EventReporter | None = None,
+        reproducible: bool = False,
+        charts: str = "tagged",
+        output_notes: bool = False,
+        linked_media_dir: Path | None = None,
+        executor: Executor | None = None,
     ):
         self.output_path = output_path
         self.include_speaker_notes = include_speaker_notes
         self.include_attribution = include_attribution
         self.input_path = input_path
+        self.workers = workers  # > 1 renders slides in worker processes
+        self.executor = executor  # process pool for those workers, else one per render
+        self.slide_ids: List[int] = []  # ids for the next slides, when not the default
+        self.slide_cache = slide_cache  # reuses slides rendered by earlier runs
+        self.reporter = reporter or EventReporter()  # progress events; none by default
+        self.reproducible = reproducible  # identical bytes for identical content
+        self.charts = charts  # which tables become native charts: off, tagged or auto
+        self.output_notes = output_notes  # add the excerpt of printed text to the notes
+        self.budget_tracker = BudgetTracker(budget)
+        self.linked_media = None  # writes images to a sidecar directory to link to
+        if linked_media_dir is not None:
+            if output_path is None:
+                raise ValueError("Linked media needs the deck's output_path")
+            self.linked_media = linked_media.LinkedMedia(linked_media_dir, output_path)
+        # Converts SVG and PDF figures
+        self.media = media.MediaPipeline(workers=workers, executor=executor)
         self.prs = Presentation()
+        self.layout_engine = LayoutEngine(self.prs.slide_width, self.prs.slide_height)
+        self.overflowing_slides: List[int] = []  # 1-based numbers of slides that overflow
+        self._image_parts: Dict[str, ImagePart] = {}
+        self._image_index: int | None = None  # index of the last image part added
+        self._linked_targets: Dict[str, str] = {}  # _add_picture's image key -> link target
         self._set_default_layout()
 
     def _set_default_layout(self):
         # Use blank layout for full control
         self.slide_layout = self.prs.slide_layouts[1]  # Title and Content
 
-    def render_presentation(self, parsed_notebook: dict) -> None:
-        """
-        Render a parsed notebook dictionary into a PowerPoint presentation.
-        Expects a dict with keys 'metadata' and 'cells'.
-        """
-        if not isinstance(parsed_notebook, dict):
-            raise TypeError(f"parsed_notebook must be a dict, got {type(parsed_notebook).__name__}")
-        
-        parsed_cells = parsed_notebook.get("cells", [])
-        
-        if not isinstance(parsed_cells, list):
-            raise TypeError(f"'cells' must be a list, got {type(parsed_cells).__name__}")
-        
-        slide_groups = self._merge_slide_groups(parsed_cells)
-
-        self.render_slides(slide_groups)
-
-        if self.include_attribution:
-            slide = self.prs.slides.add_slide(self.slide_layout)
-            notebook_name = self.input_path.name if self.input_path else "a notebook"
-            attribution_text = f"This presentation was automatically created from {notebook_name} using JupDeck."
-            
-            textbox = slide.shapes.add_textbox(Inches(1), Inches(5), Inches(8), Inches(1))
-            text_frame = textbox.text_frame
-            p = text_frame.paragraphs[0]
-            p.text = attribution_text
-            p.font.size = Pt(14)
-            p.bullet = slide.shapes.add_textbox(Inches(1), Inches(2), Inches(8), Inches(1))
-            text_frame = textbox.text_frame
-            p = text_frame.paragraphs[0]
-            p.text = attribution_text
-            p.font.size = Pt(24)
-            p.bullet = False
+    def add_slide_groups(self, slide_groups: List[ParsedCell]) -> None:
+        self._render_groups(slide_groups)
 
+    def render_attribution(self, notebook_name: str) -> None:
+        """Add the closing slide naming the notebook(s) the deck was created from."""
+        slide = self._add_slide(self.slide_layout)
+        attribution_text = f"This presentation was automatically created from {notebook_name} using JupDeck."
+        
+        textbox = slide.shapes.add_textbox(Inches(1), Inches(5), Inches(8), Inches(1))
+        text_frame = textbox.text_frame
+        p = text_frame.paragraphs[0]
+        p.text = attribution_text
+        p.font.size = Pt(14)
+        p.bullet = slide.shapes.add_textbox(Inches(1), Inches(2), Inches(8), Inches(1))
+        text_frame = textbox.text_frame
+        p = text_frame.paragraphs[0]
+        p.text = attribution_text
+        p.font.size = Pt(24)
+        p.bullet = False
+
+    def render_section_divider(self, title: str) -> None:
+        """Add a section header slide."""
+        slide = self._add_slide(self.prs.slide_layouts[SECTION_HEADER_LAYOUT])
+        slide.shapes.title.text = title
+
+    def save(self) -> None:
         if self.output_path:
-            self.prs.save(self.output_path)
-
-    def _merge_slide_groups(self, parsed_cells: List[ParsedCell]) -> List[ParsedCell]:
-        """
-        Merge ParsedCells into logical slide groups based on heading structure.
-        A cell with a level-1 title starts a new slide; following cells are merged
-        into it until another level-1 is found.
-        """
-        if not parsed_cells:
-            return []
-
-        merged = []
-        current = None
-
-        for cell in parsed_cells:
-            if cell.type == "markdown" and cell.title:
-                if current:
-                    merged.append(current)
-                current = deepcopy(cell)
-            elif current:
-                current = current.merge_cells([cell])
+            if self.reproducible:
+                Path(self.output_path).write_bytes(self.to_bytes())
             else:
-                # Skip or accumulate into empty first slide
-                current = deepcopy(cell)
-
-        if current:
-            merged.append(current)
-
-        return merged
+                self.prs.save(self.output_path)
+            self.reporter.emit("deck_saved", path=str(self.output_path),
+                               bytes=Path(self.output_path).stat().st_size)
+
+    def to_bytes(self) -> bytes:
+        """The presentation as .pptx file contents."""
+        buffer = io.BytesIO()
+        self.prs.save(buffer)
+        if self.reproducible:
+            return reproducible.normalize_package(buffer.getvalue())
+        return buffer.getvalue()
 
     def render_slides(self, parsed_contents: List[ParsedCell]) -> None:
         """
@@ -116,159 +289,298 @@ class PowerPointRenderer:
                 f"{element_types}"
             )
         
+        self._render_groups(parsed_contents)
+        
+        self.save()
+
+    def _render_groups(self, parsed_contents: List[ParsedCell]) -> None:
+        # Vector figures are converted first, so they count at the size they're embedded at
+        parsed_contents = self.media.prepare(parsed_contents)
+        parsed_contents = self.budget_tracker.apply_image_budget(parsed_contents)
+        self.reporter.emit("render_started", slides=len(parsed_contents))
+        if self.workers > 1 and len(parsed_contents) > 1:
+            assembly.render_in_parallel(self, parsed_contents, self.workers, self.executor)
+            return
         for parsed_content in parsed_contents:
+            self._render_group(parsed_content)
+
+    def _render_group(self, parsed_content: ParsedCell) -> None:
+        """Render one slide group, or copy it from the slide cache."""
+        key = self.slide_cache_key(parsed_content)
+        if key is None:
             self._render_parsed_contents(parsed_content)
-        
-        if self.output_path:
-            self.prs.save(self.output_path)
+            self.slide_rendered()
+            return
+        cached = self.slide_cache.get(key)
+        if cached is not None:
+            assembly.insert_slide_part(self, *cached)
+            self.slide_rendered(cached=True)
+            return
+        self._render_parsed_contents(parsed_content)
+        media_blobs: Dict[str, bytes] = {}
+        self.slide_cache.put(key, assembly.last_slide_part(self, media_blobs), media_blobs)
+        self.slide_rendered(cached=False)
+
+    def slide_rendered(self, cached: bool | None = None) -> None:
+        """Report a slide group added to the deck; ``cached`` is None without a cache."""
+        self.reporter.emit("slide_rendered", slide=len(self.prs.slides), cached=cached)
+
+    def slide_cache_key(self, parsed_content: ParsedCell) -> str | None:
+        """The slide cache key for a slide group, or None if it can't be cached."""
+        if self.slide_cache is None:
+            return None
+        table = parsed_content.table
+        if table and isinstance(table, list) and \
+                self._table_is_large(table, self.layout_engine.plan(parsed_content)) and \
+                not charts.chart_for(parsed_content, self.charts):
+            return None  # the exported table file has to be written on every run
+        options = {
+            "include_speaker_notes": self.include_speaker_notes,
+            "charts": self.charts,
+            "output_notes": self.output_notes,
+            "slide_size": [self.prs.slide_width, self.prs.slide_height],
+            "python-pptx": pptx.__version__,
+            "jupdeck": jupdeck_version(),
+        }
+        return fingerprint(parsed_content, options)
+
+    def worker_options(self) -> dict:
+        """Constructor arguments for renderers that render slide parts in worker processes."""
+        return {
+            "output_path": self.output_path,
+            "include_speaker_notes": self.include_speaker_notes,
+            "include_attribution": False,
+            "reproducible": self.reproducible,
+            "charts": self.charts,
+            "output_notes": self.output_notes,
+        }
+
+    def _add_slide(self, slide_layout):
+        slide = self.prs.slides.add_slide(slide_layout)
+        if self.slide_ids:
+            self.prs.slides._sldIdLst[-1].id = self.slide_ids.pop(0)
+        return slide
 
     def _render_parsed_contents(self, parsed_content: ParsedCell):
-        slide = self.prs.slides.add_slide(self.slide_layout)
+        slide = self._add_slide(self.slide_layout)
+        chart = charts.chart_for(parsed_content, self.charts)
+        if chart:
+            # The chart goes where the table would; all of its rows fit
+            parsed_content = replace(
+                parsed_content, table=parsed_content.table[:1],
+                images=[] if chart.replaces_images else parsed_content.images)
+        layout = self.layout_engine.plan(parsed_content)
+        if layout.overflow:
+            self.overflowing_slides.append(len(self.prs.slides))
         
         # 1: Set the title
         title_shape = slide.shapes.title
         title_shape.text = parsed_content.title \
             if parsed_content.title else ""
+        if layout.title_font_size:
+            title_shape.text_frame.paragraphs[0].font.size = Pt(layout.title_font_size)
         
         # 2: Render bullets to placeholder content
-        self._render_bullets(slide, parsed_content)
+        self._render_bullets(slide, parsed_content, layout)
 
         # 3: Write images
-        self._render_images(slide, parsed_content)
+        self._render_images(slide, parsed_content, layout)
 
-        # 4: Write tables
-        self._render_tables(slide, parsed_content)
+        # 4: Write tables, or the chart in place of the table
+        if chart:
+            charts.add_chart(slide, chart, layout.table_box)
+        else:
+            self._render_tables(slide, parsed_content, layout)
 
         # 5: Write speaker notes, if enabled
         if self.include_speaker_notes:
             self._write_speaker_notes(slide, parsed_content)
             
 
-    def _render_bullets(self, slide, parsed_content):
+    def _render_bullets(self, slide, parsed_content, layout: SlideLayout | None = None):
 
         bullets = parsed_content.bullets
+        layout = layout or self.layout_engine.plan(parsed_content)
 
         if bullets:
             bullet_box = slide.placeholders[1]
+            box = layout.bullet_box
+            bullet_box.left, bullet_box.top = box.left, box.top
+            bullet_box.width, bullet_box.height = box.width, box.height
             text_frame = bullet_box.text_frame
             text_frame.word_wrap = True
+            style = ParagraphStyle(font_size=layout.bullet_font_size,
+                                   space_before=2, space_after=6)
+            write_paragraphs(text_frame._txBody, bullets, style)
 
-            for i, bullet in enumerate(bullets):
-                if i == 0:
-                    p = text_frame.paragraphs[0]  # Use the default paragraph
-                else:
-                    p = text_frame.add_paragraph()
-
-                p.text = bullet
-                p.level = 0  # Top-level bullet
-                p.font.size = Pt(14)
-                p.space_after = Pt(6)
-                p.space_before = Pt(2)
-                p.bullet = True
-                
-    def _render_images(self, slide, parsed_content):
-
-        images = parsed_content.images
-
-        left = Inches(0.5)
-        top = Inches(4)
-        width = Inches(4)
-        height = Inches(3)
-
-        for idx, image in enumerate(images):
-            if image.mime_type == "image/png" and image.data:
-                image_data = base64.b64decode(image.data)
-                image_stream = io.BytesIO(image_data)
-                slide.shapes.add_picture(
-                    image_stream, left, top, width=width, height=height
-                )
-
-                if idx==0:
-                    left = left + Inches(5.0)  # Move right for next image
-                else:
-                    left = left + Inches(0.5)
-                    top = top + Inches(0.5)
-
-    def _render_tables(self, slide, parsed_content):
+    def _render_images(self, slide, parsed_content, layout: SlideLayout | None = None):
+
+        images = [image for image in parsed_content.images if not image.is_empty]
+        layout = layout or self.layout_engine.plan(parsed_content)
+
+        for image, box in zip(images, layout.image_boxes):
+            if image.mime_type in media.NATIVE_TYPES:
+                self._add_picture(slide, image, box)
+
+    def _add_picture(self, slide, image: ImageData, box):
+        """
+        Add a picture to the slide, storing each distinct image in the package once.
+
+        python-pptx deduplicates images too, but by rescanning every image part in
+        the package (and re-hashing its bytes) on each call. Keeping our own index,
+        keyed by the SHA1 of the base64 payload or of the decoded bytes, keeps this
+        constant-time and skips decoding images that were already added. Images read
+        lazily from a notebook become LazyImagePart objects, decoded only on save.
+        With linked media, the image is written to the sidecar directory instead.
+        """
+        if image.span is not None:
+            key = f"span:{image.span.digest()}"
+        elif image.data:
+            # A digest, not the payload itself, so the index doesn't keep every image's text
+            key = f"b64:{hashlib.sha1(image.data.encode('ascii')).hexdigest()}"
+        else:
+            key = hashlib.sha1(image.blob).hexdigest()
+        if self.linked_media is not None:
+            target = self._linked_targets.get(key)
+            if target is None:
+                target = self._linked_targets[key] = \
+                    self.linked_media.target_for(image.to_bytes())
+            rId = slide.part.relate_to(target, RT.IMAGE, is_external=True)
+            linked_media.add_linked_picture(slide, rId, box, posixpath.basename(target))
+            return
+        image_part = self._image_parts.get(key)
+        if image_part is None:
+            if image.span is not None:
+                image_part = LazyImagePart(
+                    self._next_image_partname(IMAGE_EXTENSIONS[image.mime_type]),
+                    image.mime_type, self.prs.part.package, image.span)
+            else:
+                image_part = self.image_part_for(image.to_bytes())
+            self._image_parts[key] = image_part
+
+        rId = slide.part.relate_to(image_part, RT.IMAGE)
+        # Same as SlideShapes.add_picture once the image part is known
+        slide.shapes._add_pic_from_image_part(
+            image_part, rId, box.left, box.top, box.width, box.height)
+
+    def relate_image(self, slide, blob: bytes, sha1: str | None = None) -> str:
+        """rId of a relationship from ``slide`` to ``blob``, embedded or linked."""
+        if self.linked_media is not None:
+            return slide.part.relate_to(self.linked_media.target_for(blob, sha1), RT.IMAGE,
+                                        is_external=True)
+        return slide.part.relate_to(self.image_part_for(blob, sha1), RT.IMAGE)
+
+    def image_part_for(self, blob: bytes, sha1: str | None = None) -> ImagePart:
+        """The deck's image part holding ``blob``, added if the deck doesn't have it yet."""
+        sha1 = sha1 or hashlib.sha1(blob).hexdigest()
+        image_part = self._image_parts.get(sha1)
+        if image_part is None:
+            image = Image.from_blob(blob)
+            image_part = ImagePart(self._next_image_partname(image.ext), image.content_type,
+                                   self.prs.part.package, blob, image.filename)
+            self._image_parts[sha1] = image_part
+        return image_part
+
+    def _next_image_partname(self, ext: str) -> PackURI:
+        """
+        Same as Package.next_image_partname, which walks every part in the package
+        on each call. All images are added here, so counting from the first free
+        index is enough.
+        """
+        if self._image_index is None:
+            self._image_index = self.prs.part.package.next_image_partname(ext).idx - 1
+        self._image_index += 1
+        return PackURI(f"/ppt/media/image{self._image_index}.{ext}")
+
+    def _render_tables(self, slide, parsed_content, layout: SlideLayout | None = None):
 
         table_data_list = parsed_content.table
         if not table_data_list or not isinstance(table_data_list, list):
             return  # nothing to render
 
+        layout = layout or self.layout_engine.plan(parsed_content)
+
         headers = list(table_data_list[0].keys())
-        n_rows = len(table_data_list)
         n_cols = len(headers)
 
-        is_large = n_rows > 10 or n_cols > 6
+        is_large = self._table_is_large(table_data_list, layout)
         link_file = None
 
         # Limit number of table_data shown if large
-        max_display_rows = 10 if is_large else n_rows
-        display_rows = table_data_list[:max_display_rows]
+        display_rows = table_data_list[:layout.table_rows]
 
         # Add table shape
-        left = Inches(1)
-        top = Inches(3)
-        width = Inches(8)
-        height = Inches(4)
-
+        box = layout.table_box
         table_shape = slide.shapes.add_table(
-            len(display_rows) + 1, n_cols, left, top, width, height
+            len(display_rows) + 1, n_cols, box.left, box.top, box.width, box.height
         ).table
 
-        # Header row
-        for col_idx, header in enumerate(headers):
-            table_shape.cell(0, col_idx).text = str(header)
-
-        # Data table_data
-        for row_idx, row in enumerate(display_rows):
-            for col_idx, header in enumerate(headers):
-                table_shape.cell(row_idx + 1, col_idx).text = str(row.get(header, ""))
+        # Header row, then the data rows. Cells are visited in order: looking each
+        # one up with table.cell() scans its whole row, quadratic in the columns.
+        values = itertools.chain(headers, (row.get(header, "") for row in display_rows
+                                           for header in headers))
+        for cell, value in zip(table_shape.iter_cells(), values):
+            self._set_table_cell_text(cell, value, layout)
 
         if is_large:
-            table_idx = len([s for s in slide.shapes if s.shape_type == MSO_SHAPE_TYPE.TABLE])
-            
-            link_file = f"slide_{slide.slide_id}_table_{table_idx}.xlsx"
-            xlsx_path = self.output_path.with_name(link_file)
+            if self.output_path is None:
+                # No deck path to put a side file next to: only say what was cut
+                note = (f"⚠️ Table truncated: showing {len(display_rows)} of "
+                        f"{len(table_data_list)} row(s)")
+            else:
+                table_idx = len([s for s in slide.shapes if s.shape_type == MSO_SHAPE_TYPE.TABLE])
+                link_file = f"slide_{slide.slide_id}_table_{table_idx}.xlsx"
+                note = f"⚠️ Table truncated. See full data in '{link_file}'"
 
             textbox = slide.shapes.add_textbox(Inches(0.5), Inches(0.5), Inches(9), Inches(0.5))
             text_frame = textbox.text_frame
-            text_frame.text = f"⚠️ Table truncated. See full data in '{link_file}'"
+            text_frame.text = note
             text_frame.paragraphs[0].font.size = Pt(12)
             text_frame.auto_size = MSO_AUTO_SIZE.SHAPE_TO_FIT_TEXT
 
+            if link_file is None:
+                return
+            xlsx_path = self.output_path.with_name(link_file)
+
             df = pd.DataFrame(table_data_list)
 
             df.to_excel(xlsx_path, index=False)
+            if self.reproducible:
+                reproducible.normalize_file(xlsx_path)
+
+    @staticmethod
+    def _table_is_large(table_data_list, layout: SlideLayout) -> bool:
+        """Whether a table is cut short on the slide and exported to a side file."""
+        return len(table_data_list) > layout.table_rows or len(table_data_list[0]) > 6
+
+    @staticmethod
+    def _set_table_cell_text(cell, value, layout: SlideLayout):
+        cell.text = str(value)
+        cell.text_frame.paragraphs[0].font.size = Pt(layout.table_font_size)
     
     def _write_speaker_notes(self,slide,parsed_content):
         
-        if not parsed_content.paragraphs:
+        paragraphs = speaker_notes(parsed_content, self.output_notes)
+        if not paragraphs:
             return # Don't create a notest slide unless there's something to write
         
-        notes_slide = slide.notes_slide
-        text_frame = notes_slide.notes_text_frame
-
-
-        for para in parsed_content.paragraphs:
-            p = text_frame.add_paragraph()
-            p.text = para
+        text_frame = slide.notes_slide.notes_text_frame
+        write_paragraphs(text_frame._txBody, paragraphs, append=True)
 
 
 if __name__ == "__main__":
     import argparse
-    import json
+
+    from jupdeck.core import serialization
 
     parser = argparse.ArgumentParser(description="Render notebook to PowerPoint")
-    parser.add_argument("input_json", type=Path, help="Path to parsed notebook JSON")
+    parser.add_argument("input_file", type=Path,
+                        help="Path to a parsed notebook (.jdeck or JSON)")
     parser.add_argument("output_pptx", type=Path, help="Path to output PowerPoint file")
     parser.add_argument("--no-speaker-notes", action="store_true", help="Disable speaker notes")
     args = parser.parse_args()
 
-    with open(args.input_json, "r", encoding="utf-8") as f:
-        raw_data = json.load(f)
-
-    raw_data["cells"] = [ParsedCell(**cell) for cell in raw_data["cells"]]
+    raw_data = serialization.load(args.input_file)
 
     renderer = PowerPointRenderer(args.output_pptx, include_speaker_notes=not args.no_speaker_notes)
     renderer.render_presentation(raw_data)
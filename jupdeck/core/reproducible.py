@@ -0,0 +1,79 @@
+# reproducible.py
+"""Byte-for-byte reproducible .pptx and .xlsx files.
+
+A deck's parts, slide ids and media names already follow from the notebook
+alone, whether it is rendered sequentially or in worker processes. What still
+changes from run to run is packaging metadata:
+
+- each ZIP entry's timestamp (the time of saving) and file attributes (the umask)
+- the created and modified times in ``docProps/core.xml`` of exported tables
+
+``normalize_package`` rewrites a package with ``[Content_Types].xml`` first
+and the other parts sorted by name, every entry stamped with one fixed time
+and written with the same attributes and compression, and those core
+properties set to the same time. The time is ``SOURCE_DATE_EPOCH`` when set,
+as in other reproducible builds, else 1980-01-01, the earliest a ZIP file can
+record. Identical content therefore gives identical bytes, so output hashes can
+be used for deduplication and caching.
+"""
+
+import io
+import os
+import re
+import time
+import zipfile
+from pathlib import Path
+from typing import Tuple
+
+CONTENT_TYPES = "[Content_Types].xml"
+CORE_PROPERTIES = "docProps/core.xml"
+ZIP_EPOCH = 315532800  # 1980-01-01T00:00:00Z
+FILE_ATTRIBUTES = 0o644 << 16  # regular file, rw-r--r--
+
+_CORE_TIMES = re.compile(
+    rb"(<dcterms:(?:created|modified)\b[^>]*>)[^<]*(</dcterms:(?:created|modified)>)")
+
+
+def source_date() -> int:
+    """Seconds since the epoch to stamp reproducible files with."""
+    try:
+        return max(ZIP_EPOCH, int(os.environ["SOURCE_DATE_EPOCH"]))
+    except (KeyError, ValueError):
+        return ZIP_EPOCH
+
+
+def _zip_time(timestamp: int) -> Tuple[int, int, int, int, int, int]:
+    return time.gmtime(timestamp)[:6]
+
+
+def _member_order(name: str) -> Tuple[bool, str]:
+    return name != CONTENT_TYPES, name
+
+
+def normalize_core_properties(xml: bytes, timestamp: int) -> bytes:
+    stamp = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(timestamp)).encode()
+    return _CORE_TIMES.sub(rb"\g<1>" + stamp + rb"\g<2>", xml)
+
+
+def normalize_package(data: bytes) -> bytes:
+    """A reproducible copy of the .pptx or .xlsx file contents ``data``."""
+    timestamp = source_date()
+    output = io.BytesIO()
+    with zipfile.ZipFile(io.BytesIO(data)) as source, \
+            zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED) as target:
+        for name in sorted(source.namelist(), key=_member_order):
+            blob = source.read(name)
+            if name == CORE_PROPERTIES:
+                blob = normalize_core_properties(blob, timestamp)
+            info = zipfile.ZipInfo(name, date_time=_zip_time(timestamp))
+            info.compress_type = zipfile.ZIP_DEFLATED
+            info.create_system = 0
+            info.external_attr = FILE_ATTRIBUTES
+            target.writestr(info, blob, compresslevel=6)
+    return output.getvalue()
+
+
+def normalize_file(path: Path) -> None:
+    """Make the package at ``path`` reproducible, in place."""
+    path = Path(path)
+    path.write_bytes(normalize_package(path.read_bytes()))
@@ -0,0 +1,224 @@
+# scheduler.py
+"""Convert many notebooks in parallel without running out of memory.
+
+Before anything is parsed, each notebook gets a cheap pre-scan of its raw bytes:
+the number of cells, the size of its base64 image payloads and of its HTML
+tables. ``estimate_cost`` turns those counts into a predicted peak memory for
+converting the notebook. ``run_scheduled`` then starts the largest jobs first
+and admits another job only while the predicted memory of everything running
+stays under the ceiling. A job predicted to need more than the whole ceiling
+runs on its own.
+
+Every job runs in a fresh worker process, so the peak resident memory the
+process reports when it finishes (``ru_maxrss``) is that job's actual peak. It
+is reported next to the prediction.
+"""
+
+import mmap
+import os
+import re
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, List, Optional, Sequence
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+from jupdeck.core.aio import convert_file
+
+MB = 1024 * 1024
+
+# Cost model, fitted to the peak memory of single conversions on Linux (Python 3.11)
+BASE_BYTES = 225 * MB     # worker process with pandas, lxml and python-pptx loaded
+TEXT_FACTOR = 6.0         # parsed JSON objects per byte of non-image notebook text
+IMAGE_FACTOR = 1.1        # per decoded image byte: mapped payload pages and saved parts
+TABLE_FACTOR = 2.0        # table records kept per byte of HTML table
+CELL_BYTES = 10 * 1024    # ParsedCell, slide objects and XML per cell
+
+_CELL = re.compile(rb'"cell_type"\s*:')
+_IMAGE_PAYLOAD = re.compile(rb'"(?:image/(?:png|jpeg|gif)|application/pdf)"\s*:\s*"')
+_TABLE_START = b"<table"
+_TABLE_END = b"</table>"
+
+
+@dataclass
+class JobCost:
+    file_bytes: int = 0
+    cells: int = 0
+    image_bytes: int = 0  # base64 payload bytes
+    table_bytes: int = 0  # bytes between <table and </table>
+
+    @property
+    def predicted_bytes(self) -> int:
+        text = max(0, self.file_bytes - self.image_bytes)
+        return int(BASE_BYTES + TEXT_FACTOR * text + IMAGE_FACTOR * self.image_bytes * 3 / 4
+                   + TABLE_FACTOR * self.table_bytes + CELL_BYTES * self.cells)
+
+
+@dataclass
+class JobReport:
+    input_path: Path
+    output_path: Path
+    predicted_bytes: int
+    peak_bytes: Optional[int] = None  # None where the platform can't measure it
+    seconds: float = 0.0
+    result: Any = None
+    error: Optional[str] = None
+
+    def format(self) -> str:
+        actual = f"{self.peak_bytes / MB:.0f} MB" if self.peak_bytes else "unknown"
+        status = f" - failed: {self.error}" if self.error else ""
+        return (f"{self.input_path.name}: predicted {self.predicted_bytes / MB:.0f} MB, "
+                f"actual peak {actual}, {self.seconds:.1f} s{status}")
+
+
+def estimate_cost(notebook_path: Path) -> JobCost:
+    """Count cells, image payload bytes and table bytes without parsing the notebook."""
+    size = os.path.getsize(notebook_path)
+    cost = JobCost(file_bytes=size)
+    if size == 0:
+        return cost
+    with open(notebook_path, "rb") as f, \
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+        cost.cells = sum(1 for _ in _CELL.finditer(buffer))
+        for match in _IMAGE_PAYLOAD.finditer(buffer):
+            end = buffer.find(b'"', match.end())
+            if end > 0:
+                cost.image_bytes += end - match.end()
+        position = buffer.find(_TABLE_START)
+        while position >= 0:
+            end = buffer.find(_TABLE_END, position)
+            if end < 0:
+                break
+            cost.table_bytes += end - position
+            position = buffer.find(_TABLE_START, end)
+    return cost
+
+
+def _peak_rss() -> Optional[int]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if os.uname().sysname == "Darwin" else peak * 1024  # Linux reports KiB
+
+
+def _run_measured(fn: Callable, input_path: Path, output_path: Path):
+    """Worker entry point: run one job and measure its process's peak memory."""
+    start = time.perf_counter()
+    try:
+        result, error = fn(input_path, output_path), None
+    except Exception as e:  # reported with the job; the other jobs carry on
+        result, error = None, f"{type(e).__name__}: {e}"
+    return result, error, _peak_rss(), time.perf_counter() - start
+
+
+# ProcessPoolExecutor(max_tasks_per_child=...) is new in Python 3.11
+_HAS_MAX_TASKS_PER_CHILD = sys.version_info >= (3, 11)
+
+
+class _FreshProcessPool:
+    """
+    Runs every submitted call in a new process, at most ``workers`` at a time
+    (the caller limits how many are running). Uses one pool with
+    ``max_tasks_per_child=1`` where Python has it, and a one-worker pool per
+    call before 3.11.
+    """
+
+    def __init__(self, workers: int):
+        self._shared = ProcessPoolExecutor(max_workers=workers, max_tasks_per_child=1) \
+            if _HAS_MAX_TASKS_PER_CHILD else None
+        self._own_pools = {}  # future -> the pool running it, without a shared pool
+
+    def submit(self, fn: Callable, *args) -> Future:
+        if self._shared is not None:
+            return self._shared.submit(fn, *args)
+        pool = ProcessPoolExecutor(max_workers=1)
+        future = pool.submit(fn, *args)
+        self._own_pools[future] = pool
+        return future
+
+    def release(self, future: Future) -> None:
+        """Shut down the process of a finished call, if it had its own pool."""
+        pool = self._own_pools.pop(future, None)
+        if pool is not None:
+            pool.shutdown()
+
+    def __enter__(self) -> "_FreshProcessPool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        for pool in [self._shared, *self._own_pools.values()]:
+            if pool is not None:
+                pool.shutdown()
+        self._own_pools.clear()
+
+
+def plan_order(costs: Sequence[JobCost]) -> List[int]:
+    """Job indices, largest predicted memory first."""
+    return sorted(range(len(costs)), key=lambda i: costs[i].predicted_bytes, reverse=True)
+
+
+def run_scheduled(
+    jobs: Sequence[tuple],
+    fn: Callable = convert_file,
+    workers: Optional[int] = None,
+    memory_limit: Optional[int] = None,
+    on_finished: Optional[Callable[[JobReport], None]] = None,
+    on_started: Optional[Callable[[JobReport], None]] = None,
+) -> List[JobReport]:
+    """
+    Run ``fn(input_path, output_path)`` for each ``(input_path, output_path)``
+    job in worker processes, at most ``workers`` at a time and, with
+    ``memory_limit`` (bytes), only while the running jobs' predicted memory fits.
+    ``on_started`` and ``on_finished`` are called in this process as each job
+    is submitted and completes. Returns one report per job, in the order of ``jobs``.
+    """
+    workers = workers or os.cpu_count() or 1
+    costs = [estimate_cost(input_path) for input_path, _ in jobs]
+    reports = [JobReport(Path(input_path), Path(output_path), cost.predicted_bytes)
+               for (input_path, output_path), cost in zip(jobs, costs)]
+    waiting = plan_order(costs)
+    running = {}  # future -> job index
+    admitted = 0  # predicted bytes of the running jobs
+
+    # A fresh process per job, so each process's peak memory is its job's
+    with _FreshProcessPool(workers) as executor:
+        while waiting or running:
+            while waiting and len(running) < workers:
+                fits = [i for i in waiting if memory_limit is None
+                        or admitted + reports[i].predicted_bytes <= memory_limit]
+                if not fits and running:
+                    break  # wait for memory to be released
+                index = fits[0] if fits else waiting[0]  # too big for the ceiling: run alone
+                waiting.remove(index)
+                job = jobs[index]
+                running[executor.submit(_run_measured, fn, job[0], job[1])] = index
+                admitted += reports[index].predicted_bytes
+                if on_started:
+                    on_started(reports[index])
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = running.pop(future)
+                executor.release(future)
+                admitted -= reports[index].predicted_bytes
+                report = reports[index]
+                report.result, report.error, report.peak_bytes, report.seconds = future.result()
+                if on_finished:
+                    on_finished(report)
+    return reports
+
+
+def format_report(reports: Sequence[JobReport]) -> str:
+    lines = [report.format() for report in reports]
+    measured = [r for r in reports if r.peak_bytes]
+    if measured:
+        error = sum(abs(r.peak_bytes - r.predicted_bytes) / r.peak_bytes for r in measured)
+        lines.append(f"Mean prediction error: {error / len(measured):.0%} "
+                     f"over {len(measured)} job(s)")
+    return "\n".join(lines)
@@ -0,0 +1,201 @@
+# serialization.py
+"""Save and load parsed notebooks between the parse and render stages.
+
+Two formats share one versioned schema:
+
+- JSON (``.json``): human-readable, images stored as base64 strings.
+- Binary (``.jdeck``): a small JSON header followed by the raw image bytes.
+  Images are stored once per distinct payload and, when loaded, are
+  ``memoryview`` slices of a memory-mapped file, so no image is decoded or
+  copied until the renderer embeds it.
+
+Binary layout (all integers little-endian)::
+
+    magic        8 bytes   b"JUPDECK\\0"
+    version      uint32    schema version
+    reserved     uint32
+    header_len   uint64
+    header       header_len bytes of UTF-8 JSON
+    padding      to an 8-byte boundary
+    blobs        raw image bytes; the header stores (offset, length) per image,
+                 relative to the start of this section
+"""
+
+import base64
+import hashlib
+import json
+import mmap
+import struct
+from dataclasses import fields
+from pathlib import Path
+from typing import Any, Dict, List
+
+from jupdeck.core.models import ImageData, ParsedCell
+
+SCHEMA_VERSION = 2  # 2: cells gained text_output
+MAGIC = b"JUPDECK\0"
+BINARY_SUFFIX = ".jdeck"
+_PREAMBLE = struct.Struct("<8sIIQ")
+_ALIGNMENT = 8
+
+
+def _check_version(version) -> None:
+    if not isinstance(version, int) or version < 1:
+        raise ValueError(f"Invalid schema version: {version!r}")
+    if version > SCHEMA_VERSION:
+        raise ValueError(
+            f"Parsed notebook uses schema version {version}, but this version of jupdeck "
+            f"only reads up to version {SCHEMA_VERSION}"
+        )
+
+
+def _cell_to_dict(cell: ParsedCell, include_raw_outputs: bool) -> Dict[str, Any]:
+    """Shallow dict of a cell's fields; images are serialised by the caller."""
+    data = {f.name: getattr(cell, f.name) for f in fields(cell) if f.name != "images"}
+    if not include_raw_outputs:
+        data["raw_outputs"] = None
+    return data
+
+
+def _cell_from_dict(data: Dict[str, Any], images: List[ImageData]) -> ParsedCell:
+    return ParsedCell(**{**data, "images": images})
+
+
+def notebook_to_dict(parsed_notebook: Dict[str, Any],
+                     include_raw_outputs: bool = False) -> Dict[str, Any]:
+    """Convert a parsed notebook into JSON-compatible data (images as base64)."""
+    cells = []
+    for cell in parsed_notebook.get("cells", []):
+        data = _cell_to_dict(cell, include_raw_outputs)
+        data["images"] = [
+            {"mime_type": image.mime_type,
+             "data": image.data or (str(image.span) if image.span else
+                                    base64.b64encode(image.to_bytes()).decode("ascii"))}
+            for image in cell.images
+        ]
+        cells.append(data)
+
+    return {
+        "schema_version": SCHEMA_VERSION,
+        **{key: value for key, value in parsed_notebook.items() if key != "cells"},
+        "cells": cells,
+    }
+
+
+def notebook_from_dict(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Inverse of ``notebook_to_dict``."""
+    _check_version(data.get("schema_version"))
+    parsed = {key: value for key, value in data.items() if key not in ("schema_version", "cells")}
+    parsed["cells"] = [
+        _cell_from_dict(cell, [ImageData(**image) for image in cell.get("images", [])])
+        for cell in data.get("cells", [])
+    ]
+    return parsed
+
+
+def dump_json(parsed_notebook: Dict[str, Any], path: Path,
+              include_raw_outputs: bool = False) -> None:
+    data = notebook_to_dict(parsed_notebook, include_raw_outputs)
+    with Path(path).open("w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, default=str)
+
+
+def load_json(path: Path) -> Dict[str, Any]:
+    with Path(path).open("r", encoding="utf-8") as f:
+        return notebook_from_dict(json.load(f))
+
+
+def dump_binary(parsed_notebook: Dict[str, Any], path: Path,
+                include_raw_outputs: bool = False) -> None:
+    """Write a parsed notebook to the binary container format."""
+    blobs: List[bytes] = []
+    offsets: Dict[str, tuple] = {}  # sha1 -> (offset, length), to store each payload once
+    blobs_size = 0
+
+    cells = []
+    for cell in parsed_notebook.get("cells", []):
+        data = _cell_to_dict(cell, include_raw_outputs)
+        data["images"] = []
+        for image in cell.images:
+            raw = image.to_bytes()
+            digest = hashlib.sha1(raw).hexdigest()
+            if digest not in offsets:
+                offsets[digest] = (blobs_size, len(raw))
+                blobs.append(raw)
+                blobs_size += len(raw)
+            offset, length = offsets[digest]
+            data["images"].append(
+                {"mime_type": image.mime_type, "offset": offset, "length": length})
+        cells.append(data)
+
+    header = {
+        "schema_version": SCHEMA_VERSION,
+        **{key: value for key, value in parsed_notebook.items() if key != "cells"},
+        "cells": cells,
+    }
+    header_bytes = json.dumps(header, ensure_ascii=False, default=str).encode("utf-8")
+    padding = -(_PREAMBLE.size + len(header_bytes)) % _ALIGNMENT
+
+    with Path(path).open("wb") as f:
+        f.write(_PREAMBLE.pack(MAGIC, SCHEMA_VERSION, 0, len(header_bytes)))
+        f.write(header_bytes)
+        f.write(b"\0" * padding)
+        for blob in blobs:
+            f.write(blob)
+
+
+def load_binary(path: Path, use_mmap: bool = True) -> Dict[str, Any]:
+    """
+    Read a parsed notebook from the binary container format.
+
+    With ``use_mmap`` the image blobs are views into a read-only memory map of
+    the file, which stays open for as long as any image refers to it.
+    """
+    with Path(path).open("rb") as f:
+        if use_mmap:
+            try:
+                buffer = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+            except ValueError:  # empty file
+                buffer = memoryview(b"")
+        else:
+            buffer = memoryview(f.read())
+
+    if len(buffer) < _PREAMBLE.size:
+        raise ValueError(f"{path} is not a jupdeck binary file")
+    magic, version, _, header_len = _PREAMBLE.unpack_from(buffer)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a jupdeck binary file")
+    _check_version(version)
+
+    header_end = _PREAMBLE.size + header_len
+    header = json.loads(bytes(buffer[_PREAMBLE.size:header_end]).decode("utf-8"))
+    blobs_start = header_end + (-header_end % _ALIGNMENT)
+
+    parsed = {key: value for key, value in header.items() if key not in ("schema_version", "cells")}
+    parsed["cells"] = []
+    for cell in header.get("cells", []):
+        images = []
+        for image in cell.get("images", []):
+            start = blobs_start + image["offset"]
+            images.append(ImageData(mime_type=image["mime_type"],
+                                    blob=buffer[start:start + image["length"]]))
+        parsed["cells"].append(_cell_from_dict(cell, images))
+    return parsed
+
+
+def is_binary(path: Path) -> bool:
+    with Path(path).open("rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def save(parsed_notebook: Dict[str, Any], path: Path, include_raw_outputs: bool = False) -> None:
+    """Save in the binary format for ``.jdeck`` paths and as JSON otherwise."""
+    if Path(path).suffix == BINARY_SUFFIX:
+        dump_binary(parsed_notebook, path, include_raw_outputs)
+    else:
+        dump_json(parsed_notebook, path, include_raw_outputs)
+
+
+def load(path: Path) -> Dict[str, Any]:
+    """Load a parsed notebook saved in either format."""
+    return load_binary(path) if is_binary(path) else load_json(path)
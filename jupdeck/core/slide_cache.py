@@ -0,0 +1,195 @@
+# slide_cache.py
+"""Cache of rendered slides, reused across runs.
+
+Each merged slide group is fingerprinted together with the render options and
+template. On a hit, the stored slide part (shape XML, notes XML and media, see
+``assembly.SlidePart``) is copied into the deck without going through
+python-pptx's shape objects; on a miss the slide is rendered as usual and then
+stored. Slides that export a table to a side file are never cached, since the
+file must be written on every run.
+
+Entries live in ``$JUPDECK_CACHE_DIR/slides`` (or ``~/.cache/jupdeck/slides``)
+and are evicted least recently used first once the cache grows past
+``max_bytes``. The directory may be shared, so an entry holds only data: a
+JSON manifest followed by the XML, chart and media blobs it refers to by
+``(offset, length)``. Loading an entry never runs code, and an entry that does
+not read back as a slide part is treated as a miss.
+
+Entry layout (integers little-endian)::
+
+    magic        8 bytes   b"JDSLIDE\0"
+    header_len   uint64
+    header       header_len bytes of UTF-8 JSON
+    blobs        shape XML, notes XML, chart parts and media
+"""
+
+import hashlib
+import json
+import os
+import struct
+from dataclasses import fields
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from jupdeck.core.assembly import SlidePart
+from jupdeck.core.media import default_cache_dir
+from jupdeck.core.models import ImageData, ParsedCell
+
+CACHE_VERSION = 3  # bump when the slide XML the renderer produces changes; 3: no pickle
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+_EVICT_TO = 0.9  # fraction of max_bytes left after an eviction
+_IGNORED_FIELDS = ("images", "raw_outputs")  # images are hashed separately; raw outputs unused
+MAGIC = b"JDSLIDE\0"
+_PREAMBLE = struct.Struct("<8sQ")
+
+
+def image_digest(image: ImageData) -> str:
+    """Identifies an image's content; an inline payload and a lazy span of it agree."""
+    if image.span is not None:
+        return image.span.digest()
+    if image.blob is not None:
+        return "raw:" + hashlib.sha1(image.blob).hexdigest()
+    return hashlib.sha1(image.data.encode("ascii")).hexdigest()
+
+
+def fingerprint(parsed_content: ParsedCell, options: Dict[str, Any]) -> str:
+    content = {f.name: getattr(parsed_content, f.name) for f in fields(parsed_content)
+               if f.name not in _IGNORED_FIELDS}
+    digest = hashlib.sha256(json.dumps(
+        {"cache_version": CACHE_VERSION, "options": options, "content": content},
+        sort_keys=True, default=str).encode("utf-8"))
+    for image in parsed_content.images:
+        digest.update(f"\0{image.mime_type}\0{image_digest(image)}".encode("ascii"))
+    return digest.hexdigest()
+
+
+def _pack_entry(part: SlidePart, media: Dict[str, bytes]) -> bytes:
+    blobs: List[bytes] = []
+    size = 0
+
+    def add(blob: Optional[bytes]) -> Optional[List[int]]:
+        nonlocal size
+        if blob is None:
+            return None
+        blobs.append(blob)
+        size += len(blob)
+        return [size - len(blob), len(blob)]
+
+    header = {
+        "layout_index": part.layout_index,
+        "overflow": part.overflow,
+        "shapes_xml": add(part.shapes_xml),
+        "notes_xml": add(part.notes_xml),
+        "image_rels": part.image_rels,
+        "chart_rels": {rId: [add(chart), add(workbook)]
+                       for rId, (chart, workbook) in part.chart_rels.items()},
+        "media": {sha1: add(blob) for sha1, blob in media.items()},
+    }
+    header_bytes = json.dumps(header).encode("utf-8")
+    return b"".join([_PREAMBLE.pack(MAGIC, len(header_bytes)), header_bytes, *blobs])
+
+
+def _unpack_entry(data: bytes) -> Tuple[SlidePart, Dict[str, bytes]]:
+    """Read an entry written by ``_pack_entry``; ValueError if it isn't one."""
+    if len(data) < _PREAMBLE.size:
+        raise ValueError("not a slide cache entry")
+    magic, header_len = _PREAMBLE.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("not a slide cache entry")
+    blobs_start = _PREAMBLE.size + header_len
+    header = json.loads(data[_PREAMBLE.size:blobs_start].decode("utf-8"))
+
+    def blob(span: Optional[List[int]]) -> Optional[bytes]:
+        if span is None:
+            return None
+        offset, length = span
+        start = blobs_start + offset
+        if offset < 0 or length < 0 or start + length > len(data):
+            raise ValueError("slide cache entry is truncated")
+        return data[start:start + length]
+
+    part = SlidePart(
+        layout_index=int(header["layout_index"]),
+        shapes_xml=blob(header["shapes_xml"]),
+        image_rels={str(rId): str(sha1) for rId, sha1 in header["image_rels"].items()},
+        chart_rels={str(rId): (blob(chart), blob(workbook))
+                    for rId, (chart, workbook) in header["chart_rels"].items()},
+        notes_xml=blob(header["notes_xml"]),
+        overflow=bool(header["overflow"]),
+    )
+    media = {str(sha1): blob(span) for sha1, span in header["media"].items()}
+    if part.shapes_xml is None or any(blob is None for blob in media.values()) or \
+            not set(part.image_rels.values()) <= set(media):
+        raise ValueError("slide cache entry is incomplete")
+    return part, media
+
+
+class SlideCache:
+    def __init__(self, cache_dir: Optional[Path] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir().parent / "slides"
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._size: Optional[int] = None  # bytes on disk, counted on first store
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.slide"
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def format_stats(self) -> str:
+        return (f"Slide cache: {self.hits} hit(s), {self.misses} miss(es) "
+                f"({self.hit_rate:.0%} hit rate), {self.evictions} eviction(s)")
+
+    def get(self, key: str) -> Optional[Tuple[SlidePart, Dict[str, bytes]]]:
+        path = self._path(key)
+        try:
+            part, media = _unpack_entry(path.read_bytes())
+            os.utime(path)  # most recently used
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return part, media
+
+    def put(self, key: str, part: SlidePart, media: Dict[str, bytes]) -> None:
+        media = {sha1: media[sha1] for sha1 in part.image_rels.values()}
+        data = _pack_entry(part, media)
+        path = self._path(key)
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            return  # the cache is an optimisation only
+        if self._size is None:
+            self._size = sum(entry.stat().st_size for entry in self._entries())
+        else:
+            self._size += len(data)
+        if self._size > self.max_bytes:
+            self.evict()
+
+    def _entries(self):
+        try:
+            return [entry for entry in os.scandir(self.cache_dir)
+                    if entry.name.endswith(".slide")]
+        except OSError:
+            return []
+
+    def evict(self) -> None:
+        """Remove least recently used entries until the cache is under its limit."""
+        entries = sorted(self._entries(), key=lambda entry: entry.stat().st_mtime_ns)
+        size = sum(entry.stat().st_size for entry in entries)
+        target = self.max_bytes * _EVICT_TO
+        for entry in entries:
+            if size <= target:
+                break
+            size -= entry.stat().st_size
+            Path(entry.path).unlink(missing_ok=True)
+            self.evictions += 1
+        self._size = size
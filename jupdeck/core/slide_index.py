@@ -0,0 +1,185 @@
+# slide_index.py
+"""Find where each slide starts without parsing the whole notebook.
+
+A slide starts at the first visible cell, at every markdown cell with a non-empty
+level-1 title and at every cell with a ``new-slide`` or ``section`` directive, as
+in ``renderer.merge_slide_groups`` (see ``directives.starts_slide``). The pre-scan
+reads cell directives and looks for heading lines in markdown sources; only
+markdown cells that may hold a level-1 heading are parsed, and code cell outputs
+are never read. Selecting slides (``--slides 10-20``) or a section (``--section
+Results``) then parses and renders only the cells of those slides.
+
+The index can be cached next to the notebook as ``<notebook>.jupdeck-index.json``.
+It is rebuilt when the notebook's size or modification time changes.
+"""
+
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+import nbformat
+
+from jupdeck.core import directives, lazy, parser
+from jupdeck.core.budget import Budget
+from jupdeck.core.build import jupdeck_version
+from jupdeck.core.events import EventReporter
+
+INDEX_VERSION = 2  # 2: raw cells no longer start a slide
+INDEX_SUFFIX = ".jupdeck-index.json"
+
+
+class SlideSelectionError(ValueError):
+    pass
+
+
+@dataclass
+class SlideStart:
+    slide: int  # 1-based slide number in the full deck
+    cell: int  # index in the notebook of the cell that starts the slide
+    title: str = ""
+    section: bool = False  # the cell has a section directive
+
+
+@dataclass
+class SlideIndex:
+    n_cells: int
+    slides: List[SlideStart] = field(default_factory=list)
+
+    def cell_range(self, slide: int) -> range:
+        """Notebook cells that make up a slide, hidden ones included."""
+        start = self.slides[slide - 1].cell
+        stop = self.slides[slide].cell if slide < len(self.slides) else self.n_cells
+        return range(start, stop)
+
+    def sections(self) -> List[Tuple[str, range]]:
+        """(title, slide numbers) of each section. Without section directives
+        every slide is its own section."""
+        starts = [s.slide for s in self.slides if s.section or s.slide == 1]
+        if len(starts) == 1:
+            starts = [s.slide for s in self.slides]
+        bounds = starts + [len(self.slides) + 1]
+        return [(self.slides[start - 1].title, range(start, stop))
+                for start, stop in zip(bounds, bounds[1:])]
+
+    def select(self, slides: Sequence[Tuple[int, Optional[int]]] = (),
+               sections: Sequence[str] = ()) -> List[int]:
+        """Slide numbers picked by ``(first, last)`` ranges and section titles."""
+        total = len(self.slides)
+        selected: Set[int] = set()
+        for first, last in slides:
+            last = total if last is None else last
+            if first > total:
+                raise SlideSelectionError(
+                    f"slide {first} is out of range: the notebook has {total} slide(s)")
+            selected.update(range(first, min(last, total) + 1))
+
+        available = self.sections()
+        for name in sections:
+            matches = [numbers for title, numbers in available if title == name] or \
+                [numbers for title, numbers in available if title.casefold() == name.casefold()]
+            if not matches:
+                titles = ", ".join(repr(title) for title, _ in available[:10])
+                raise SlideSelectionError(f"no section titled {name!r} (sections: {titles})")
+            selected.update(matches[0])
+        return sorted(selected)
+
+    def cells(self, slides: Sequence[int]) -> Set[int]:
+        return {cell for slide in slides for cell in self.cell_range(slide)}
+
+
+def build_index(nb: nbformat.NotebookNode) -> SlideIndex:
+    index = SlideIndex(len(nb.cells))
+    selected, _ = directives.select_cells(nb.cells)
+    # Only markdown and code cells are parsed, so only they can start a slide
+    selected = [(cell_index, cell, cell_directives)
+                for cell_index, cell, cell_directives in selected
+                if cell.get("cell_type") in ("markdown", "code")]
+    for position, (cell_index, cell, cell_directives) in enumerate(selected):
+        starts, title = directives.starts_slide(cell, cell_directives)
+        if starts or position == 0:
+            index.slides.append(SlideStart(len(index.slides) + 1, cell_index, title,
+                                           cell_directives.section))
+    return index
+
+
+def index_path(notebook_path: Path) -> Path:
+    notebook_path = Path(notebook_path)
+    return notebook_path.with_name(notebook_path.name + INDEX_SUFFIX)
+
+
+def _stamp(notebook_path: Path) -> Dict[str, Any]:
+    stat = os.stat(notebook_path)
+    return {"index_version": INDEX_VERSION, "jupdeck": jupdeck_version(),
+            "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def load_index(notebook_path: Path, nb: nbformat.NotebookNode) -> SlideIndex:
+    """The cached index of a notebook, rebuilt and saved if missing or stale."""
+    path = index_path(notebook_path)
+    stamp = _stamp(notebook_path)
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        if {key: data.get(key) for key in stamp} == stamp:
+            return SlideIndex(data["n_cells"], [SlideStart(**s) for s in data["slides"]])
+    except (OSError, ValueError, KeyError, TypeError):
+        pass  # missing or unreadable: build it again
+
+    index = build_index(nb)
+    try:
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps({**stamp, **asdict(index)}), encoding="utf-8")
+        os.replace(tmp_path, path)
+    except OSError:
+        pass  # the cache is an optimisation only
+    return index
+
+
+def parse_slide_ranges(text: str) -> List[Tuple[int, Optional[int]]]:
+    """Parse ``"3"``, ``"10-20"``, ``"40-"`` or a comma-separated list of them."""
+    ranges = []
+    for item in text.split(","):
+        first, dash, last = item.strip().partition("-")
+        try:
+            first_number = int(first)
+            last_number = (int(last) if last.strip() else None) if dash else first_number
+        except ValueError:
+            raise ValueError(f"invalid slide range {item.strip()!r}") from None
+        if first_number < 1 or (last_number is not None and last_number < first_number):
+            raise ValueError(f"invalid slide range {item.strip()!r}")
+        ranges.append((first_number, last_number))
+    return ranges
+
+
+def format_slide_numbers(numbers: Sequence[int]) -> str:
+    """``[1, 2, 3, 7]`` -> ``"1-3, 7"``."""
+    runs: List[List[int]] = []
+    for number in numbers:
+        if runs and number == runs[-1][1] + 1:
+            runs[-1][1] = number
+        else:
+            runs.append([number, number])
+    return ", ".join(str(a) if a == b else f"{a}-{b}" for a, b in runs)
+
+
+def parse_notebook_slides(
+    notebook_path: Path,
+    slides: Sequence[Tuple[int, Optional[int]]] = (),
+    sections: Sequence[str] = (),
+    budget: Optional[Budget] = None,
+    cache_index: bool = False,
+    reporter: Optional[EventReporter] = None,
+) -> Dict[str, Any]:
+    """
+    Like ``parser.parse_notebook``, but only the cells of the selected slides
+    are parsed. The result also holds ``selected_slides`` and ``total_slides``.
+    """
+    nb = lazy.load_notebook_lazily(notebook_path)
+    index = load_index(notebook_path, nb) if cache_index else build_index(nb)
+    numbers = index.select(slides, sections)
+    parsed = parser.parse_notebook_node(nb, Path(notebook_path).name, budget,
+                                        cells=index.cells(numbers), reporter=reporter)
+    parsed["selected_slides"] = numbers
+    parsed["total_slides"] = len(index.slides)
+    return parsed
@@ -0,0 +1,227 @@
+# split.py
+"""Split a large deck into several smaller decks rendered in parallel.
+
+The notebook's slide groups are cut into parts by slide count, by an estimate of
+each part's size in bytes, or at the start of each section (a cell with the
+``section`` directive). Every part is rendered by its own worker process into
+``<output>_partN.pptx``, and ``<output>_parts.json`` lists the parts with the
+slides in each, numbered as they would be in the unsplit deck. The attribution
+slide closes the last part.
+"""
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from jupdeck.core.assembly import next_slide_id
+from jupdeck.core.budget import Budget, BudgetDecision, image_size
+from jupdeck.core.events import EventReporter
+from jupdeck.core.models import ParsedCell
+from jupdeck.core.renderer import PowerPointRenderer, merge_slide_groups
+from jupdeck.core.slide_cache import SlideCache
+
+INDEX_VERSION = 1
+SLIDE_OVERHEAD_BYTES = 4096  # slide, notes and relationship XML of one slide, roughly
+
+
+@dataclass(frozen=True)
+class SplitPolicy:
+    max_slides: Optional[int] = None  # slides per part
+    max_bytes: Optional[int] = None   # estimated bytes per part
+    by_section: bool = False          # start a part at every section directive
+
+    @property
+    def is_unlimited(self) -> bool:
+        return not (self.max_slides or self.max_bytes or self.by_section)
+
+
+@dataclass
+class DeckPart:
+    number: int
+    path: str  # file name, next to the index
+    first_slide: int  # 1-based, as numbered in the unsplit deck
+    last_slide: int
+    title: str = ""  # title of the part's first slide
+    estimated_bytes: int = 0
+    overflowing_slides: List[int] = field(default_factory=list)
+
+
+@dataclass
+class SplitIndex:
+    source: str
+    parts: List[DeckPart] = field(default_factory=list)
+    budget_decisions: List[BudgetDecision] = field(default_factory=list)  # not saved
+
+    @property
+    def overflowing_slides(self) -> List[int]:
+        return [number for part in self.parts for number in part.overflowing_slides]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "index_version": INDEX_VERSION,
+            "source": self.source,
+            "slides": self.parts[-1].last_slide if self.parts else 0,
+            "parts": [asdict(part) for part in self.parts],
+        }
+
+    def save(self, path: Path) -> None:
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(self.to_dict(), indent=2), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+
+def index_path(output_path: Path) -> Path:
+    output_path = Path(output_path)
+    return output_path.with_name(f"{output_path.stem}_parts.json")
+
+
+def part_path(output_path: Path, number: int) -> Path:
+    output_path = Path(output_path)
+    return output_path.with_name(f"{output_path.stem}_part{number}{output_path.suffix}")
+
+
+def estimate_slide_bytes(group: ParsedCell) -> int:
+    """Rough size of a slide in the saved deck: its images, text, table and XML overhead."""
+    size = SLIDE_OVERHEAD_BYTES + len(group.title or "")
+    size += sum(len(text) for text in group.bullets + group.paragraphs)
+    if group.table:
+        size += len(json.dumps(group.table, default=str))
+    return size + sum(image_size(image) for image in group.images if not image.is_empty)
+
+
+def plan_parts(groups: List[ParsedCell], policy: SplitPolicy) -> List[range]:
+    """Cut slide groups into consecutive parts; every part has at least one slide."""
+    parts = []
+    start, size = 0, 0
+    for i, group in enumerate(groups):
+        group_size = estimate_slide_bytes(group)
+        if i > start and (
+            (policy.by_section and group.metadata.get("section"))
+            or (policy.max_slides and i - start >= policy.max_slides)
+            or (policy.max_bytes and size + group_size > policy.max_bytes)
+        ):
+            parts.append(range(start, i))
+            start, size = i, 0
+        size += group_size
+    if groups:
+        parts.append(range(start, len(groups)))
+    return parts
+
+
+def render_part(groups: List[ParsedCell], path: Path, options: dict,
+                attribution: Optional[str] = None,
+                first_slide: int = 0) -> Tuple[List[int], List[BudgetDecision], Tuple[int, int]]:
+    """
+    Worker entry point: render one part, whose first slide is slide ``first_slide``
+    (0-based) of the unsplit deck. Returns the part's overflowing slides (1-based
+    within the part), its budget decisions and the slide cache (hits, misses) it
+    made.
+    """
+    ppt_renderer = PowerPointRenderer(output_path=path, include_attribution=False, **options)
+    # Slides keep their ids from the unsplit deck, so the table files exported next
+    # to the parts (named after the slide id) don't collide
+    first_id = next_slide_id(ppt_renderer.prs) + first_slide
+    ppt_renderer.slide_ids = list(range(first_id, first_id + len(groups)))
+    cache = ppt_renderer.slide_cache
+    lookups = (cache.hits, cache.misses) if cache else (0, 0)
+    ppt_renderer._render_groups(groups)
+    if attribution:
+        ppt_renderer.render_attribution(attribution)
+    ppt_renderer.save()
+    if cache:
+        lookups = (cache.hits - lookups[0], cache.misses - lookups[1])
+    return ppt_renderer.overflowing_slides, ppt_renderer.budget_tracker.decisions, lookups
+
+
+def _reported(result, job, reporter: EventReporter):
+    """Report the slides and bytes of a part that has been written; returns ``result``."""
+    for _ in job[0]:
+        reporter.emit("slide_rendered", slide=None, cached=None)
+    reporter.emit("deck_saved", path=str(job[1]), bytes=job[1].stat().st_size)
+    return result
+
+
+def _remove_stale_parts(index_file: Path, keep: List[str]) -> None:
+    """Delete parts listed by a previous index that this split no longer writes."""
+    try:
+        previous = json.loads(index_file.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return
+    for part in previous.get("parts", []):
+        name = Path(part.get("path", "")).name
+        if name and name not in keep:
+            (index_file.parent / name).unlink(missing_ok=True)
+
+
+def split_presentation(
+    parsed_notebook: dict,
+    output_path: Path,
+    policy: SplitPolicy,
+    workers: int = 1,
+    include_speaker_notes: bool = True,
+    include_attribution: bool = True,
+    input_path: Optional[Path] = None,
+    budget: Optional[Budget] = None,
+    slide_cache: Optional[SlideCache] = None,
+    reporter: Optional[EventReporter] = None,
+    reproducible: bool = False,
+    charts: str = "tagged",
+    output_notes: bool = False,
+    linked_media_dir: Optional[Path] = None,
+) -> SplitIndex:
+    """
+    Render a parsed notebook into ``<output>_partN.pptx`` decks, one worker
+    process per part, and write the ``<output>_parts.json`` index.
+    Budgets apply to each part separately. Progress is reported as each part
+    is written.
+    """
+    reporter = reporter or EventReporter()
+    output_path = Path(output_path)
+    groups = merge_slide_groups(parsed_notebook.get("cells", []))
+    ranges = plan_parts(groups, policy) or [range(0, 0)]
+    attribution = (input_path.name if input_path else "a notebook") \
+        if include_attribution else None
+    options = {"include_speaker_notes": include_speaker_notes, "budget": budget,
+               "slide_cache": slide_cache, "reproducible": reproducible,
+               "charts": charts, "output_notes": output_notes,
+               "linked_media_dir": linked_media_dir}
+
+    jobs = [([groups[i] for i in slides], part_path(output_path, number), options,
+             attribution if number == len(ranges) else None, slides.start)
+            for number, slides in enumerate(ranges, start=1)]
+    in_workers = workers > 1 and len(jobs) > 1
+    reporter.emit("render_started", slides=len(groups))
+    if in_workers:
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as executor:
+            results = [_reported(result, job, reporter)
+                       for result, job in zip(executor.map(render_part, *zip(*jobs)), jobs)]
+    else:
+        results = [_reported(render_part(*job), job, reporter) for job in jobs]
+
+    index = SplitIndex(input_path.name if input_path else output_path.stem,
+                       budget_decisions=list(parsed_notebook.get("budget_decisions", [])))
+    for number, (slides, job, (overflowing, decisions, cache_counts)) in enumerate(
+            zip(ranges, jobs, results), start=1):
+        offset = slides.start
+        last_slide = slides.stop + (1 if job[3] else 0)
+        index.parts.append(DeckPart(
+            number=number,
+            path=job[1].name,
+            first_slide=offset + 1,
+            last_slide=last_slide,
+            title=(groups[offset].title or "") if len(slides) else "",
+            estimated_bytes=sum(estimate_slide_bytes(groups[i]) for i in slides),
+            overflowing_slides=[offset + n for n in overflowing],
+        ))
+        index.budget_decisions.extend(decisions)
+        if slide_cache and in_workers:  # workers count in their own copy of the cache
+            slide_cache.hits += cache_counts[0]
+            slide_cache.misses += cache_counts[1]
+
+    index_file = index_path(output_path)
+    _remove_stale_parts(index_file, [part.path for part in index.parts])
+    index.save(index_file)
+    return index
@@ -0,0 +1,134 @@
+# text_output.py
+"""Bounded capture of the text a code cell printed.
+
+Stream output (stdout and stderr) and plain-text results are fed, in output
+order, through one ``HeadTailBuffer`` per cell. The buffer keeps the first
+``head`` and the last ``tail`` lines, each cut to ``max_line_chars``, and
+counts the lines in between, so the excerpt, and the memory used to build it,
+stay the same size whether the cell printed ten lines or 200 MB of logs. A
+carriage return starts its line over, as in a terminal, so progress bars
+reduce to their final state; in a ``\r\n`` it is part of the line ending.
+
+The excerpt is stored as ``ParsedCell.text_output``; the renderer writes it
+into the speaker notes when asked to (``output_notes``).
+"""
+
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional
+
+HEAD_LINES = 10
+TAIL_LINES = 10
+MAX_LINE_CHARS = 200
+_TRUNCATED = "…"
+_RICH_MIME_TYPES = ("text/html", "image/")  # results shown on the slide instead
+
+
+class HeadTailBuffer:
+    """The first ``head`` and last ``tail`` lines written, whatever the volume."""
+
+    def __init__(self, head: int = HEAD_LINES, tail: int = TAIL_LINES,
+                 max_line_chars: int = MAX_LINE_CHARS):
+        self.head = head
+        self.max_line_chars = max_line_chars
+        self.head_lines: List[str] = []
+        self.tail_lines: deque = deque(maxlen=tail)
+        self.omitted = 0  # lines dropped between the head and the tail
+        self._line: List[str] = []  # pieces of the unfinished line, at most max_line_chars
+        self._line_chars = 0
+        self._line_cut = False
+        self._pending_cr = False  # a "\r" ended the last write; it may start a "\r\n"
+
+    def _extend_line(self, text: str, start: int, end: int) -> None:
+        room = self.max_line_chars - self._line_chars
+        if end - start > room:
+            end = start + room
+            self._line_cut = True
+        if end > start:
+            self._line.append(text[start:end])
+            self._line_chars += end - start
+
+    def _reset_line(self) -> None:
+        self._line, self._line_chars, self._line_cut = [], 0, False
+
+    def _finish_line(self) -> None:
+        line = "".join(self._line) + (_TRUNCATED if self._line_cut else "")
+        self._reset_line()
+        if len(self.head_lines) < self.head:
+            self.head_lines.append(line)
+            return
+        if self.tail_lines.maxlen == 0 or len(self.tail_lines) == self.tail_lines.maxlen:
+            self.omitted += 1
+        if self.tail_lines.maxlen:
+            self.tail_lines.append(line)
+
+    def write(self, text: str) -> None:
+        """Add ``text``, which may end in the middle of a line."""
+        if self._pending_cr and text:
+            self._pending_cr = False
+            if not text.startswith("\n"):
+                self._reset_line()
+        start = 0
+        while start <= len(text):
+            end = text.find("\n", start)
+            line_end = len(text) if end < 0 else end
+            if line_end > start and text[line_end - 1] == "\r":
+                line_end -= 1  # the "\r" of a "\r\n", or one the next write decides
+                self._pending_cr = end < 0
+            carriage_return = text.rfind("\r", start, line_end)
+            if carriage_return >= 0:
+                self._reset_line()
+                start = carriage_return + 1
+            self._extend_line(text, start, line_end)
+            if end < 0:
+                return
+            self._finish_line()
+            start = end + 1
+
+    def end_line(self) -> None:
+        """Finish the current line, if any, so the next write starts a new one."""
+        self._pending_cr = False
+        if self._line or self._line_cut:
+            self._finish_line()
+
+    def lines(self) -> List[str]:
+        """The captured lines, with a marker where lines were left out."""
+        lines = list(self.head_lines)
+        if self.omitted:
+            lines.append(f"[... {self.omitted} line(s) omitted ...]")
+        lines.extend(self.tail_lines)
+        if self._line or self._line_cut:  # output that didn't end with a newline
+            lines.append("".join(self._line) + (_TRUNCATED if self._line_cut else ""))
+        return lines
+
+    def getvalue(self) -> str:
+        return "\n".join(self.lines())
+
+
+def _text(value: Any) -> Iterable[str]:
+    # nbformat joins multi-line strings on read, but outputs built by hand may be lists
+    return value if isinstance(value, list) else [value or ""]
+
+
+def output_text(output: Dict[str, Any]) -> Iterable[str]:
+    """The text an output contributes to the excerpt: stream text, or a plain-text result."""
+    output_type = output.get("output_type")
+    if output_type == "stream":
+        return _text(output.get("text"))
+    if output_type in ("display_data", "execute_result"):
+        data = output.get("data", {})
+        if "text/plain" in data and \
+                not any(mime.startswith(_RICH_MIME_TYPES) for mime in data):
+            return _text(data["text/plain"])
+    return ()
+
+
+def capture_text_outputs(outputs: Iterable[Dict[str, Any]], head: int = HEAD_LINES,
+                         tail: int = TAIL_LINES,
+                         max_line_chars: int = MAX_LINE_CHARS) -> Optional[str]:
+    """The head and tail of the text printed by a cell's outputs, or None if it printed none."""
+    buffer = HeadTailBuffer(head, tail, max_line_chars)
+    for output in outputs:
+        for text in output_text(output):
+            buffer.write(text)
+        buffer.end_line()  # the next output starts on a new line
+    return buffer.getvalue() or None
@@ -0,0 +1,83 @@
+# textframe.py
+"""Write many paragraphs into a text frame in one pass.
+
+Setting ``text``, ``level``, ``font.size`` and spacing on each python-pptx
+paragraph builds and rebuilds XML elements one property at a time. Here the
+paragraphs of a text body are written as one XML string, with the paragraph
+properties shared by all of them serialised once, and parsed in a single call.
+The result is the same XML python-pptx produces for the same text: line breaks
+for ``\\n`` and ``\\v``, no empty runs and ``_xHHHH_`` escapes for control
+characters.
+"""
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Iterable, Optional
+from xml.sax.saxutils import escape
+
+from pptx.oxml import parse_xml
+from pptx.oxml.ns import nsdecls, qn
+
+_LINE_BREAK = re.compile("\n|\v")
+_CONTROL_CHARS = re.compile(r"([\x00-\x08\x0B-\x1F])")
+
+
+@dataclass(frozen=True)
+class ParagraphStyle:
+    """Paragraph properties shared by every paragraph written in one call."""
+
+    font_size: Optional[float] = None     # points, as the paragraphs' default run size
+    space_before: Optional[float] = None  # points
+    space_after: Optional[float] = None   # points
+
+
+@lru_cache(maxsize=64)
+def _paragraph_properties(style: Optional[ParagraphStyle]) -> str:
+    """``<a:pPr>`` for a style, in the element order python-pptx uses."""
+    if style is None:
+        return ""
+    children = []
+    if style.space_before is not None:
+        children.append(f'<a:spcBef><a:spcPts val="{round(style.space_before * 100)}"/></a:spcBef>')
+    if style.space_after is not None:
+        children.append(f'<a:spcAft><a:spcPts val="{round(style.space_after * 100)}"/></a:spcAft>')
+    if style.font_size is not None:
+        children.append(f'<a:defRPr sz="{round(style.font_size * 100)}"/>')
+    return f"<a:pPr>{''.join(children)}</a:pPr>" if children else ""
+
+
+def _escape_run(text: str) -> str:
+    text = _CONTROL_CHARS.sub(lambda match: "_x%04X_" % ord(match.group(1)), text)
+    return escape(text)
+
+
+def paragraph_xml(text: str, properties: str = "") -> str:
+    """One ``<a:p>`` holding ``text``, as python-pptx's ``_Paragraph.text`` writes it."""
+    runs = []
+    for index, line in enumerate(_LINE_BREAK.split(text)):
+        if index:
+            runs.append("<a:br/>")
+        if line:
+            runs.append(f"<a:r><a:t>{_escape_run(line)}</a:t></a:r>")
+    if not properties and not runs:
+        return "<a:p/>"
+    return f"<a:p>{properties}{''.join(runs)}</a:p>"
+
+
+def write_paragraphs(txBody, texts: Iterable[str], style: Optional[ParagraphStyle] = None,
+                     append: bool = False) -> None:
+    """
+    Write one paragraph per text into ``txBody``, replacing its paragraphs, or
+    after them with ``append``.
+    """
+    properties = _paragraph_properties(style)
+    body = "".join(paragraph_xml(text, properties) for text in texts)
+    if not body:
+        return
+    fragment = parse_xml(f"<a:txBody {nsdecls('a')}>{body}</a:txBody>")
+
+    if not append:
+        for paragraph in txBody.findall(qn("a:p")):
+            txBody.remove(paragraph)
+    txBody.extend(fragment)
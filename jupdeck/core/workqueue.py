@@ -0,0 +1,261 @@
+# workqueue.py
+"""Conversion jobs shared between hosts through a directory.
+
+A queue is a directory, typically on a shared filesystem, with one
+subdirectory per job state::
+
+    pending/<job id>.json   submitted, waiting for a worker
+    claimed/<job id>.json   being converted; its mtime is the worker's heartbeat
+    done/<job id>.json      converted; the record holds the slide count and timings
+    failed/<job id>.json    conversion raised, or the job's claims kept going stale
+
+Each record is the job's status file. A worker claims a job by renaming its file
+from ``pending`` into ``claimed``, which only one worker can do, and touches the
+claimed file while it converts. A claim whose heartbeat is older than
+``stale_after`` seconds belongs to a worker that died: any worker moves it back
+to ``pending``, or to ``failed`` after ``max_attempts`` claims, with a single
+rename, so a job file is in one of the state directories at every moment. Jobs
+therefore run at least once. Decks are written to a temporary file and renamed into
+place, so a job that does run twice never leaves a half-written deck.
+
+Paths in a job are absolute, so every host must mount the shared filesystem
+at the same path.
+"""
+
+import json
+import os
+import secrets
+import socket
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+from jupdeck.core.aio import ConversionResult, convert_file, write_atomically
+from jupdeck.core.budget import Budget
+
+STATES = ("pending", "claimed", "done", "failed")
+DEFAULT_STALE_AFTER = 300.0  # seconds without a heartbeat before a claim is retried
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_POLL_INTERVAL = 2.0
+
+
+@dataclass
+class Job:
+    id: str
+    input_path: str
+    output_path: str
+    options: Dict[str, Any] = field(default_factory=dict)  # see job_options()
+    state: str = "pending"
+    submitted_at: float = 0.0
+    attempts: int = 0  # claims so far
+    worker: Optional[str] = None  # host:pid of the last worker to claim the job
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    slides: Optional[int] = None
+    error: Optional[str] = None
+
+
+def job_options(include_speaker_notes: bool = True, include_attribution: bool = True,
+                budget: Optional[Budget] = None) -> Dict[str, Any]:
+    return {
+        "include_speaker_notes": include_speaker_notes,
+        "include_attribution": include_attribution,
+        "budget": asdict(budget) if budget else None,
+    }
+
+
+def worker_name() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class WorkQueue:
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        for state in STATES:
+            (self.directory / state).mkdir(parents=True, exist_ok=True)
+
+    def _path(self, state: str, job_id: str) -> Path:
+        return self.directory / state / f"{job_id}.json"
+
+    def _read(self, path: Path) -> Job:
+        return Job(**json.loads(path.read_text(encoding="utf-8")))
+
+    def _write(self, job: Job) -> None:
+        write_atomically(self._path(job.state, job.id),
+                         json.dumps(asdict(job), indent=2).encode("utf-8"))
+
+    def _jobs(self, state: str) -> Iterator[Path]:
+        """Job files in a state, oldest submission first (ids sort by time)."""
+        return iter(sorted(path for path in (self.directory / state).glob("*.json")))
+
+    def submit(self, input_path: Path, output_path: Path,
+               options: Optional[Dict[str, Any]] = None) -> Job:
+        job = Job(
+            id=f"{time.time_ns():x}-{Path(input_path).stem}-{secrets.token_hex(3)}",
+            input_path=str(Path(input_path).resolve()),
+            output_path=str(Path(output_path).resolve()),
+            options=options or job_options(),
+            submitted_at=time.time(),
+        )
+        self._write(job)
+        return job
+
+    def claim(self, worker: Optional[str] = None) -> Optional[Job]:
+        """Take the oldest pending job, or return None if there is none."""
+        for pending in self._jobs("pending"):
+            claimed = self._path("claimed", pending.stem)
+            try:
+                # First heartbeat before the rename, which keeps the mtime: a claimed
+                # file with an old mtime would look stale to requeue_stale
+                os.utime(pending)
+                os.rename(pending, claimed)  # atomic: exactly one worker wins
+                job = self._read(claimed)
+            except FileNotFoundError:
+                continue  # another worker got there first
+            if job.state == "claimed":  # moved back by requeue_stale
+                job.error = f"claim by {job.worker} went stale"
+            job.state = "claimed"
+            job.attempts += 1
+            job.worker = worker or worker_name()
+            job.started_at = time.time()
+            self._write(job)
+            return job
+        return None
+
+    def heartbeat(self, job: Job) -> None:
+        try:
+            os.utime(self._path("claimed", job.id))
+        except FileNotFoundError:
+            pass  # requeued as stale; the job's result is still recorded when it finishes
+
+    def _finish(self, job: Job, state: str) -> None:
+        job.state = state
+        job.finished_at = time.time()
+        self._write(job)
+        # Clear any other record left by a stale requeue while this worker ran
+        for other in STATES:
+            if other != state:
+                self._path(other, job.id).unlink(missing_ok=True)
+
+    def complete(self, job: Job, result: ConversionResult) -> None:
+        job.slides = result.slides
+        job.error = None
+        self._finish(job, "done")
+
+    def fail(self, job: Job, error: str) -> None:
+        job.error = error
+        self._finish(job, "failed")
+
+    def requeue_stale(self, stale_after: float = DEFAULT_STALE_AFTER,
+                      max_attempts: int = DEFAULT_MAX_ATTEMPTS) -> int:
+        """
+        Return claims without a heartbeat for ``stale_after`` seconds to
+        ``pending``, or fail them after ``max_attempts``. Returns how many.
+        """
+        now = time.time()
+        requeued = 0
+        for claimed in self._jobs("claimed"):
+            try:
+                if now - claimed.stat().st_mtime < stale_after:
+                    continue
+                job = self._read(claimed)
+                # One rename straight to the next state: only one worker wins it, and
+                # the job is never outside a state directory
+                state = "failed" if job.attempts >= max_attempts else "pending"
+                os.rename(claimed, self._path(state, job.id))
+            except FileNotFoundError:
+                continue
+            if state == "failed":  # no worker reads failed records, so update it in place
+                job.state, job.finished_at = "failed", now
+                job.error = f"claim by {job.worker} went stale after {stale_after:g} s"
+                self._write(job)
+            # A pending record is left as it is: a worker may claim it at once, and
+            # claim() notes that the previous claim went stale
+            requeued += 1
+        return requeued
+
+    def status(self, job_id: str) -> Optional[Job]:
+        for state in STATES:
+            try:
+                job = self._read(self._path(state, job_id))
+            except FileNotFoundError:
+                continue
+            job.state = state  # a requeued record still says "claimed"
+            return job
+        return None
+
+    def counts(self) -> Dict[str, int]:
+        return {state: sum(1 for _ in self._jobs(state)) for state in STATES}
+
+
+def run_job(job: Job) -> ConversionResult:
+    """Convert a job's notebook, writing the deck atomically."""
+    options = job.options
+    return convert_file(
+        job.input_path, job.output_path,
+        include_speaker_notes=options.get("include_speaker_notes", True),
+        include_attribution=options.get("include_attribution", True),
+        budget=Budget(**options["budget"]) if options.get("budget") else None,
+    )
+
+
+class _Heartbeat:
+    """Touches a claimed job's file from a background thread while it converts."""
+
+    def __init__(self, queue: WorkQueue, job: Job, interval: float):
+        self.queue, self.job, self.interval = queue, job, interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.queue.heartbeat(self.job)
+
+    def __enter__(self) -> "_Heartbeat":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+def run_worker(
+    queue: WorkQueue,
+    worker: Optional[str] = None,
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+    stale_after: float = DEFAULT_STALE_AFTER,
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+    max_jobs: Optional[int] = None,
+    exit_when_idle: bool = False,
+    on_finished=None,
+) -> int:
+    """
+    Claim and convert jobs until ``max_jobs`` have run or, with
+    ``exit_when_idle``, no job is pending. ``on_finished(job)`` is called after
+    each job. Returns the number of jobs run.
+    """
+    worker = worker or worker_name()
+    processed = 0
+    while max_jobs is None or processed < max_jobs:
+        queue.requeue_stale(stale_after, max_attempts)
+        job = queue.claim(worker)
+        if job is None:
+            if exit_when_idle:
+                break
+            time.sleep(poll_interval)
+            continue
+
+        with _Heartbeat(queue, job, stale_after / 4):
+            try:
+                result = run_job(job)
+            except Exception as e:  # the job fails, the worker carries on
+                queue.fail(job, f"{type(e).__name__}: {e}")
+            else:
+                queue.complete(job, result)
+        processed += 1
+        if on_finished:
+            on_finished(job)
+    return processed
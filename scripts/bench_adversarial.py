@@ -0,0 +1,118 @@
+"""Measure how parse and render time scale on pathological notebooks.
+
+Each case builds a notebook from a size n (nesting depth, list items, columns,
+...) and is run at n, 2n and 4n. For every doubling the script prints the
+ratio of times: about 2 is linear, about 4 quadratic. A case that raises,
+e.g. RecursionError, is reported with the size it failed at.
+
+Usage: python scripts/bench_adversarial.py [scale]
+"""
+
+import math
+import sys
+import tempfile
+import time
+import traceback
+from pathlib import Path
+
+from nbformat.v4 import new_code_cell, new_markdown_cell, new_notebook, new_output
+
+from jupdeck.core import parser
+from jupdeck.core.renderer import PowerPointRenderer
+
+
+def deep_list(n: int):
+    lines = [f"{'  ' * level}- level {level}" for level in range(n)]
+    return [new_markdown_cell("# Deep list\n\n" + "\n".join(lines))]
+
+
+def deep_emphasis(n: int):
+    return [new_markdown_cell("# Deep emphasis\n\n" + "*_" * n + "text" + "_*" * n)]
+
+
+def deep_links(n: int):
+    return [new_markdown_cell("# Deep links\n\n" + "[**a " * n + "x" + "**](u)" * n)]
+
+
+def many_list_items(n: int):
+    items = "\n".join(f"- item {i} with *emphasis* and a [link](https://example.com/{i})"
+                      for i in range(n))
+    return [new_markdown_cell("# Many items\n\n" + items)]
+
+
+def huge_cell(n: int):
+    prose = "\n\n".join(f"Paragraph {i}: " + "word " * 50 for i in range(n))
+    return [new_markdown_cell("# Huge cell\n\n" + prose)]
+
+
+def wide_table(n: int):
+    header = "".join(f"<th>c{i}</th>" for i in range(n))
+    rows = "".join("<tr>" + "".join(f"<td>{r * i}</td>" for i in range(n)) + "</tr>"
+                   for r in range(5))
+    return [new_markdown_cell("# Wide table"), new_code_cell("df", outputs=[
+        new_output("execute_result",
+                   data={"text/html": f"<table><tr>{header}</tr>{rows}</table>"})])]
+
+
+def huge_stream(n: int):
+    return [new_markdown_cell("# Output"), new_code_cell("run()", outputs=[
+        new_output("stream", name="stdout", text="log line\n" * n)])]
+
+
+def many_slides(n: int):
+    return [new_markdown_cell(f"# Slide {i}\n\n- a\n- b") for i in range(n)]
+
+
+CASES = {  # case: size n at scale 1
+    "deep_list": (deep_list, 250),
+    "deep_emphasis": (deep_emphasis, 250),
+    "deep_links": (deep_links, 250),
+    "many_list_items": (many_list_items, 1000),
+    "huge_cell": (huge_cell, 500),
+    "wide_table": (wide_table, 1000),
+    "huge_stream": (huge_stream, 20000),
+    "many_slides": (many_slides, 100),
+}
+
+
+def run(cells):
+    """Seconds to parse and to render (and save) a notebook made of ``cells``."""
+    nb = new_notebook(cells=cells)
+    start = time.perf_counter()
+    parsed = parser.parse_notebook_node(nb, "adversarial.ipynb")
+    parsed_at = time.perf_counter()
+    with tempfile.TemporaryDirectory() as tmp:  # also receives exported table files
+        PowerPointRenderer(Path(tmp) / "deck.pptx",
+                           include_attribution=False).render_presentation(parsed)
+    return parsed_at - start, time.perf_counter() - parsed_at
+
+
+def _ratio(times, i) -> str:
+    if i == 0 or times[i - 1] < 1e-3:
+        return "     "
+    return f"x{times[i] / times[i - 1]:4.1f}"
+
+
+def main() -> None:
+    scale = float(sys.argv[1]) if len(sys.argv) > 1 else 1.0
+    print(f"{'case':<16} {'n':>7} {'parse s':>9}       {'render s':>9}")
+    for name, (make_cells, base) in CASES.items():
+        parse_times, render_times = [], []
+        for step in range(3):
+            n = max(1, math.ceil(base * scale)) * 2 ** step
+            try:
+                parse_s, render_s = run(make_cells(n))
+            except Exception as e:
+                frame = traceback.extract_tb(e.__traceback__)[-1]
+                print(f"{name:<16} {n:>7} fails: {type(e).__name__} "
+                      f"at {frame.filename.rsplit('/', 1)[-1]}:{frame.lineno}")
+                break
+            parse_times.append(parse_s)
+            render_times.append(render_s)
+            i = len(parse_times) - 1
+            print(f"{name:<16} {n:>7} {parse_s:9.3f} {_ratio(parse_times, i)} "
+                  f"{render_s:9.3f} {_ratio(render_times, i)}")
+
+
+if __name__ == "__main__":
+    main()
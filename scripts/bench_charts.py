@@ -0,0 +1,85 @@
+"""Compare deck size and render time of plots drawn as images and as native charts.
+
+Each slide of the benchmark notebook shows a small numeric table with a raster
+line plot of it, like ``df`` followed by ``df.plot()``. The deck is rendered
+twice: with ``--charts off`` (the table and the PNG) and with every cell
+tagged ``jupdeck-chart`` (one native chart in their place). The PNGs are drawn
+with PIL at matplotlib's default 640x480 pixels.
+
+Usage: python scripts/bench_charts.py [slides]
+"""
+
+import base64
+import io
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from nbformat.v4 import new_code_cell, new_markdown_cell, new_notebook, new_output
+from PIL import Image, ImageDraw
+
+from jupdeck.core import parser
+from jupdeck.core.renderer import PowerPointRenderer
+
+COLORS = ["#1f77b4", "#ff7f0e", "#2ca02c"]
+
+
+def plot_png(series, width=640, height=480) -> bytes:
+    image = Image.new("RGB", (width, height), "white")
+    draw = ImageDraw.Draw(image)
+    draw.rectangle([80, 58, 576, 427], outline="black")
+    top = max(max(values) for values in series)
+    for color, values in zip(COLORS, series):
+        points = [(80 + 496 * i / (len(values) - 1), 427 - 369 * value / top)
+                  for i, value in enumerate(values)]
+        draw.line(points, fill=color, width=2)
+    for i in range(len(series[0])):
+        draw.text((80 + 496 * i / (len(series[0]) - 1) - 8, 435), f"{i + 1}", fill="black")
+    buffer = io.BytesIO()
+    image.save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def notebook(n_slides: int, tag: bool):
+    rng = random.Random(0)
+    cells = []
+    for i in range(n_slides):
+        series = [[rng.uniform(10, 100) for _ in range(12)] for _ in COLORS]
+        head = "".join(f"<th>s{j}</th>" for j in range(len(series)))
+        rows = "".join(f"<tr><th>{month}</th>" + "".join(f"<td>{values[month - 1]:.2f}</td>"
+                                                       for values in series) + "</tr>"
+                       for month in range(1, 13))
+        code = new_code_cell("df\ndf.plot()", outputs=[
+            new_output("execute_result", data={
+                "text/html": f"<table><tr><th></th>{head}</tr>{rows}</table>"}),
+            new_output("display_data", data={
+                "image/png": base64.b64encode(plot_png(series)).decode("ascii")}),
+        ])
+        code.metadata["tags"] = ["jupdeck-chart"] if tag else []
+        cells += [new_markdown_cell(f"# Series {i}"), code]
+    return new_notebook(cells=cells)
+
+
+def run(n_slides: int, charts: bool, directory: Path):
+    """Seconds to render (and save) the notebook, and the deck's size in bytes."""
+    parsed = parser.parse_notebook_node(notebook(n_slides, tag=charts), "charts.ipynb")
+    path = directory / ("charts.pptx" if charts else "images.pptx")
+    start = time.perf_counter()
+    PowerPointRenderer(path, include_attribution=False,
+                       charts="tagged" if charts else "off").render_presentation(parsed)
+    return time.perf_counter() - start, path.stat().st_size
+
+
+def main() -> None:
+    n_slides = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    with tempfile.TemporaryDirectory() as tmp:
+        results = {charts: run(n_slides, charts, Path(tmp)) for charts in (False, True)}
+    print(f"{n_slides} slides        render s   deck KB")
+    for charts, (seconds, size) in results.items():
+        print(f"{'charts' if charts else 'images':<16} {seconds:9.3f} {size / 1024:9.1f}")
+
+
+if __name__ == "__main__":
+    main()
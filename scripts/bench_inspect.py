@@ -0,0 +1,74 @@
+"""Benchmark the streaming deck inspector against reopening the deck with python-pptx.
+
+Usage: python scripts/bench_inspect.py [n_slides]
+"""
+
+import base64
+import io
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from PIL import Image
+from pptx import Presentation
+
+from jupdeck.core import inspector
+from jupdeck.core.models import ImageData, ParsedCell
+from jupdeck.core.renderer import PowerPointRenderer
+
+
+def make_image(seed: int) -> ImageData:
+    rng = random.Random(seed)
+    image = Image.frombytes("RGB", (640, 480), rng.randbytes(640 * 480 * 3))
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return ImageData("image/png", base64.b64encode(buffer.getvalue()).decode("ascii"))
+
+
+def make_slides(n_slides: int):
+    return [
+        ParsedCell(
+            type="markdown",
+            title=f"Slide {i}",
+            bullets=[f"Observation {i}.{j} about the results" for j in range(5)],
+            images=[make_image(i)],
+            table=[{"metric": f"m{r}", "value": r * i} for r in range(8)],
+        )
+        for i in range(n_slides)
+    ]
+
+
+def measure(label: str, fn) -> None:
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<22} {elapsed * 1000:8.1f} ms  peak {peak / 1024 / 1024:6.1f} MB  -> {result}")
+
+
+def with_pptx(path: Path) -> int:
+    prs = Presentation(path)
+    return sum(1 for slide in prs.slides if slide.shapes.title is not None)
+
+
+def with_inspector(path: Path) -> int:
+    return len(inspector.inspect_deck(path).slides)
+
+
+def main():
+    n_slides = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    with tempfile.TemporaryDirectory() as tmp:
+        deck = Path(tmp) / "deck.pptx"
+        PowerPointRenderer(deck, include_attribution=False).render_slides(make_slides(n_slides))
+        print(f"{n_slides} slides, {deck.stat().st_size / 1024 / 1024:.1f} MB deck")
+        measure("python-pptx", lambda: with_pptx(deck))
+        measure("jupdeck inspector", lambda: with_inspector(deck))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Benchmark the per-slide cost of LayoutEngine.plan.
+
+Usage: python scripts/bench_layout.py [n_slides]
+"""
+
+import random
+import sys
+import time
+
+from jupdeck.core import layout
+from jupdeck.core.layout import LayoutEngine
+from jupdeck.core.models import ImageData, ParsedCell
+
+MINIMAL_PNG = (
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAQAAAC1HAwC"
+    "AAAAC0lEQVR42mP8/x8AAwMCAO+XZhEAAAAASUVORK5CYII="
+)
+WORDS = ("revenue growth quarter forecast model residual baseline variance "
+         "significant regional uplift cohort retention churn pipeline").split()
+
+
+def make_slides(n_slides: int, seed: int = 0):
+    rng = random.Random(seed)
+    slides = []
+    for i in range(n_slides):
+        bullets = [" ".join(rng.choices(WORDS, k=rng.randint(4, 30)))
+                   for _ in range(rng.randint(0, 8))]
+        images = [ImageData("image/png", MINIMAL_PNG) for _ in range(rng.randint(0, 3))]
+        table = [{"a": j, "b": j * 2} for j in range(rng.randint(0, 30))] or None
+        slides.append(ParsedCell(type="markdown", title=f"Slide {i}: " + " ".join(
+            rng.choices(WORDS, k=rng.randint(1, 12))), bullets=bullets, images=images,
+            table=table))
+    return slides
+
+
+def main():
+    n_slides = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    slides = make_slides(n_slides)
+    engine = LayoutEngine()
+
+    for label in ("cold", "warm"):
+        if label == "cold":
+            layout.clear_caches()
+        start = time.perf_counter()
+        plans = [engine.plan(slide) for slide in slides]
+        elapsed = time.perf_counter() - start
+        overflow = sum(plan.overflow for plan in plans)
+        print(f"{label}: {n_slides} slides in {elapsed * 1000:.1f} ms "
+              f"({elapsed / n_slides * 1e6:.1f} us/slide, {overflow} overflowing)")
+
+    print(layout.cache_info())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Compare embedded and linked images for an image-heavy deck.
+
+Renders a notebook of high-resolution figures (random noise over a gradient, so
+the PNGs barely compress, like photographs or dense heatmaps) once embedding the
+images and once linking them from a sidecar directory, and prints the time to
+build the slides, the time to save the deck, and the size of the deck and of the
+media directory. A fifth of the figures repeat, as when a notebook shows a plot
+again.
+
+Usage: python scripts/bench_linked_media.py [figures] [width]
+"""
+
+import base64
+import io
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from nbformat.v4 import new_code_cell, new_markdown_cell, new_notebook, new_output
+from PIL import Image
+
+from jupdeck.core import linked_media, parser
+from jupdeck.core.renderer import PowerPointRenderer
+
+
+def figure(rng: random.Random, width: int) -> str:
+    height = width * 3 // 4
+    gradient = Image.linear_gradient("L").resize((width, height)).convert("RGB")
+    noise = Image.frombytes("RGB", (width, height), rng.randbytes(width * height * 3))
+    buffer = io.BytesIO()
+    Image.blend(gradient, noise, 0.3).save(buffer, "PNG")
+    return base64.b64encode(buffer.getvalue()).decode("ascii")
+
+
+def notebook(n_figures: int, width: int):
+    rng = random.Random(0)
+    figures = [figure(rng, width) for _ in range(max(1, n_figures * 4 // 5))]
+    cells = []
+    for i in range(n_figures):
+        cells.append(new_markdown_cell(f"# Figure {i}"))
+        cells.append(new_code_cell("plot()", outputs=[new_output(
+            "display_data", data={"image/png": figures[i % len(figures)]})]))
+    return new_notebook(cells=cells)
+
+
+def run(parsed, directory: Path, linked: bool):
+    """(seconds to build, seconds to save, deck bytes, media directory bytes)."""
+    deck = directory / ("linked.pptx" if linked else "embedded.pptx")
+    media_dir = linked_media.media_dir(deck) if linked else None
+    start = time.perf_counter()
+    renderer = PowerPointRenderer(deck, include_attribution=False, linked_media_dir=media_dir)
+    renderer.build_presentation(parsed)
+    built = time.perf_counter()
+    renderer.save()
+    saved = time.perf_counter()
+    media_bytes = sum(path.stat().st_size for path in media_dir.iterdir()) if media_dir else 0
+    return built - start, saved - built, deck.stat().st_size, media_bytes
+
+
+def main() -> None:
+    n_figures = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    width = int(sys.argv[2]) if len(sys.argv) > 2 else 1600
+    parsed = parser.parse_notebook_node(notebook(n_figures, width), "figures.ipynb")
+    print(f"{n_figures} figures, {width} px wide   build s   save s   deck MB  media MB")
+    for linked in (False, True):
+        directory = Path(tempfile.mkdtemp())
+        try:
+            build_s, save_s, deck_bytes, media_bytes = run(parsed, directory, linked)
+        finally:
+            shutil.rmtree(directory)
+        print(f"{'linked' if linked else 'embedded':<30} {build_s:8.3f} {save_s:8.3f} "
+              f"{deck_bytes / 2**20:9.2f} {media_bytes / 2**20:9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+#!/usr/bin/env python
+"""
+Print the per-stage memory of the notebooks in the memory regression suite
+(tests/test_memory.py) next to their budgets.
+
+Run from the repository root: PYTHONPATH=. python scripts/bench_memory.py
+"""
+
+import tempfile
+from pathlib import Path
+
+from tests.test_memory import (
+    BUDGETS_MB,
+    MB,
+    NOTEBOOKS,
+    RELATIVE_BUDGETS,
+    RSS_BUDGET_MB,
+    measure_pipeline,
+    reference_peak,
+    write_sample_notebook,
+)
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        for kind in NOTEBOOKS:
+            path = write_sample_notebook(kind, directory)
+            reference = reference_peak(path)
+            stages, rss = measure_pipeline(path, directory / f"{kind}.pptx")
+            print(f"{kind} notebook ({path.stat().st_size / MB:.1f} MB)")
+            for stage, memory in stages.items():
+                print(f"  {stage:<20} peak {memory.peak_bytes / MB:7.1f} MB "
+                      f"(budget {BUDGETS_MB[kind][stage]:5.1f})  "
+                      f"{memory.peak_bytes / reference:5.2f}x json.loads "
+                      f"(budget {RELATIVE_BUDGETS[kind][stage]:4.2f})  "
+                      f"retained {memory.retained_bytes / MB:7.1f} MB  "
+                      f"{memory.seconds * 1000:8.1f} ms")
+            rss_text = f"{rss / MB:.1f} MB" if rss is not None else "unknown"
+            print(f"  RSS growth {rss_text} (budget {RSS_BUDGET_MB} MB)")
+
+
+if __name__ == "__main__":
+    main()
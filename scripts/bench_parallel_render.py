@@ -0,0 +1,69 @@
+"""Benchmark sequential vs. parallel slide rendering across worker counts.
+
+Usage: python scripts/bench_parallel_render.py [n_slides] [max_workers]
+"""
+
+import base64
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from PIL import Image
+
+from jupdeck.core.models import ImageData, ParsedCell
+from jupdeck.core.renderer import PowerPointRenderer
+
+
+def make_image(seed: int) -> ImageData:
+    rng = random.Random(seed)
+    image = Image.frombytes("RGB", (320, 240), rng.randbytes(320 * 240 * 3))
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return ImageData("image/png", base64.b64encode(buffer.getvalue()).decode("ascii"))
+
+
+def make_slides(n_slides: int):
+    return [
+        ParsedCell(
+            type="markdown",
+            title=f"Slide {i}",
+            bullets=[f"Observation {i}.{j} about the results" for j in range(5)],
+            paragraphs=[f"Speaker note {i}.{j}" for j in range(3)],
+            images=[make_image(i * 2), make_image(i * 2 + 1)],
+            table=[{"metric": f"m{r}", "value": r * i, "delta": r - i} for r in range(8)],
+        )
+        for i in range(n_slides)
+    ]
+
+
+def render(slides, workers: int, output_dir: Path) -> float:
+    start = time.perf_counter()
+    renderer = PowerPointRenderer(output_dir / f"deck_{workers}.pptx", workers=workers)
+    renderer.render_slides(slides)
+    return time.perf_counter() - start
+
+
+def main():
+    n_slides = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1)
+    slides = make_slides(n_slides)
+
+    worker_counts = [1]
+    while worker_counts[-1] * 2 <= max(max_workers, 2):
+        worker_counts.append(worker_counts[-1] * 2)
+
+    print(f"{n_slides} slides, {os.cpu_count()} CPUs")
+    with tempfile.TemporaryDirectory() as tmp:
+        baseline = None
+        for workers in worker_counts:
+            elapsed = render(slides, workers, Path(tmp))
+            baseline = baseline or elapsed
+            print(f"workers={workers:>2}: {elapsed:6.2f} s  speedup x{baseline / elapsed:.2f}")
+
+
+if __name__ == "__main__":
+    main()
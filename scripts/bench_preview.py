@@ -0,0 +1,75 @@
+"""Compare render time of a deck and of its HTML preview from one parse.
+
+The benchmark notebook has one slide per figure: a title, a few bullets and a
+640x480 PNG of noise, which compresses poorly like a dense plot. The notebook
+is parsed once, then rendered as a deck, as an HTML preview, and as both
+through ``render_with_backends``.
+
+Usage: python scripts/bench_preview.py [slides]
+"""
+
+import base64
+import io
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import nbformat
+from nbformat.v4 import new_code_cell, new_markdown_cell, new_notebook, new_output
+from PIL import Image
+
+from jupdeck.core import parser
+from jupdeck.core.preview import HtmlPreviewRenderer
+from jupdeck.core.renderer import PowerPointRenderer, render_with_backends
+
+
+def figure_png(seed: int) -> str:
+    image = Image.effect_noise((640, 480), 32 + seed % 32).convert("RGB")
+    buffer = io.BytesIO()
+    image.save(buffer, "PNG")
+    return base64.b64encode(buffer.getvalue()).decode("ascii")
+
+
+def write_notebook(path: Path, n_slides: int) -> None:
+    cells = []
+    for i in range(n_slides):
+        cells += [
+            new_markdown_cell(f"# Figure {i}\n- what it shows\n- why it matters"),
+            new_code_cell("plot()", outputs=[
+                new_output("display_data", data={"image/png": figure_png(i)})]),
+        ]
+    with path.open("w", encoding="utf-8") as f:
+        nbformat.write(new_notebook(cells=cells), f)
+
+
+def timed(render) -> float:
+    start = time.perf_counter()
+    render()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    n_slides = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        write_notebook(directory / "nb.ipynb", n_slides)
+        parse_seconds = timed(lambda: parser.parse_notebook(directory / "nb.ipynb"))
+        parsed = parser.parse_notebook(directory / "nb.ipynb")
+        results = {
+            "deck": timed(lambda: PowerPointRenderer(
+                directory / "deck.pptx").render_presentation(parsed)),
+            "preview": timed(lambda: HtmlPreviewRenderer(
+                directory / "deck.html").render_presentation(parsed)),
+            "deck + preview": timed(lambda: render_with_backends(parsed, [
+                PowerPointRenderer(directory / "both.pptx"),
+                HtmlPreviewRenderer(directory / "both.html")])),
+        }
+    print(f"{n_slides} slides, parsed once in {parse_seconds * 1000:.0f} ms")
+    print("backend            render ms")
+    for name, seconds in results.items():
+        print(f"{name:<16} {seconds * 1000:11.0f}")
+
+
+if __name__ == "__main__":
+    main()
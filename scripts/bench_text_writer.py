@@ -0,0 +1,77 @@
+"""Benchmark the bulk text-frame writer against per-paragraph python-pptx calls.
+
+Writes the bullets and speaker notes of decks with thousands of paragraphs
+both ways and checks that the resulting XML is identical.
+
+Usage: python scripts/bench_text_writer.py [n_slides] [paragraphs_per_slide]
+"""
+
+import sys
+import time
+
+from lxml import etree
+from pptx import Presentation
+from pptx.util import Pt
+
+from jupdeck.core.textframe import ParagraphStyle, write_paragraphs
+
+
+def make_texts(n_slides: int, per_slide: int):
+    return [[f"Observation {i}.{j}: the metric rose by {j * 3}% & stayed <stable>"
+             for j in range(per_slide)] for i in range(n_slides)]
+
+
+def make_frames(n_slides: int):
+    prs = Presentation()
+    frames = []
+    for _ in range(n_slides):
+        slide = prs.slides.add_slide(prs.slide_layouts[1])
+        frames.append((slide.placeholders[1].text_frame, slide.notes_slide.notes_text_frame))
+    return frames
+
+
+def per_paragraph(frames, texts) -> None:
+    for (bullets, notes), slide_texts in zip(frames, texts):
+        for i, text in enumerate(slide_texts):
+            p = bullets.paragraphs[0] if i == 0 else bullets.add_paragraph()
+            p.text = text
+            p.level = 0
+            p.font.size = Pt(18)
+            p.space_after = Pt(6)
+            p.space_before = Pt(2)
+        for text in slide_texts:
+            notes.add_paragraph().text = text
+
+
+def bulk(frames, texts) -> None:
+    style = ParagraphStyle(font_size=18, space_before=2, space_after=6)
+    for (bullets, notes), slide_texts in zip(frames, texts):
+        write_paragraphs(bullets._txBody, slide_texts, style)
+        write_paragraphs(notes._txBody, slide_texts, append=True)
+
+
+def run(label: str, writer, texts):
+    frames = make_frames(len(texts))
+    start = time.perf_counter()
+    writer(frames, texts)
+    elapsed = time.perf_counter() - start
+    n_paragraphs = 2 * sum(len(t) for t in texts)
+    print(f"{label:<14} {elapsed * 1000:8.1f} ms  "
+          f"{n_paragraphs / elapsed:10.0f} paragraphs/s")
+    return [etree.tostring(f._txBody) for frame in frames for f in frame]
+
+
+def main():
+    n_slides = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    per_slide = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    texts = make_texts(n_slides, per_slide)
+    print(f"{n_slides} slides x {per_slide} bullets and {per_slide} notes paragraphs")
+
+    expected = run("per-paragraph", per_paragraph, texts)
+    actual = run("bulk", bulk, texts)
+    assert actual == expected, "bulk writer output differs"
+    print("identical XML")
+
+
+if __name__ == "__main__":
+    main()
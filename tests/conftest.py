@@ -0,0 +1,29 @@
+import nbformat
+import pytest
+from nbformat.v4 import new_notebook
+
+# A 1x1 grayscale PNG, base64-encoded as in a notebook output
+MINIMAL_PNG = (
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAAAAAA6fptVAAAACklEQVR4nGNgYA"
+    "AAAAMAAWgmWQ0AAAAASUVORK5CYII="
+)
+
+
+@pytest.fixture
+def minimal_png() -> str:
+    return MINIMAL_PNG
+
+
+@pytest.fixture
+def write_notebook(tmp_path):
+    """Write a list of cells (or a whole notebook) to ``tmp_path`` and return the path."""
+    def _write(cells, filename: str = "nb.ipynb"):
+        path = tmp_path / filename
+        path.parent.mkdir(parents=True, exist_ok=True)
+        notebook = cells if isinstance(cells, nbformat.NotebookNode) else \
+            new_notebook(cells=list(cells))
+        with path.open("w", encoding="utf-8") as f:
+            nbformat.write(notebook, f)
+        return path
+
+    return _write
@@ -0,0 +1,131 @@
+import asyncio
+import subprocess
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+from nbformat.v4 import new_markdown_cell
+from pptx import Presentation
+
+import jupdeck
+from jupdeck.core import aio
+
+
+@pytest.fixture
+def notebooks(write_notebook):
+    return [write_notebook([new_markdown_cell(f"# {name.title()}\n\n- a point")],
+                           f"{name}.ipynb")
+            for name in ("one", "two", "three")]
+
+
+def test_package_import_is_lightweight():
+    code = ("import sys, jupdeck; "
+            "print(sorted({'pandas', 'pptx', 'jupdeck.core.aio'} & set(sys.modules)))")
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                            check=True)
+    assert result.stdout.strip() == "[]"
+    assert jupdeck.AsyncConverter is aio.AsyncConverter
+
+
+def test_aconvert_writes_deck(tmp_path, notebooks):
+    output = tmp_path / "one.pptx"
+    result = asyncio.run(jupdeck.aconvert(notebooks[0], output))
+
+    prs = Presentation(output)
+    assert prs.slides[0].shapes.title.text == "One"
+    assert result.slides == len(prs.slides) == 2  # content + attribution
+    assert result.output_path == output
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_convert_many_in_process_pool(tmp_path, notebooks):
+    jobs = [(path, tmp_path / f"{path.stem}.pptx") for path in notebooks]
+
+    async def run():
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            converter = aio.AsyncConverter(max_concurrency=2, executor=executor,
+                                           include_attribution=False)
+            return await converter.convert_many(jobs)
+
+    results = asyncio.run(run())
+    assert [r.output_path for r in results] == [output for _, output in jobs]
+    assert [Presentation(output).slides[0].shapes.title.text for _, output in jobs] == \
+        ["One", "Two", "Three"]
+
+
+def test_semaphore_limits_concurrency(tmp_path, notebooks, monkeypatch):
+    running, peak = 0, 0
+    lock = threading.Lock()
+    parse_stage = aio.parse_stage
+
+    def tracked_parse(*args):
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        threading.Event().wait(0.05)
+        with lock:
+            running -= 1
+        return parse_stage(*args)
+
+    monkeypatch.setattr(aio, "parse_stage", tracked_parse)
+
+    async def run():
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            converter = aio.AsyncConverter(max_concurrency=1, executor=executor)
+            await converter.convert_many(
+                [(path, tmp_path / f"{path.stem}.pptx") for path in notebooks])
+
+    asyncio.run(run())
+    assert peak == 1
+
+
+def test_cancel_discards_output(tmp_path, notebooks, monkeypatch):
+    started, release = threading.Event(), threading.Event()
+    parse_stage = aio.parse_stage
+
+    def blocking_parse(*args):
+        started.set()
+        release.wait(5)
+        return parse_stage(*args)
+
+    monkeypatch.setattr(aio, "parse_stage", blocking_parse)
+    output = tmp_path / "cancelled.pptx"
+
+    async def run():
+        task = asyncio.create_task(jupdeck.aconvert(notebooks[0], output))
+        await asyncio.to_thread(started.wait, 5)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        release.set()
+
+    asyncio.run(run())
+    assert not output.exists()
+
+
+def test_failures_returned_in_order(tmp_path, notebooks):
+    jobs = [(notebooks[0], tmp_path / "ok.pptx"), (tmp_path / "missing.ipynb", tmp_path / "x.pptx")]
+
+    async def run():
+        return await aio.AsyncConverter().convert_many(jobs, return_exceptions=True)
+
+    ok, failed = asyncio.run(run())
+    assert ok.slides == 2
+    assert isinstance(failed, FileNotFoundError)
+
+
+def test_a_failure_cancels_the_other_conversions(tmp_path, notebooks):
+    jobs = [(tmp_path / "missing.ipynb", tmp_path / "x.pptx"),
+            *((path, tmp_path / f"{path.stem}.pptx") for path in notebooks)]
+
+    async def run():
+        converter = aio.AsyncConverter(max_concurrency=1)
+        with pytest.raises(FileNotFoundError):
+            await converter.convert_many(jobs)
+        assert asyncio.all_tasks() == {asyncio.current_task()}  # the others have stopped
+        await asyncio.sleep(0.2)
+
+    asyncio.run(run())
+    assert not list(tmp_path.glob("*.pptx"))
@@ -0,0 +1,84 @@
+import base64
+import io
+
+import pytest
+from lxml import etree
+from PIL import Image
+from pptx import Presentation
+from pptx.enum.shapes import MSO_SHAPE_TYPE
+
+from jupdeck.core import assembly
+from jupdeck.core.models import ImageData, ParsedCell
+from jupdeck.core.renderer import PowerPointRenderer
+
+
+def _png(color) -> str:
+    buffer = io.BytesIO()
+    Image.new("RGB", (4, 3), color).save(buffer, format="PNG")
+    return base64.b64encode(buffer.getvalue()).decode("ascii")
+
+
+@pytest.fixture
+def parsed_notebook():
+    red, blue = _png("red"), _png("blue")
+    cells = []
+    for i in range(9):
+        cells.append(ParsedCell(type="markdown", title=f"Slide {i}",
+                                bullets=[f"Point {i}.{j}" for j in range(i % 4)],
+                                paragraphs=[f"Note for slide {i}"] if i % 2 else []))
+        cells.append(ParsedCell(type="code",
+                                images=[ImageData("image/png", red if i % 3 else blue)],
+                                table=[{"a": n, "b": n * i} for n in range(3 + 4 * (i % 4))]))
+    return {"metadata": {}, "cells": cells}
+
+
+def _render(tmp_path, parsed_notebook, name, workers):
+    output = tmp_path / name / "deck.pptx"
+    output.parent.mkdir()
+    renderer = PowerPointRenderer(output, workers=workers)
+    renderer.render_presentation(parsed_notebook)
+    return output, renderer
+
+
+def _describe(path):
+    prs = Presentation(path)
+    slides = []
+    for slide in prs.slides:
+        pictures = [shape.image.sha1 for shape in slide.shapes
+                    if shape.shape_type == MSO_SHAPE_TYPE.PICTURE]
+        notes = slide.notes_slide.notes_text_frame.text if slide.has_notes_slide else None
+        slides.append((slide.slide_id, slide.slide_layout.name,
+                       etree.tostring(slide.shapes._spTree), pictures, notes))
+    return slides
+
+
+def test_parallel_output_matches_sequential(tmp_path, parsed_notebook):
+    sequential, _ = _render(tmp_path, parsed_notebook, "sequential", workers=1)
+    parallel, _ = _render(tmp_path, parsed_notebook, "parallel", workers=2)
+
+    assert _describe(parallel) == _describe(sequential)
+    exported = sorted(path.name for path in sequential.parent.glob("*.xlsx"))
+    assert exported
+    assert sorted(path.name for path in parallel.parent.glob("*.xlsx")) == exported
+
+
+def test_parallel_output_stores_each_image_once(tmp_path, parsed_notebook):
+    parallel, _ = _render(tmp_path, parsed_notebook, "parallel", workers=3)
+    prs = Presentation(parallel)
+    image_parts = {part.partname for part in prs.part.package.iter_parts()
+                   if part.partname.startswith("/ppt/media/")}
+    assert len(image_parts) == 2
+
+
+def test_parallel_render_reports_overflow(tmp_path):
+    cells = [ParsedCell(type="markdown", title=f"S{i}",
+                        bullets=["many words in a bullet " * 10] * (40 if i == 2 else 1))
+             for i in range(4)]
+    renderer = PowerPointRenderer(workers=2)
+    renderer.render_slides(cells)
+    assert renderer.overflowing_slides == [3]
+
+
+def test_chunk_keeps_order():
+    assert assembly.chunk(list(range(7)), 3) == [[0, 1, 2], [3, 4, 5], [6]]
+    assert assembly.chunk([1], 4) == [[1]]
@@ -0,0 +1,145 @@
+import io
+import sys
+from unittest import mock
+
+import pytest
+from nbformat.v4 import new_code_cell, new_markdown_cell, new_output
+from PIL import Image
+from pptx import Presentation
+from pptx.enum.shapes import MSO_SHAPE_TYPE
+
+from jupdeck import cli
+from jupdeck.core import budget, media, parser
+from jupdeck.core.budget import Budget, BudgetTracker
+from jupdeck.core.models import ImageData, ParsedCell
+from jupdeck.core.renderer import PowerPointRenderer
+
+
+def _html_table(n_rows: int) -> str:
+    rows = "".join(f"<tr><td>{i}</td></tr>" for i in range(n_rows))
+    return f"<table><thead><tr><th>a</th></tr></thead><tbody>{rows}</tbody></table>"
+
+
+def _table_cell(n_rows: int):
+    return new_code_cell("df", outputs=[new_output(
+        "execute_result", data={"text/html": _html_table(n_rows)}, execution_count=1)])
+
+
+class TestHelpers:
+    def test_truncate_html_table_keeps_header(self):
+        html = budget.truncate_html_table(_html_table(50), 3)
+        assert budget.count_table_rows(html) == 3
+        assert "<th>a</th>" in html
+        assert html.endswith("</tbody></table>")
+
+    def test_truncate_table_without_tbody(self):
+        html = "<table><tr><th>a</th></tr>" + "<tr><td>1</td></tr>" * 5 + "</table>"
+        assert budget.count_table_rows(html) == 5
+        assert budget.count_table_rows(budget.truncate_html_table(html, 2)) == 2
+
+    def test_unlimited_budget(self):
+        assert Budget().is_unlimited
+        assert not Budget(max_table_rows=5).is_unlimited
+
+
+def test_table_rows_truncated_before_parsing(write_notebook):
+    path = write_notebook([_table_cell(500)])
+    parsed = parser.parse_notebook(path, budget=Budget(max_table_rows=20))
+
+    assert len(parsed["cells"][0].table) == 20
+    [decision] = parsed["budget_decisions"]
+    assert (decision.limit, decision.action, decision.cell_index) == ("table_rows", "truncated", 0)
+    assert decision.source == "nb.ipynb"
+
+
+def test_output_budget_replaces_outputs(write_notebook):
+    big_stream = new_output("stream", name="stdout", text="x" * 1000)
+    path = write_notebook([
+        new_code_cell("print()", outputs=[big_stream]),
+        new_code_cell("print()", outputs=[big_stream]),
+    ])
+    parsed = parser.parse_notebook(path, budget=Budget(max_output_bytes=1500))
+
+    assert parsed["cells"][0].bullets == []
+    assert "output budget" in parsed["cells"][1].bullets[0]
+    assert [d.cell_index for d in parsed["budget_decisions"]] == [1]
+
+
+def test_wall_time_skips_remaining_cells(write_notebook):
+    path = write_notebook([new_markdown_cell(f"# Slide {i}") for i in range(5)])
+    with mock.patch("jupdeck.core.budget.time.monotonic", side_effect=[0, 0, 0, 10]):
+        parsed = parser.parse_notebook(path, budget=Budget(max_seconds=1))
+
+    titles = [cell.title for cell in parsed["cells"]]
+    assert titles[:2] == ["Slide 0", "Slide 1"]
+    assert len(parsed["cells"]) == 3
+    assert "Time budget exceeded" in parsed["cells"][2].bullets[0]
+    assert parsed["budget_decisions"][0].limit == "wall_time"
+
+
+def test_no_budget_leaves_output_unchanged(write_notebook):
+    path = write_notebook([_table_cell(30)])
+    parsed = parser.parse_notebook(path)
+    assert "budget_decisions" not in parsed
+    assert len(parsed["cells"][0].table) == 30
+
+
+def test_image_budget_applies_across_deck(tmp_path, minimal_png):
+    size = budget.image_size(ImageData("image/png", minimal_png))
+    cells = [ParsedCell(type="markdown", title=f"Slide {i}",
+                        images=[ImageData("image/png", minimal_png)]) for i in range(3)]
+    output = tmp_path / "deck.pptx"
+    renderer = PowerPointRenderer(output_path=output, include_attribution=False,
+                                  budget=Budget(max_image_bytes=2 * size))
+    renderer.render_presentation({"cells": cells})
+
+    prs = Presentation(output)
+    pictures = [[shape for shape in slide.shapes if shape.shape_type == MSO_SHAPE_TYPE.PICTURE]
+                for slide in prs.slides]
+    assert [len(p) for p in pictures] == [1, 1, 0]
+    assert [d.limit for d in renderer.budget_tracker.decisions] == ["image_bytes"]
+    assert cells[2].images  # the caller's cells are not modified
+
+
+def test_image_budget_counts_converted_figures(tmp_path, monkeypatch):
+    buffer = io.BytesIO()
+    Image.effect_noise((100, 100), 64).convert("RGB").save(buffer, "PNG")
+    png = buffer.getvalue()  # far larger than the svg it stands for
+    monkeypatch.setenv("JUPDECK_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setitem(media.CONVERTERS, "image/svg+xml", lambda source: png)
+    svg = ImageData("image/svg+xml", blob=b'<svg xmlns="http://www.w3.org/2000/svg"/>')
+    cells = [ParsedCell(type="markdown", title=f"Slide {i}", images=[svg]) for i in range(2)]
+
+    output = tmp_path / "deck.pptx"
+    renderer = PowerPointRenderer(output_path=output, include_attribution=False,
+                                  budget=Budget(max_image_bytes=len(png) * 3 // 2))
+    renderer.render_presentation({"cells": cells})
+
+    pictures = [[shape for shape in slide.shapes if shape.shape_type == MSO_SHAPE_TYPE.PICTURE]
+                for slide in Presentation(output).slides]
+    assert [len(p) for p in pictures] == [1, 0]
+    assert renderer.budget_tracker.image_bytes == len(png)
+
+
+def test_format_report():
+    tracker = BudgetTracker(Budget(max_table_rows=1), source="nb.ipynb")
+    tracker.limit_table_html(_html_table(3), cell_index=4)
+    report = budget.format_report(tracker.decisions)
+    assert "1 budget decision(s)" in report
+    assert "nb.ipynb: cell 4: table_rows truncated" in report
+    assert budget.format_report([]) == "No budget limits were hit."
+
+
+def test_cli_fail_on_budget(write_notebook, tmp_path, monkeypatch, capsys):
+    path = write_notebook([_table_cell(50)])
+    output = tmp_path / "deck.pptx"
+    monkeypatch.setattr(sys, "argv", [
+        "jupdeck", "convert", str(path), str(output),
+        "--max-table-rows", "10", "--budget-report", "--fail-on-budget",
+    ])
+    with pytest.raises(SystemExit) as excinfo:
+        cli.main()
+
+    assert excinfo.value.code == cli.EXIT_BUDGET_EXCEEDED
+    assert output.exists()
+    assert "table_rows truncated" in capsys.readouterr().out
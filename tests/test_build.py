@@ -0,0 +1,100 @@
+import json
+import os
+import sys
+
+import pytest
+from nbformat.v4 import new_markdown_cell
+
+from jupdeck import cli
+from jupdeck.core import build
+
+OPTIONS = {"include_speaker_notes": True, "include_attribution": True, "budget": None}
+
+
+@pytest.fixture
+def make_notebook(write_notebook):
+    def _make(name: str, title: str):
+        return write_notebook([new_markdown_cell(f"# {title}")], f"{name}.ipynb")
+
+    return _make
+
+
+def _recorded(tmp_path, notebook, options=OPTIONS):
+    output = tmp_path / "out.pptx"
+    output.write_bytes(b"deck")
+    manifest = build.BuildManifest(tmp_path)
+    manifest.record(notebook, output, options)
+    manifest.save()
+    return output
+
+
+class TestBuildManifest:
+    def test_up_to_date_after_record(self, tmp_path, make_notebook):
+        notebook = make_notebook("a", "A")
+        output = _recorded(tmp_path, notebook)
+        assert build.BuildManifest(tmp_path).is_up_to_date(notebook, output, OPTIONS)
+
+    def test_changed_input(self, tmp_path, make_notebook):
+        notebook = make_notebook("a", "A")
+        output = _recorded(tmp_path, notebook)
+        make_notebook("a", "Changed title")
+        assert not build.BuildManifest(tmp_path).is_up_to_date(notebook, output, OPTIONS)
+
+    def test_touched_but_unchanged_input(self, tmp_path, make_notebook):
+        notebook = make_notebook("a", "A")
+        output = _recorded(tmp_path, notebook)
+        stat = notebook.stat()
+        os.utime(notebook, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        assert build.BuildManifest(tmp_path).is_up_to_date(notebook, output, OPTIONS)
+
+    def test_changed_options_version_or_missing_output(self, tmp_path, make_notebook,
+                                                       monkeypatch):
+        notebook = make_notebook("a", "A")
+        output = _recorded(tmp_path, notebook)
+        manifest = build.BuildManifest(tmp_path)
+        assert not manifest.is_up_to_date(notebook, output, {**OPTIONS, "budget": {"x": 1}})
+
+        monkeypatch.setattr(build, "jupdeck_version", lambda: "99.0")
+        assert not manifest.is_up_to_date(notebook, output, OPTIONS)
+        monkeypatch.undo()
+
+        output.unlink()
+        assert not manifest.is_up_to_date(notebook, output, OPTIONS)
+
+    def test_corrupt_manifest_rebuilds(self, tmp_path, make_notebook):
+        notebook = make_notebook("a", "A")
+        output = _recorded(tmp_path, notebook)
+        (tmp_path / build.MANIFEST_NAME).write_text("{not json")
+        assert not build.BuildManifest(tmp_path).is_up_to_date(notebook, output, OPTIONS)
+
+
+def _run(monkeypatch, capsys, *argv):
+    monkeypatch.setattr(sys, "argv", ["jupdeck", *argv])
+    cli.main()
+    return capsys.readouterr().out
+
+
+def test_batch_skips_unchanged(tmp_path, make_notebook, monkeypatch, capsys):
+    notebooks = [make_notebook("a", "A"), make_notebook("b", "B")]
+    out_dir = tmp_path / "decks"
+    args = ["batch", *map(str, notebooks), "-o", str(out_dir)]
+
+    assert "Built 2, skipped 0" in _run(monkeypatch, capsys, *args)
+    assert "Built 0, skipped 2" in _run(monkeypatch, capsys, *args)
+
+    make_notebook("b", "B changed")
+    assert "Built 1, skipped 1" in _run(monkeypatch, capsys, *args)
+    assert "Built 2, skipped 0" in _run(monkeypatch, capsys, *args, "--no-attribution")
+    assert "Built 2, skipped 0" in _run(monkeypatch, capsys, *args, "--no-attribution",
+                                        "--force")
+
+    recorded = json.loads((out_dir / build.MANIFEST_NAME).read_text())["outputs"]
+    assert sorted(recorded) == ["a.pptx", "b.pptx"]
+    assert recorded["a.pptx"]["options"]["include_attribution"] is False
+
+
+def test_convert_skips_unchanged(tmp_path, make_notebook, monkeypatch, capsys):
+    notebook = make_notebook("a", "A")
+    output = tmp_path / "a.pptx"
+    assert "Report generated" in _run(monkeypatch, capsys, "convert", str(notebook), str(output))
+    assert "Up to date" in _run(monkeypatch, capsys, "convert", str(notebook), str(output))
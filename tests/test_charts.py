@@ -0,0 +1,134 @@
+import math
+
+import pytest
+from nbformat.v4 import new_code_cell, new_markdown_cell, new_output
+from pptx import Presentation
+from pptx.enum.chart import XL_CHART_TYPE
+
+from jupdeck.core import charts, inspector, parser
+from jupdeck.core.renderer import PowerPointRenderer
+from jupdeck.core.slide_cache import SlideCache
+
+
+def _html_table(header, rows):
+    head = "".join(f"<th>{name}</th>" for name in header)
+    body = "".join("<tr>" + "".join(f"<td>{value}</td>" for value in row) + "</tr>"
+                   for row in rows)
+    return f"<table><tr>{head}</tr>{body}</table>"
+
+
+SALES = _html_table(["month", "north", "south"], [["Jan", 10, 7], ["Feb", 12, 9.5]])
+
+
+@pytest.fixture
+def table_cell(minimal_png):
+    def _make(html, tags=()):
+        cell = new_code_cell("df.plot()", outputs=[
+            new_output("execute_result", data={"text/html": html}),
+            new_output("display_data", data={"image/png": minimal_png}),
+        ])
+        cell.metadata["tags"] = list(tags)
+        return cell
+
+    return _make
+
+
+@pytest.fixture
+def render(tmp_path, write_notebook):
+    def _render(cells, **options):
+        parsed = parser.parse_notebook(write_notebook(cells))
+        deck = tmp_path / "deck.pptx"
+        PowerPointRenderer(deck, include_attribution=False, **options).render_presentation(parsed)
+        return parsed, deck
+
+    return _render
+
+
+def _shapes(slide):
+    return {
+        "charts": [shape.chart for shape in slide.shapes if shape.has_chart],
+        "tables": sum(1 for shape in slide.shapes if shape.has_table),
+        "pictures": sum(1 for shape in slide.shapes if shape.shape_type == 13),
+    }
+
+
+def test_chart_spec_uses_label_column_and_numeric_series():
+    table = [{"month": "Jan", "north": 10, "south": 7.0},
+             {"month": "Feb", "north": 12, "south": math.nan}]
+    spec = charts.chart_spec(table)
+    assert spec.kind == "column"
+    assert spec.categories == ["Jan", "Feb"]
+    assert spec.series == {"north": [10.0, 12.0], "south": [7.0, None]}
+
+
+def test_chart_spec_treats_pandas_index_as_labels_and_picks_line_for_long_tables():
+    table = [{"Unnamed: 0": i, "value": i * i} for i in range(20)]
+    spec = charts.chart_spec(table)
+    assert (spec.kind, spec.categories[:3], list(spec.series)) == ("line", [0, 1, 2], ["value"])
+    assert charts.chart_spec(table, "pie").kind == "pie"
+
+
+@pytest.mark.parametrize("table", [
+    None,
+    [{"name": "a", "city": "b"}],  # no numeric column
+    [{"name": "a", "value": 1, "note": "x"}],  # text after the label column
+    [{"value": i} for i in range(charts.MAX_POINTS + 1)],
+])
+def test_tables_that_cannot_be_charted(table):
+    assert charts.chart_spec(table) is None
+
+
+def test_chart_directive_from_tags_metadata_and_comments():
+    cell = new_code_cell("x", metadata={"tags": ["jupdeck-chart-line"]})
+    assert parser.directives.read_directives(cell).chart == "line"
+    cell = new_code_cell("x", metadata={"jupdeck": {"chart": "bar"}})
+    assert parser.directives.read_directives(cell).chart == "bar"
+    cell = new_markdown_cell("<!-- jupdeck: chart -->\n# Sales")
+    assert parser.directives.read_directives(cell).chart == "auto"
+
+
+def test_tagged_table_becomes_chart_in_place_of_table_and_plot(table_cell, render):
+    parsed, deck = render([new_markdown_cell("# Sales"),
+                                      table_cell(SALES, ["jupdeck-chart-line"])])
+
+    shapes = _shapes(Presentation(deck).slides[0])
+    assert (shapes["tables"], shapes["pictures"]) == (0, 0)
+    chart = shapes["charts"][0]
+    assert chart.chart_type == XL_CHART_TYPE.LINE_MARKERS
+    assert [series.name for series in chart.plots[0].series] == ["north", "south"]
+    assert list(chart.plots[0].categories) == ["Jan", "Feb"]
+    assert inspector.compare_with_notebook(inspector.inspect_deck(deck), parsed) == []
+
+
+def test_chart_modes(table_cell, render):
+    cells = [new_markdown_cell("# Sales"), table_cell(SALES)]
+    _, deck = render(cells)  # untagged: a table, as before
+    assert _shapes(Presentation(deck).slides[0])["tables"] == 1
+
+    _, deck = render(cells, charts="auto")
+    shapes = _shapes(Presentation(deck).slides[0])
+    assert (len(shapes["charts"]), shapes["tables"], shapes["pictures"]) == (1, 0, 1)
+
+    cells[1].metadata["tags"] = ["jupdeck-chart"]
+    _, deck = render(cells, charts="off")
+    assert _shapes(Presentation(deck).slides[0])["tables"] == 1
+
+
+def test_charts_rendered_in_worker_processes(table_cell, render):
+    cells = []
+    for i in range(3):
+        cells += [new_markdown_cell(f"# Sales {i}"), table_cell(SALES, ["jupdeck-chart"])]
+    _, deck = render(cells, workers=2)
+    assert all(len(_shapes(slide)["charts"]) == 1 for slide in Presentation(deck).slides)
+
+
+def test_charts_copied_from_the_slide_cache(tmp_path, table_cell, render):
+    cells = [new_markdown_cell("# Sales"), table_cell(SALES, ["jupdeck-chart-bar"])]
+    cache = SlideCache(tmp_path / "cache")
+    render(cells, slide_cache=cache)
+    _, deck = render(cells, slide_cache=cache)
+
+    assert cache.hits == 1
+    chart = _shapes(Presentation(deck).slides[0])["charts"][0]
+    assert chart.chart_type == XL_CHART_TYPE.BAR_CLUSTERED
+    assert chart.part.chart_workbook.xlsx_part is not None
@@ -0,0 +1,115 @@
+import json
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+from nbformat.v4 import new_code_cell, new_markdown_cell, new_output
+from pptx import Presentation
+from pptx.enum.shapes import MSO_SHAPE_TYPE
+
+from jupdeck import cli
+from jupdeck.core import assembly, combine
+
+
+@pytest.fixture
+def notebooks(write_notebook, minimal_png):
+    return [
+        write_notebook([
+            new_markdown_cell(f"# {name.title()}\n\n- first point"),
+            new_code_cell("plot()", outputs=[
+                new_output("display_data", data={"image/png": minimal_png})]),
+        ], f"{name}.ipynb")
+        for name in ("sales", "costs", "outlook")
+    ]
+
+
+def _titles(prs):
+    return [slide.shapes.title.text if slide.shapes.title else None for slide in prs.slides]
+
+
+class TestManifest:
+    def test_text_manifest(self, tmp_path):
+        manifest = tmp_path / "weekly.txt"
+        manifest.write_text("# weekly review\nsales.ipynb | Sales\n\ncosts.ipynb\n")
+        entries = combine.read_manifest(manifest)
+        assert entries == [
+            combine.ManifestEntry(tmp_path / "sales.ipynb", "Sales"),
+            combine.ManifestEntry(tmp_path / "costs.ipynb"),
+        ]
+
+    def test_json_manifest(self, tmp_path):
+        manifest = tmp_path / "weekly.json"
+        manifest.write_text(json.dumps(
+            {"notebooks": ["a.ipynb", {"path": "b.ipynb", "section": "Bee"}]}))
+        entries = combine.read_manifest(manifest)
+        assert [entry.path.name for entry in entries] == ["a.ipynb", "b.ipynb"]
+        assert entries[1].section == "Bee"
+
+
+def test_combine_orders_notebooks_and_adds_dividers(tmp_path, notebooks):
+    entries = [combine.ManifestEntry(path) for path in reversed(notebooks)]
+    entries[0].section = "Looking ahead"
+    output = tmp_path / "combined.pptx"
+
+    combine.combine_notebooks(entries, output, section_dividers=True, workers=2)
+
+    prs = Presentation(output)
+    titles = _titles(prs)
+    assert titles[:6] == ["Looking ahead", "Outlook", "costs", "Costs", "sales", "Sales"]
+    assert len(prs.slides) == 7  # 3 dividers + 3 content slides + 1 attribution
+
+
+def test_combine_reuses_one_process_pool(tmp_path, write_notebook, monkeypatch):
+    started = []
+
+    class CountingPool(ProcessPoolExecutor):
+        def __init__(self, *args, **kwargs):
+            started.append(kwargs.get("max_workers"))
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(combine, "ProcessPoolExecutor", CountingPool)
+    monkeypatch.setattr(assembly, "ProcessPoolExecutor", CountingPool)
+    # two slides each, so both notebooks are rendered by workers
+    paths = [write_notebook([new_markdown_cell(f"# {name} {i}") for i in range(2)],
+                            f"{name}.ipynb")
+             for name in ("first", "second")]
+    output = tmp_path / "combined.pptx"
+
+    combine.combine_notebooks([combine.ManifestEntry(p) for p in paths], output, workers=2)
+
+    assert started == [2]
+    assert _titles(Presentation(output))[:4] == ["first 0", "first 1", "second 0", "second 1"]
+
+
+def test_combine_shares_images_and_attribution(tmp_path, notebooks):
+    output = tmp_path / "combined.pptx"
+    combine.combine_notebooks([combine.ManifestEntry(p) for p in notebooks], output, workers=1)
+
+    prs = Presentation(output)
+    pictures = [shape for slide in prs.slides for shape in slide.shapes
+                if shape.shape_type == MSO_SHAPE_TYPE.PICTURE]
+    assert len(pictures) == 3
+    assert len({picture.image.sha1 for picture in pictures}) == 1
+    image_parts = {picture.part.related_part(picture._pic.blipFill.blip.rEmbed).partname
+                   for picture in pictures}
+    assert len(image_parts) == 1
+
+    texts = [" ".join(shape.text for shape in slide.shapes if shape.has_text_frame)
+             for slide in prs.slides]
+    attribution = [text for text in texts if "automatically created" in text]
+    assert len(attribution) == 1
+    assert "sales.ipynb, costs.ipynb and outlook.ipynb" in attribution[0]
+
+
+def test_cli_combine_with_manifest(tmp_path, notebooks, monkeypatch):
+    manifest = tmp_path / "manifest.txt"
+    manifest.write_text("costs.ipynb\nsales.ipynb\n")
+    output = tmp_path / "combined.pptx"
+
+    monkeypatch.setattr(sys, "argv", [
+        "jupdeck", "combine", "--manifest", str(manifest), "-o", str(output),
+        "--no-attribution", "-j", "1",
+    ])
+    cli.main()
+
+    assert _titles(Presentation(output)) == ["Costs", "Sales"]
@@ -0,0 +1,149 @@
+from unittest import mock
+
+import pytest
+from nbformat.v4 import new_code_cell, new_markdown_cell, new_output
+
+from jupdeck.core import directives, parser
+from jupdeck.core.models import ParsedCell
+from jupdeck.core.renderer import PowerPointRenderer
+
+HTML_TABLE = "<table><tr><th>a</th></tr><tr><td>1</td></tr></table>"
+
+
+@pytest.fixture
+def table_and_image_cell(minimal_png):
+    def _make(**metadata):
+        return new_code_cell(
+            source="df.head()",
+            metadata=metadata,
+            outputs=[new_output(
+                "execute_result",
+                data={"text/html": HTML_TABLE, "image/png": minimal_png},
+                execution_count=1,
+            )],
+        )
+
+    return _make
+
+
+class TestReadDirectives:
+    def test_comment_directives(self):
+        cell = new_markdown_cell("<!-- jupdeck: new-slide, hide-images -->\n# Title")
+        result = directives.read_directives(cell)
+        assert result.new_slide
+        assert result.hide_images
+        assert not result.hide
+
+    def test_tag_directives(self):
+        cell = new_code_cell("x = 1", metadata={"tags": ["jupdeck-hide-tables", "other"]})
+        result = directives.read_directives(cell)
+        assert result.hide_tables
+        assert not result.hide_images
+
+    def test_metadata_directives(self):
+        cell = new_code_cell("x = 1", metadata={"jupdeck": {"hide": True}})
+        assert directives.read_directives(cell).hide
+
+    def test_slideshow_skip(self):
+        cell = new_markdown_cell("# Hidden", metadata={"slideshow": {"slide_type": "skip"}})
+        assert directives.read_directives(cell).hide
+
+    def test_non_dict_metadata_is_ignored(self):
+        cell = new_code_cell("x = 1", metadata={"jupdeck": "hide", "slideshow": "skip"})
+        assert directives.read_directives(cell) == directives.CellDirectives()
+
+    def test_unknown_directives_are_ignored(self):
+        cell = new_markdown_cell("<!-- jupdeck: sparkle -->\n# Title")
+        assert directives.read_directives(cell) == directives.CellDirectives()
+
+
+class TestFilterOutputs:
+    def test_hide_tables_keeps_images(self, table_and_image_cell):
+        cell = table_and_image_cell(tags=["jupdeck-hide-tables"])
+        filtered = directives.filter_outputs(cell, directives.read_directives(cell))
+        assert list(filtered["outputs"][0]["data"]) == ["image/png"]
+        # The original cell is not modified
+        assert "text/html" in cell["outputs"][0]["data"]
+
+    def test_hide_outputs_drops_everything(self, table_and_image_cell):
+        cell = table_and_image_cell(tags=["jupdeck-hide-outputs"])
+        filtered = directives.filter_outputs(cell, directives.read_directives(cell))
+        assert filtered["outputs"] == []
+        assert filtered.source == "df.head()"
+
+
+class TestParserIntegration:
+    def test_hidden_cells_are_skipped_and_counted(self, write_notebook):
+        path = write_notebook([
+            new_markdown_cell("# Visible"),
+            new_markdown_cell("<!-- jupdeck: hide -->\n# Hidden"),
+            new_code_cell("secret()", metadata={"tags": ["jupdeck-hide"]}),
+        ])
+        result = parser.parse_notebook(path)
+        assert result["skipped_cells"] == 2
+        assert [cell.title for cell in result["cells"]] == ["Visible"]
+
+    def test_hidden_outputs_are_never_parsed(self, write_notebook, table_and_image_cell):
+        path = write_notebook([table_and_image_cell(tags=["jupdeck-hide-tables"])])
+        with mock.patch.object(parser.pd, "read_html") as read_html:
+            result = parser.parse_notebook(path)
+        read_html.assert_not_called()
+        assert result["cells"][0].table is None
+        assert len(result["cells"][0].images) == 1
+
+    def test_markdown_output_filters_apply_to_the_rest_of_the_slide(self, write_notebook,
+                                                                    table_and_image_cell):
+        path = write_notebook([
+            new_markdown_cell("<!-- jupdeck: hide-tables -->\n# Results"),
+            table_and_image_cell(),
+            table_and_image_cell(),
+            new_markdown_cell("## Details\n\n```\n# not a heading\n```"),
+            table_and_image_cell(),
+            new_markdown_cell("Next\n===="),
+            table_and_image_cell(),
+        ])
+        cells = parser.parse_notebook(path)["cells"]
+        assert [cell.table is None for cell in cells if cell.type == "code"] == \
+            [True, True, True, False]
+        assert all(len(cell.images) == 1 for cell in cells if cell.type == "code")
+
+    def test_an_empty_heading_does_not_end_the_slide_filters(self, write_notebook,
+                                                             table_and_image_cell):
+        path = write_notebook([
+            new_markdown_cell("<!-- jupdeck: hide-tables -->\n# Results"),
+            table_and_image_cell(),
+            new_markdown_cell("#\n\nmore results"),  # an empty title: merged, as rendered
+            table_and_image_cell(),
+        ])
+        cells = parser.parse_notebook(path)["cells"]
+        assert cells[2].title == ""
+        assert directives.starts_slide(new_markdown_cell("#\n\ntext"),
+                                       directives.CellDirectives()) == (False, "")
+        assert [cell.table for cell in cells if cell.type == "code"] == [None, None]
+        assert len(PowerPointRenderer()._merge_slide_groups(cells)) == 1
+
+    def test_new_slide_directive_splits_slides(self, write_notebook):
+        path = write_notebook([
+            new_markdown_cell("# Intro\n\n- one"),
+            new_markdown_cell("<!-- jupdeck: new-slide -->\n- two"),
+        ])
+        cells = parser.parse_notebook(path)["cells"]
+        assert cells[1].metadata == {"new_slide": True}
+
+        groups = PowerPointRenderer()._merge_slide_groups(cells)
+        assert [group.bullets for group in groups] == [["one"], ["two"]]
+
+    def test_section_directive_starts_a_slide(self, write_notebook):
+        path = write_notebook([
+            new_markdown_cell("# Intro\n\n- one"),
+            new_markdown_cell("- two", metadata={"tags": ["jupdeck-section"]}),
+        ])
+        cells = parser.parse_notebook(path)["cells"]
+        assert cells[1].metadata == {"section": True}
+        assert len(PowerPointRenderer()._merge_slide_groups(cells)) == 2
+
+    def test_directive_comment_is_not_rendered_as_text(self):
+        cell = new_markdown_cell("<!-- jupdeck: new-slide -->\n# Title\n\nBody text.")
+        parsed = parser.parse_markdown_cell(cell)
+        assert isinstance(parsed, ParsedCell)
+        assert parsed.paragraphs == ["Body text."]
@@ -0,0 +1,149 @@
+import io
+import json
+import sys
+
+import pytest
+from nbformat.v4 import new_markdown_cell
+
+from jupdeck import cli
+from jupdeck.core import parser
+from jupdeck.core.events import (
+    Event,
+    EventReporter,
+    EventSink,
+    JsonLinesSink,
+    MetricsFile,
+    ProgressDisplay,
+)
+from jupdeck.core.renderer import PowerPointRenderer
+from jupdeck.core.slide_cache import SlideCache
+
+
+class Recorder(EventSink):
+    def __init__(self):
+        self.events = []
+
+    def handle(self, event):
+        self.events.append(event)
+
+
+def _slides(count):
+    return [new_markdown_cell(f"# Slide {i}\n\n- point {i}") for i in range(count)]
+
+
+def _names(recorder):
+    return [event.name for event in recorder.events]
+
+
+def test_parser_and_renderer_report_through_one_reporter(tmp_path, write_notebook):
+    path = write_notebook(_slides(3))
+    recorder = Recorder()
+    reporter = EventReporter(recorder)
+
+    parsed = parser.parse_notebook(path, reporter=reporter)
+    PowerPointRenderer(tmp_path / "deck.pptx", include_attribution=False,
+                       reporter=reporter).render_presentation(parsed)
+
+    assert _names(recorder) == ["parse_started", "parse_finished", "render_started",
+                                "slide_rendered", "slide_rendered", "slide_rendered",
+                                "deck_saved"]
+    assert recorder.events[0].fields == {"notebook": "nb.ipynb", "cells": 3}
+    assert recorder.events[2].fields == {"slides": 3}
+    assert [e.fields["slide"] for e in recorder.events[3:6]] == [1, 2, 3]
+    assert recorder.events[-1].fields["bytes"] == (tmp_path / "deck.pptx").stat().st_size
+
+
+def test_slide_cache_hits_and_misses_are_reported(tmp_path, write_notebook):
+    parsed = parser.parse_notebook(write_notebook(_slides(2)))
+    cache = SlideCache(tmp_path / "cache")
+    for expected in (False, True):
+        recorder = Recorder()
+        PowerPointRenderer(tmp_path / "deck.pptx", slide_cache=cache,
+                           reporter=EventReporter(recorder)).render_presentation(parsed)
+        cached = [e.fields["cached"] for e in recorder.events if e.name == "slide_rendered"]
+        assert cached == [expected, expected]
+
+
+def test_sinks_must_handle_events():
+    class Incomplete(EventSink):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_json_lines_sink_writes_one_object_per_event():
+    stream = io.StringIO()
+    reporter = EventReporter(JsonLinesSink(stream))
+    reporter.emit("notebook_started", notebook="a.ipynb")
+    reporter.emit("notebook_finished", notebook="a.ipynb", slides=2, seconds=0.5, bytes=10)
+
+    records = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [r["event"] for r in records] == ["notebook_started", "notebook_finished"]
+    assert records[1]["slides"] == 2
+    assert all(isinstance(r["time"], float) for r in records)
+
+
+def test_progress_display_estimates_remaining_time():
+    display = ProgressDisplay(io.StringIO())
+    for name, at, fields in [
+        ("batch_started", 0.0, {"notebooks": 3}),
+        ("notebook_started", 0.0, {"notebook": "dir/first.ipynb"}),
+        ("notebook_finished", 10.0, {}),
+        ("notebook_started", 10.0, {"notebook": "dir/second.ipynb"}),
+        ("render_started", 10.0, {"slides": 20}),
+    ] + [("slide_rendered", 10.0 + (n + 1) * 0.5, {}) for n in range(10)]:
+        display.handle(Event(name, at, fields))
+
+    # 10 slides left at 2 per second, then one more notebook at 10 s per notebook
+    assert display.eta(15.0) == 15.0
+    assert display.line(15.0) == "[1/3] second.ipynb slide 10/20 ETA 15s"
+
+
+def test_metrics_file_uses_prometheus_text_format(tmp_path):
+    metrics = MetricsFile(tmp_path / "jupdeck.prom")
+    reporter = EventReporter(metrics)
+    reporter.emit("notebook_started", notebook="a.ipynb")
+    reporter.emit("slide_rendered", slide=1, cached=True)
+    reporter.emit("slide_rendered", slide=2, cached=False)
+    reporter.emit("deck_saved", path="a.pptx", bytes=1000)
+    reporter.emit("notebook_finished", notebook="a.ipynb", slides=2, seconds=1.5, bytes=1000)
+    reporter.emit("notebook_started", notebook="b.ipynb")
+    reporter.emit("notebook_failed", notebook="b.ipynb", error="ValueError: bad")
+    reporter.close()
+
+    lines = (tmp_path / "jupdeck.prom").read_text().splitlines()
+    assert "# TYPE jupdeck_slides_rendered_total counter" in lines
+    assert 'jupdeck_notebooks_total{result="ok"} 1' in lines
+    assert 'jupdeck_notebooks_total{result="failed"} 1' in lines
+    assert "jupdeck_notebooks_in_progress 0" in lines
+    assert "jupdeck_slide_cache_hits_total 1" in lines
+    assert "jupdeck_slide_cache_misses_total 1" in lines
+    assert "jupdeck_bytes_written_total 1000" in lines
+    assert "jupdeck_errors_total 1" in lines
+    assert "jupdeck_notebook_duration_seconds_sum 1.5" in lines
+    assert not list(tmp_path.glob(".*.tmp"))
+
+
+def test_batch_writes_events_and_metrics(tmp_path, write_notebook, monkeypatch):
+    inputs = [write_notebook(_slides(2), f"nb{i}.ipynb") for i in range(2)]
+    events_file, metrics_file = tmp_path / "events.jsonl", tmp_path / "metrics.prom"
+    monkeypatch.setattr(sys, "argv", ["jupdeck", "batch", *map(str, inputs),
+                                      "-o", str(tmp_path / "out"), "--progress",
+                                      "--events", str(events_file),
+                                      "--metrics", str(metrics_file)])
+    cli.main()
+
+    records = [json.loads(line) for line in events_file.read_text().splitlines()]
+    names = [r["event"] for r in records]
+    assert names[0] == "batch_started" and names[-1] == "batch_finished"
+    assert names.count("notebook_finished") == 2
+    assert names.count("slide_rendered") == 4
+    finished = [r for r in records if r["event"] == "notebook_finished"]
+    assert finished[0]["slides"] == 3  # two slides and the attribution slide
+    assert finished[0]["bytes"] == (tmp_path / "out" / "nb0.pptx").stat().st_size
+    assert 'jupdeck_notebooks_total{result="ok"} 2' in metrics_file.read_text()
+
+    cli.main()
+    names = [json.loads(line)["event"] for line in events_file.read_text().splitlines()]
+    assert names.count("notebook_skipped") == 2
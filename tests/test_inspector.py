@@ -0,0 +1,118 @@
+import json
+import sys
+import zipfile
+
+import pytest
+from nbformat.v4 import new_code_cell, new_markdown_cell, new_output
+from pptx import Presentation
+
+from jupdeck import cli
+from jupdeck.core import inspector, parser
+from jupdeck.core.budget import Budget
+from jupdeck.core.renderer import PowerPointRenderer
+
+
+def _html_table(n_rows: int) -> str:
+    rows = "".join(f"<tr><td>{i}</td></tr>" for i in range(n_rows))
+    return f"<table><thead><tr><th>a</th></tr></thead><tbody>{rows}</tbody></table>"
+
+
+@pytest.fixture
+def notebook(write_notebook, minimal_png):
+    return write_notebook([
+        new_markdown_cell("# Intro\n\n- first point"),
+        new_code_cell("plot()", outputs=[
+            new_output("display_data", data={"image/png": minimal_png})]),
+        new_markdown_cell("# Data"),
+        new_code_cell("df", outputs=[new_output(
+            "execute_result", data={"text/html": _html_table(30)}, execution_count=1)]),
+    ], "report.ipynb")
+
+
+def _render(notebook, output, **options):
+    parsed = parser.parse_notebook(notebook)
+    renderer = PowerPointRenderer(output_path=output, input_path=notebook, **options)
+    renderer.render_presentation(parsed)
+    return parsed
+
+
+def test_summary_matches_deck(tmp_path, notebook):
+    output = tmp_path / "report.pptx"
+    _render(notebook, output)
+
+    summary = inspector.inspect_deck(output)
+    prs = Presentation(output)
+    assert len(summary.slides) == len(prs.slides) == 3
+    assert [slide.title for slide in summary.slides] == ["Intro", "Data", ""]
+    intro, data, attribution = summary.slides
+    assert (intro.pictures, intro.layout) == (1, inspector.CONTENT_LAYOUT)
+    assert data.table_rows == [10]
+    assert data.truncated_tables == [f"slide_{prs.slides[1].slide_id}_table_1.xlsx"]
+    assert attribution.is_attribution
+    assert summary.media_files == 1
+    assert summary.missing_images == []
+    assert "3 slide(s), 1 picture(s)" in summary.format()
+
+
+def test_missing_image_detected(tmp_path, notebook):
+    output = tmp_path / "report.pptx"
+    _render(notebook, output)
+    broken = tmp_path / "broken.pptx"
+    with zipfile.ZipFile(output) as src, zipfile.ZipFile(broken, "w") as dst:
+        for info in src.infolist():
+            if not info.filename.startswith("ppt/media/"):
+                dst.writestr(info, src.read(info))
+
+    summary = inspector.inspect_deck(broken)
+    assert summary.missing_images == ["slide 1: ppt/media/image1.png"]
+    assert summary.media_files == 0
+
+
+def test_compare_with_notebook(tmp_path, notebook):
+    output = tmp_path / "report.pptx"
+    parsed = _render(notebook, output)
+    assert inspector.compare_with_notebook(inspector.inspect_deck(output), parsed) == []
+
+    [exported] = inspector.inspect_deck(output).slides[1].truncated_tables
+    (tmp_path / exported).unlink()
+    issues = inspector.compare_with_notebook(inspector.inspect_deck(output), parsed)
+    assert issues == [f"slide 2: exported table {exported} is missing"]
+
+
+def test_compare_reports_dropped_content(tmp_path, notebook):
+    output = tmp_path / "report.pptx"
+    parsed = _render(notebook, output, budget=Budget(max_image_bytes=1))
+
+    issues = inspector.compare_with_notebook(inspector.inspect_deck(output), parsed)
+    assert "slide 1: 1 of 1 image(s) dropped" in issues
+    assert any("image budget exceeded" in issue for issue in issues)
+
+
+def test_compare_ignores_section_dividers(tmp_path, notebook):
+    output = tmp_path / "report.pptx"
+    parsed = parser.parse_notebook(notebook)
+    renderer = PowerPointRenderer(output_path=output, include_attribution=False)
+    renderer.render_section_divider("Part one")
+    renderer.render_presentation(parsed)
+
+    summary = inspector.inspect_deck(output)
+    assert summary.slides[0].layout == "Section Header"
+    assert inspector.compare_with_notebook(summary, parsed) == []
+
+
+def test_cli_inspect(tmp_path, notebook, monkeypatch, capsys):
+    output = tmp_path / "report.pptx"
+    _render(notebook, output, budget=Budget(max_image_bytes=1))
+
+    monkeypatch.setattr(sys, "argv", ["jupdeck", "inspect", str(output), "--json"])
+    cli.main()
+    data = json.loads(capsys.readouterr().out)
+    assert [slide["title"] for slide in data["slides"]] == ["Intro", "Data", ""]
+    assert data["issues"] == []
+
+    monkeypatch.setattr(sys, "argv", ["jupdeck", "inspect", str(output),
+                                      "--notebook", str(notebook)])
+    with pytest.raises(SystemExit) as excinfo:
+        cli.main()
+    assert excinfo.value.code == 1
+    assert "image(s) dropped" in capsys.readouterr().out
@@ -0,0 +1,136 @@
+from pptx import Presentation
+from pptx.util import Inches, Pt
+
+from jupdeck.core import layout
+from jupdeck.core.layout import Box, LayoutEngine
+from jupdeck.core.models import ImageData, ParsedCell
+from jupdeck.core.renderer import PowerPointRenderer
+
+LONG_BULLET = "a fairly long bullet point that keeps going " * 6
+
+
+def _overlaps(a: Box, b: Box) -> bool:
+    return not (a.left + a.width <= b.left or b.left + b.width <= a.left or
+                a.top + a.height <= b.top or b.top + b.height <= a.top)
+
+
+class TestTextMeasurement:
+    def test_wrap_line_count_grows_with_font_size(self):
+        width = Inches(4)
+        small = layout.wrap_line_count(LONG_BULLET, 10, width)
+        large = layout.wrap_line_count(LONG_BULLET, 24, width)
+        assert 1 < small < large
+
+    def test_short_text_is_one_line(self):
+        assert layout.wrap_line_count("Hello", 18, Inches(8)) == 1
+
+    def test_explicit_newlines_start_new_lines(self):
+        assert layout.wrap_line_count("one\ntwo\nthree", 18, Inches(8)) == 3
+
+    def test_overlong_word_is_broken(self):
+        assert layout.wrap_line_count("x" * 400, 18, Inches(2)) > 1
+
+    def test_word_exactly_twice_the_box_width_takes_two_lines(self):
+        word = "mm"
+        width = round(layout.text_width_em(word) / 2 * Pt(10))  # half the word at 10 pt
+        assert layout.wrap_line_count(word, 10, width) == 2
+        assert layout.wrap_line_count(f"a {word}", 10, width) == 3
+        assert layout.wrap_line_count(f"{word} a", 10, width) == 3
+
+    def test_results_are_memoised(self):
+        layout.clear_caches()
+        layout.wrap_line_count(LONG_BULLET, 14, Inches(4))
+        layout.wrap_line_count(LONG_BULLET, 14, Inches(4))
+        assert layout.cache_info()["wrap_line_count"].hits == 1
+
+    def test_text_fits_agrees_with_text_height(self):
+        paragraphs = [LONG_BULLET] * 5
+        height = layout.text_height_emu(paragraphs, 14, Inches(4), 8)
+        assert layout.text_fits(paragraphs, 14, Inches(4), height, 8)
+        assert not layout.text_fits(paragraphs, 14, Inches(4), height - Pt(10), 8)
+
+
+class TestLayoutEngine:
+    def test_short_bullets_use_largest_font(self):
+        plan = LayoutEngine().plan(ParsedCell(type="markdown", title="T", bullets=["One", "Two"]))
+        assert plan.name == "bullets"
+        assert plan.bullet_font_size == layout.BULLET_FONT_SIZES[0]
+        assert not plan.overflow
+
+    def test_long_bullets_shrink_font(self):
+        plan = LayoutEngine().plan(ParsedCell(type="markdown", bullets=[LONG_BULLET] * 6))
+        assert plan.bullet_font_size < layout.BULLET_FONT_SIZES[0]
+        assert not plan.overflow
+
+    def test_too_much_text_is_flagged_as_overflow(self):
+        plan = LayoutEngine().plan(ParsedCell(type="markdown", bullets=[LONG_BULLET] * 40))
+        assert plan.overflow
+        assert plan.bullet_font_size == layout.BULLET_FONT_SIZES[-1]
+
+    def test_boxes_do_not_overlap(self, minimal_png):
+        cell = ParsedCell(
+            type="markdown",
+            bullets=["Point"] * 3,
+            images=[ImageData("image/png", minimal_png)] * 2,
+            table=[{"a": i} for i in range(4)],
+        )
+        plan = LayoutEngine().plan(cell)
+        boxes = [plan.bullet_box, plan.table_box, *plan.image_boxes]
+        for i, first in enumerate(boxes):
+            for second in boxes[i + 1:]:
+                assert not _overlaps(first, second)
+
+    def test_images_keep_their_aspect_ratio(self, minimal_png):
+        cell = ParsedCell(type="code", images=[ImageData("image/png", minimal_png)])
+        box = LayoutEngine().plan(cell).image_boxes[0]
+        assert abs(box.width - box.height) <= 1  # the test image is 1x1
+
+    def test_table_rows_limited_to_what_fits(self):
+        cell = ParsedCell(type="code", bullets=[LONG_BULLET] * 3,
+                          table=[{"a": i} for i in range(50)])
+        plan = LayoutEngine().plan(cell)
+        assert 0 < plan.table_rows <= layout.MAX_TABLE_ROWS
+
+    def test_long_title_gets_smaller_font(self):
+        engine = LayoutEngine()
+        assert engine.plan(ParsedCell(type="markdown", title="Short")).title_font_size is None
+        long_title = ParsedCell(type="markdown", title="A very long slide title " * 5)
+        assert engine.plan(long_title).title_font_size < layout.TITLE_FONT_SIZES[0]
+
+
+def test_renderer_applies_layout(tmp_path):
+    cell = ParsedCell(type="markdown", title="Slide", bullets=[LONG_BULLET] * 6)
+    output_file = tmp_path / "layout.pptx"
+    renderer = PowerPointRenderer(output_file)
+    renderer.render_slides([cell])
+
+    plan = renderer.layout_engine.plan(cell)
+    paragraphs = Presentation(output_file).slides[0].placeholders[1].text_frame.paragraphs
+    assert all(p.font.size == Pt(plan.bullet_font_size) for p in paragraphs)
+    assert renderer.overflowing_slides == []
+
+
+def test_renderer_records_overflowing_slides():
+    renderer = PowerPointRenderer()
+    renderer.render_slides([
+        ParsedCell(type="markdown", title="Fits", bullets=["One"]),
+        ParsedCell(type="markdown", title="Too much", bullets=[LONG_BULLET] * 40),
+    ])
+    assert renderer.overflowing_slides == [2]
+
+
+def test_short_table_that_does_not_fit_is_truncated(tmp_path):
+    cell = ParsedCell(type="code", title="Crowded", bullets=[LONG_BULLET] * 4,
+                      table=[{"a": i} for i in range(layout.MAX_TABLE_ROWS)])
+    plan = LayoutEngine().plan(cell)
+    assert plan.table_rows < layout.MAX_TABLE_ROWS
+
+    renderer = PowerPointRenderer()  # no output path, so no side file
+    renderer.render_slides([cell])
+    texts = [shape.text_frame.text for shape in renderer.prs.slides[0].shapes
+             if shape.has_text_frame]
+    assert f"⚠️ Table truncated: showing {plan.table_rows} of 10 row(s)" in texts
+
+    renderer = PowerPointRenderer(tmp_path / "deck.pptx")
+    renderer.render_slides([cell])
+    assert [path.suffix for path in tmp_path.glob("slide_*_table_1.xlsx")] == [".xlsx"]
@@ -0,0 +1,108 @@
+import base64
+import io
+import os
+import pickle
+import tracemalloc
+
+import pytest
+from nbformat.v4 import new_code_cell, new_markdown_cell, new_output
+from PIL import Image
+from pptx import Presentation
+from pptx.enum.shapes import MSO_SHAPE_TYPE
+
+from jupdeck.core import lazy, parser
+from jupdeck.core.lazy import ImageSpan
+from jupdeck.core.renderer import LazyImagePart, PowerPointRenderer
+
+
+def _noise_png(width=400, height=300) -> bytes:
+    buffer = io.BytesIO()
+    Image.frombytes("RGB", (width, height), os.urandom(width * height * 3)).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def _image_cell(png: bytes, trailing_newline=False):
+    payload = base64.b64encode(png).decode("ascii") + ("\n" if trailing_newline else "")
+    output = new_output("display_data", data={"image/png": payload})
+    return new_code_cell("plot()", outputs=[output])
+
+
+def test_large_payloads_become_spans(write_notebook, minimal_png):
+    png = _noise_png(60, 40)
+    attachment = base64.b64encode(png).decode("ascii")
+    markdown = new_markdown_cell("![x](attachment:x.png)")
+    markdown["attachments"] = {"x.png": {"image/png": attachment}}
+    path = write_notebook([
+        _image_cell(png, trailing_newline=True),
+        new_code_cell("tiny()", outputs=[new_output("display_data",
+                                                    data={"image/png": minimal_png})]),
+        markdown,
+    ])
+
+    nb = lazy.load_notebook_lazily(path)
+
+    span = nb.cells[0].outputs[0].data["image/png"]
+    assert isinstance(span, ImageSpan)
+    assert span.decode() == png
+    assert span.head(8) == png[:8]
+    assert nb.cells[1].outputs[0].data["image/png"] == minimal_png  # below MIN_SPAN_BYTES
+    assert nb.cells[2].attachments["x.png"]["image/png"] == attachment
+
+
+def test_parsed_images_are_lazy_and_pickle_small(write_notebook):
+    png = _noise_png()
+    path = write_notebook([_image_cell(png)])
+    [cell] = parser.parse_notebook(path)["cells"]
+
+    image = cell.images[0]
+    assert image.span is not None and not image.data
+    assert image.to_bytes() == png
+    assert len(pickle.dumps(image)) < 500
+    assert pickle.loads(pickle.dumps(image)).to_bytes() == png
+
+
+def test_changed_notebook_is_detected(write_notebook):
+    path = write_notebook([_image_cell(_noise_png(60, 40))])
+    span = lazy.load_notebook_lazily(path).cells[0].outputs[0].data["image/png"]
+    moved = ImageSpan(span.path, span.start, span.end, span.size + 1, span.mtime_ns)
+    with pytest.raises(ValueError, match="changed"):
+        moved.decode()
+
+
+def test_lazy_deck_matches_eager_deck(tmp_path, write_notebook):
+    pngs = [_noise_png(80, 60) for _ in range(3)]
+    path = write_notebook([_image_cell(png) for png in pngs + pngs[:1]])
+
+    decks = []
+    for name, parsed in [
+        ("lazy", parser.parse_notebook(path)),
+        ("eager", parser.parse_notebook_node(parser.load_notebook(path))),
+    ]:
+        renderer = PowerPointRenderer(output_path=tmp_path / f"{name}.pptx",
+                                      include_attribution=False)
+        renderer.render_presentation(parsed)
+        lazy_parts = [part for part in renderer._image_parts.values()
+                      if isinstance(part, LazyImagePart)]
+        assert bool(lazy_parts) == (name == "lazy")
+        pictures = [shape.image.sha1 for slide in Presentation(renderer.output_path).slides
+                    for shape in slide.shapes if shape.shape_type == MSO_SHAPE_TYPE.PICTURE]
+        decks.append(pictures)
+
+    assert decks[0] == decks[1]
+    assert len(set(decks[0])) == 3
+
+
+def test_render_keeps_one_decoded_image_alive(tmp_path, write_notebook):
+    pngs = [_noise_png() for _ in range(20)]
+    path = write_notebook([_image_cell(png) for png in pngs])
+
+    tracemalloc.start()
+    try:
+        parsed = parser.parse_notebook(path)
+        PowerPointRenderer(output_path=tmp_path / "deck.pptx",
+                           include_attribution=False).render_presentation(parsed)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert peak < sum(len(png) for png in pngs) / 3
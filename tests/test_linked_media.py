@@ -0,0 +1,102 @@
+import base64
+import io
+import zipfile
+
+import pytest
+from nbformat.v4 import new_code_cell, new_markdown_cell, new_notebook, new_output
+from PIL import Image
+
+from jupdeck.core import inspector, linked_media, parser
+from jupdeck.core.renderer import PowerPointRenderer
+from jupdeck.core.slide_cache import SlideCache
+
+
+def _png(color) -> str:
+    buffer = io.BytesIO()
+    Image.new("RGB", (40, 30), color).save(buffer, "PNG")
+    return base64.b64encode(buffer.getvalue()).decode("ascii")
+
+
+def _parsed():
+    cells = []
+    for i, color in enumerate(["red", "green", "red", "blue"]):  # red twice
+        cells += [new_markdown_cell(f"# Figure {i}"), new_code_cell("plot()", outputs=[
+            new_output("display_data", data={"image/png": _png(color)})])]
+    return parser.parse_notebook_node(new_notebook(cells=cells))
+
+
+def _render(deck, parsed, **options):
+    PowerPointRenderer(deck, include_attribution=False, **options).render_presentation(parsed)
+    with zipfile.ZipFile(deck) as archive:
+        embedded = [name for name in archive.namelist() if name.startswith("ppt/media/")]
+    return embedded, inspector.inspect_deck(deck)
+
+
+def test_media_dir_is_named_after_the_deck(tmp_path):
+    assert linked_media.media_dir(tmp_path / "talk.pptx") == tmp_path / "talk_media"
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_images_are_written_once_and_linked(tmp_path, workers):
+    deck = tmp_path / "decks" / "talk.pptx"
+    deck.parent.mkdir()
+    parsed = _parsed()
+    embedded, summary = _render(deck, parsed, workers=workers,
+                                linked_media_dir=linked_media.media_dir(deck))
+
+    assert embedded == []
+    files = sorted(path.name for path in (tmp_path / "decks" / "talk_media").iterdir())
+    assert len(files) == 3 and all(name.endswith(".png") for name in files)
+    targets = [target for slide in summary.slides for target in slide.linked_images]
+    assert len(targets) == 4 and targets[0] == targets[2]
+    assert targets[0].startswith("talk_media/")
+    assert summary.pictures == 4 and summary.missing_images == []
+    assert inspector.compare_with_notebook(summary, parsed) == []
+
+    (deck.parent / targets[1]).unlink()
+    assert inspector.compare_with_notebook(summary, parsed) == [
+        f"slide 2: linked image {targets[1]} is missing"]
+
+
+def test_linked_media_directory_elsewhere_gets_a_relative_path(tmp_path):
+    deck = tmp_path / "out" / "talk.pptx"
+    deck.parent.mkdir()
+    _, summary = _render(deck, _parsed(), linked_media_dir=tmp_path / "shared")
+    assert summary.slides[0].linked_images[0].startswith("../shared/")
+    assert inspector.compare_with_notebook(summary, _parsed()) == []
+
+
+def test_unchanged_images_are_not_rewritten(tmp_path):
+    deck = tmp_path / "talk.pptx"
+    renderer = PowerPointRenderer(deck, include_attribution=False,
+                                  linked_media_dir=linked_media.media_dir(deck))
+    renderer.render_presentation(_parsed())
+    assert renderer.linked_media.files_written == 3
+
+    renderer = PowerPointRenderer(deck, include_attribution=False,
+                                  linked_media_dir=linked_media.media_dir(deck))
+    renderer.render_presentation(_parsed())
+    assert renderer.linked_media.files_written == 0
+
+
+def test_cached_slides_switch_between_linked_and_embedded(tmp_path):
+    cache = SlideCache(tmp_path / "cache")
+    linked_deck = tmp_path / "linked.pptx"
+    _render(linked_deck, _parsed(), slide_cache=cache,
+            linked_media_dir=linked_media.media_dir(linked_deck))
+
+    embedded, summary = _render(tmp_path / "embedded.pptx", _parsed(), slide_cache=cache)
+    assert cache.hits == 4
+    assert len(embedded) == 3 and summary.missing_images == []
+    assert not any(slide.linked_images for slide in summary.slides)
+
+    other_deck = tmp_path / "other.pptx"
+    embedded, summary = _render(other_deck, _parsed(), slide_cache=cache,
+                                linked_media_dir=linked_media.media_dir(other_deck))
+    assert cache.hits == 8 and embedded == []
+    assert inspector.compare_with_notebook(summary, _parsed()) == []
+
+
+def test_linked_media_needs_an_output_path(tmp_path):
+    with pytest.raises(ValueError, match="output_path"):
+        PowerPointRenderer(linked_media_dir=tmp_path)
@@ -0,0 +1,119 @@
+import base64
+import io
+import urllib.parse
+
+import pytest
+from nbformat.v4 import new_code_cell, new_markdown_cell, new_output
+from PIL import Image
+from pptx import Presentation
+from pptx.enum.shapes import MSO_SHAPE_TYPE
+
+from jupdeck.core import layout, media, parser
+from jupdeck.core.models import ImageData, ParsedCell
+from jupdeck.core.renderer import PowerPointRenderer
+
+SVG = ('<svg xmlns="http://www.w3.org/2000/svg" width="40" height="20">'
+       '<rect width="40" height="20"/></svg>')
+
+
+def _encoded(fmt: str, size=(40, 20)) -> str:
+    buffer = io.BytesIO()
+    Image.new("RGB", size, "red").save(buffer, format=fmt)
+    return base64.b64encode(buffer.getvalue()).decode("ascii")
+
+
+def fake_svg_to_png(svg: bytes) -> bytes:
+    calls.append(svg)
+    return base64.b64decode(_encoded("PNG"))
+
+
+calls = []
+
+
+@pytest.fixture
+def pipeline(tmp_path, monkeypatch):
+    calls.clear()
+    monkeypatch.setitem(media.CONVERTERS, "image/svg+xml", fake_svg_to_png)
+    return media.MediaPipeline(cache_dir=tmp_path / "cache")
+
+
+class TestRecognise:
+    def test_output_prefers_native_format(self):
+        image = media.output_image({"image/svg+xml": SVG, "image/png": _encoded("PNG")})
+        assert image.mime_type == "image/png"
+
+    def test_svg_output_stored_as_base64(self):
+        image = media.output_image({"image/svg+xml": SVG, "text/plain": "<Figure>"})
+        assert image.mime_type == "image/svg+xml"
+        assert image.to_bytes() == SVG.encode()
+
+    def test_no_image(self):
+        assert media.output_image({"text/plain": "1"}) is None
+
+    def test_data_uri_keeps_mime_type(self):
+        image = media.data_uri_image("data:image/jpeg;base64," + _encoded("JPEG"))
+        assert image.mime_type == "image/jpeg"
+        image = media.data_uri_image("data:image/svg+xml;utf8," + urllib.parse.quote(SVG))
+        assert (image.mime_type, image.to_bytes()) == ("image/svg+xml", SVG.encode())
+        assert media.data_uri_image("https://example.com/plot.png") is None
+
+
+def test_parser_keeps_jpeg_and_svg():
+    cell = new_code_cell("plot()", outputs=[
+        new_output("display_data", data={"image/jpeg": _encoded("JPEG")}),
+        new_output("display_data", data={"image/svg+xml": SVG}),
+    ])
+    parsed = parser.parse_code_cell(cell)
+    assert [image.mime_type for image in parsed.images] == ["image/jpeg", "image/svg+xml"]
+
+    cell = new_markdown_cell("![gif](data:image/gif;base64," + _encoded("GIF") + ")")
+    assert parser.parse_markdown_cell(cell).images[0].mime_type == "image/gif"
+
+
+@pytest.mark.parametrize("fmt,mime_type", [("JPEG", "image/jpeg"), ("GIF", "image/gif")])
+def test_aspect_ratio_from_header(fmt, mime_type):
+    image = ImageData(mime_type, _encoded(fmt, size=(300, 100)))
+    assert layout.image_aspect_ratio(image) == pytest.approx(3.0)
+
+
+def test_pipeline_converts_once_and_caches(tmp_path, pipeline):
+    cells = [ParsedCell(type="code", images=[ImageData("image/svg+xml", blob=SVG.encode())])
+             for _ in range(3)]
+    prepared = pipeline.prepare(cells)
+
+    assert len(calls) == 1
+    assert all(cell.images[0].mime_type == "image/png" for cell in prepared)
+    assert cells[0].images[0].mime_type == "image/svg+xml"  # input cells are not modified
+
+    again = media.MediaPipeline(cache_dir=tmp_path / "cache")
+    again.prepare(cells)
+    assert (len(calls), again.cache_hits, again.converted) == (1, 1, 0)
+
+
+def test_failed_conversion_becomes_placeholder(pipeline, monkeypatch):
+    def no_converter(pdf: bytes) -> bytes:
+        raise media.MediaConversionError("no PDF converter")
+
+    monkeypatch.setitem(media.CONVERTERS, "application/pdf", no_converter)
+    cell = ParsedCell(type="code", images=[ImageData("application/pdf", blob=b"%PDF-broken")])
+    [prepared] = pipeline.prepare([cell])
+
+    assert prepared.images == []
+    assert "application/pdf figure omitted" in prepared.bullets[0]
+    assert list(pipeline.failures.values()) == ["no PDF converter"]
+
+
+def test_renderer_embeds_jpeg_and_converted_svg(tmp_path, pipeline):
+    cells = [ParsedCell(type="code", title="Plots", images=[
+        ImageData("image/jpeg", _encoded("JPEG")),
+        ImageData("image/svg+xml", base64.b64encode(SVG.encode()).decode("ascii")),
+    ])]
+    output = tmp_path / "media.pptx"
+    renderer = PowerPointRenderer(output_path=output, include_attribution=False)
+    renderer.media = pipeline
+    renderer.render_presentation({"cells": cells})
+
+    pictures = [shape for shape in Presentation(output).slides[0].shapes
+                if shape.shape_type == MSO_SHAPE_TYPE.PICTURE]
+    assert sorted(picture.image.content_type for picture in pictures) == \
+        ["image/jpeg", "image/png"]
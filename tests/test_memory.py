@@ -0,0 +1,247 @@
+"""
+Memory regression suite: representative notebooks go through each pipeline
+stage under tracemalloc, with the process's resident memory sampled alongside.
+Every notebook's stages are checked against a reference measured in the same
+process (``json.loads`` of the same file), so the checks hold on any Python
+version and run by default. The exact per-stage limits in MB and the resident
+memory check depend on the interpreter and on what else the test process holds,
+so they only run with ``JUPDECK_MEMORY_BUDGETS=1``, e.g. in a CI job pinned to
+one Python.
+``scripts/bench_memory.py`` prints the measurements, for setting the budgets
+after a deliberate change.
+"""
+
+import base64
+import io
+import json
+import os
+import random
+import threading
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional
+
+import nbformat
+import pytest
+from nbformat.v4 import new_code_cell, new_markdown_cell, new_notebook, new_output
+from PIL import Image
+
+from jupdeck.core import parser
+from jupdeck.core.renderer import PowerPointRenderer
+
+MB = 1024 * 1024
+STAGES = ("load_notebook", "extract_cells", "merge_slide_groups", "render_slides")
+
+# Peak bytes allocated by each stage, as a multiple of the peak of reading the same file
+# with json.loads. Set at about 1.5x the measured ratios; the small tables and text
+# notebooks carry more fixed overhead per byte, so their ratios are higher.
+RELATIVE_BUDGETS = {
+    "images": {"load_notebook": 1.5, "extract_cells": 0.1, "merge_slide_groups": 0.1,
+               "render_slides": 0.75},
+    "tables": {"load_notebook": 1.75, "extract_cells": 4, "merge_slide_groups": 0.25,
+               "render_slides": 4.5},
+    "text": {"load_notebook": 2.75, "extract_cells": 1.5, "merge_slide_groups": 0.25,
+             "render_slides": 6},
+}
+
+absolute_budgets = pytest.mark.skipif(
+    os.environ.get("JUPDECK_MEMORY_BUDGETS") != "1",
+    reason="absolute memory budgets are opt-in: set JUPDECK_MEMORY_BUDGETS=1")
+# Peak bytes allocated by each stage (above what was allocated when it started), in MB.
+# Set at about 1.5x the measured peaks on Linux with Python 3.11.
+BUDGETS_MB = {
+    "images": {"load_notebook": 28, "extract_cells": 1, "merge_slide_groups": 0.5,
+               "render_slides": 12},
+    "tables": {"load_notebook": 1.5, "extract_cells": 2.5, "merge_slide_groups": 0.5,
+               "render_slides": 5.5},
+    "text": {"load_notebook": 1.5, "extract_cells": 1, "merge_slide_groups": 0.5,
+             "render_slides": 3},
+}
+# Resident memory also counts what tracemalloc can't see, such as lxml's XML trees
+RSS_BUDGET_MB = 24  # growth over the whole pipeline, any notebook
+
+
+def _noise_png(rng: random.Random, width=400, height=300) -> bytes:
+    buffer = io.BytesIO()
+    Image.frombytes("RGB", (width, height), rng.randbytes(width * height * 3)).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def _images_notebook(rng: random.Random):
+    """20 slides, each with a 350 KB incompressible PNG."""
+    cells = []
+    for i in range(20):
+        png = base64.b64encode(_noise_png(rng)).decode("ascii")
+        cells.append(new_markdown_cell(f"# Figure {i}"))
+        cells.append(new_code_cell("plot()", outputs=[
+            new_output("display_data", data={"image/png": png, "text/plain": "<Figure>"})]))
+    return new_notebook(cells=cells)
+
+
+def _tables_notebook(rng: random.Random):
+    """10 slides, each with a 200-row, 8-column HTML table (exported to .xlsx)."""
+    cells = []
+    for i in range(10):
+        header = "".join(f"<th>col{c}</th>" for c in range(8))
+        rows = "".join("<tr>" + "".join(f"<td>{rng.random():.6f}</td>" for _ in range(8))
+                       + "</tr>" for _ in range(200))
+        cells.append(new_markdown_cell(f"# Table {i}"))
+        cells.append(new_code_cell("df", outputs=[new_output("execute_result", data={
+            "text/html": f"<table><tr>{header}</tr>{rows}</table>", "text/plain": "df"})]))
+    return new_notebook(cells=cells)
+
+
+def _text_notebook(rng: random.Random):
+    """120 slides of bullets and prose, with short code cells and stream output."""
+    cells = []
+    for i in range(120):
+        bullets = "\n".join(f"- point {j}: {rng.random():.12f} **bold** `code`"
+                            for j in range(6))
+        cells.append(new_markdown_cell(f"# Slide {i}\n\nSome prose for slide {i}.\n\n{bullets}"))
+        cells.append(new_code_cell(f"x = {i}\nprint(x)", outputs=[
+            new_output("stream", name="stdout", text=f"{i}\n" * 20)]))
+    return new_notebook(cells=cells)
+
+
+NOTEBOOKS = {"images": _images_notebook, "tables": _tables_notebook, "text": _text_notebook}
+
+
+def write_sample_notebook(kind: str, directory: Path) -> Path:
+    path = Path(directory) / f"{kind}.ipynb"
+    with path.open("w", encoding="utf-8") as f:
+        nbformat.write(NOTEBOOKS[kind](random.Random(kind)), f)
+    return path
+
+
+class RssSampler:
+    """Peak growth of resident memory while in use, sampled from /proc (Linux only)."""
+
+    def __init__(self, interval: float = 0.002):
+        self.interval = interval
+        self.page_size = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+        self.start: Optional[int] = None
+        self.peak: Optional[int] = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def rss(self) -> Optional[int]:
+        try:
+            with open("/proc/self/statm") as f:
+                return int(f.read().split()[1]) * self.page_size
+        except OSError:
+            return None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak or 0, self.rss() or 0)
+
+    @property
+    def growth(self) -> Optional[int]:
+        if self.start is None or self.peak is None:
+            return None
+        return max(0, self.peak - self.start)
+
+    def __enter__(self) -> "RssSampler":
+        self.start = self.peak = self.rss()
+        if self.start is not None:
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        rss = self.rss()
+        if rss is not None and self.peak is not None:
+            self.peak = max(self.peak, rss)
+
+
+def reference_peak(notebook_path: Path) -> int:
+    """Peak bytes allocated reading the notebook with json.loads, the relative budgets' unit."""
+    tracemalloc.start()
+    try:
+        json.loads(notebook_path.read_text(encoding="utf-8"))
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+@dataclass
+class StageMemory:
+    peak_bytes: int  # traced peak above the bytes allocated when the stage started
+    retained_bytes: int  # traced bytes still allocated when it finished, likewise
+    seconds: float
+
+
+def measure_pipeline(notebook_path: Path, output_path: Path):
+    """
+    Run the four stages under tracemalloc. Returns ({stage: StageMemory},
+    peak RSS growth over the whole run or None where it can't be sampled).
+    """
+    stages: Dict[str, StageMemory] = {}
+    results = {}
+    steps = {
+        "load_notebook": lambda: parser.load_notebook(notebook_path),
+        "extract_cells": lambda: parser.extract_cells(results["load_notebook"]),
+        "merge_slide_groups": lambda: renderer._merge_slide_groups(results["extract_cells"]),
+        "render_slides": lambda: renderer.render_slides(results["merge_slide_groups"]),
+    }
+    renderer = PowerPointRenderer(output_path=output_path, include_attribution=False)
+    with RssSampler() as rss:
+        tracemalloc.start()
+        try:
+            for stage in STAGES:
+                before, _ = tracemalloc.get_traced_memory()
+                tracemalloc.reset_peak()
+                start = time.perf_counter()
+                results[stage] = steps[stage]()
+                seconds = time.perf_counter() - start
+                after, peak = tracemalloc.get_traced_memory()
+                stages[stage] = StageMemory(peak - before, after - before, seconds)
+        finally:
+            tracemalloc.stop()
+    return stages, rss.growth
+
+
+@pytest.fixture(scope="module")
+def notebooks(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("memory")
+    return {kind: write_sample_notebook(kind, directory) for kind in NOTEBOOKS}
+
+
+@pytest.fixture(scope="module")
+def measurements(notebooks):
+    return {kind: measure_pipeline(path, path.with_suffix(".pptx"))
+            for kind, path in notebooks.items()}
+
+
+@pytest.mark.parametrize("kind", sorted(NOTEBOOKS))
+@pytest.mark.parametrize("stage", STAGES)
+def test_stage_peak_relative_to_reading_the_file(notebooks, measurements, kind, stage):
+    reference = reference_peak(notebooks[kind])
+    peak = measurements[kind][0][stage].peak_bytes
+    budget = RELATIVE_BUDGETS[kind][stage]
+    assert peak <= budget * reference, (
+        f"{stage} on the {kind} notebook peaked at {peak / reference:.2f}x the "
+        f"json.loads reference, over its {budget}x budget")
+
+
+@absolute_budgets
+@pytest.mark.parametrize("kind", sorted(NOTEBOOKS))
+@pytest.mark.parametrize("stage", STAGES)
+def test_stage_peak_within_budget(measurements, kind, stage):
+    peak = measurements[kind][0][stage].peak_bytes
+    budget = BUDGETS_MB[kind][stage] * MB
+    assert peak <= budget, (f"{stage} on the {kind} notebook peaked at {peak / MB:.1f} MB, "
+                            f"over its {budget / MB:.1f} MB budget")
+
+
+@absolute_budgets
+@pytest.mark.parametrize("kind", sorted(NOTEBOOKS))
+def test_resident_memory_within_budget(measurements, kind):
+    growth = measurements[kind][1]
+    if growth is None:
+        pytest.skip("resident memory can't be sampled on this platform")
+    assert growth <= RSS_BUDGET_MB * MB, f"RSS grew by {growth / MB:.1f} MB"
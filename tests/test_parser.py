@@ -321,3 +321,54 @@ This notebook demonstrates a basic data analysis workflow using Python. We'll be
         assert parsed.paragraphs == [
             "This notebook demonstrates a basic data analysis workflow using Python. We'll begin by exploring a sample dataset, visualizing the raw data, and performing a linear regression analysis to uncover trends."
         ]
+
+
+def _flatten_recursively(children):
+    """The recursive flattening that flatten_ast_as_text must match exactly."""
+    parts = []
+    for child in children:
+        ctype = child.get("type")
+        if ctype == "text":
+            parts.append(child.get("raw", child.get("text", "")).strip())
+        elif ctype == "link":
+            label = _flatten_recursively(child.get("children", []))
+            parts.append(f"{label} ({child.get('attrs', {}).get('url', '')})")
+        elif "children" in child:
+            parts.append(_flatten_recursively(child["children"]))
+    return " ".join(parts).strip()
+
+
+def _random_ast(rng, depth):
+    nodes = []
+    for _ in range(rng.randint(0, 4)):
+        roll = rng.random()
+        if depth == 0 or roll < 0.35:
+            nodes.append({"type": "text", "raw": rng.choice(["", " ", "a", " b ", "c  d"])})
+        elif roll < 0.5:
+            nodes.append({"type": "link", "attrs": {"url": rng.choice(["", "u", " v "])},
+                          "children": _random_ast(rng, depth - 1)})
+        elif roll < 0.9:
+            nodes.append({"type": rng.choice(["paragraph", "strong", "emphasis", "list"]),
+                          "children": _random_ast(rng, depth - 1)})
+        else:
+            nodes.append({"type": "softbreak"})
+    return nodes
+
+
+def test_flatten_ast_as_text_matches_recursive_flattening():
+    import random
+
+    rng = random.Random(0)
+    for _ in range(5000):
+        ast = _random_ast(rng, rng.randint(0, 5))
+        assert parser.flatten_ast_as_text(ast) == _flatten_recursively(ast), ast
+
+
+def test_flatten_ast_as_text_handles_deep_nesting():
+    depth = 100_000  # far past the recursion limit
+    node = {"type": "text", "raw": "inner"}
+    for level in range(depth):
+        node = {"type": "emphasis" if level % 2 else "strong",
+                "children": [{"type": "text", "raw": "x"}, node]}
+    text = parser.flatten_ast_as_text([node])
+    assert text == "x " * depth + "inner"
@@ -0,0 +1,117 @@
+import base64
+import io
+
+import pytest
+from nbformat.v4 import new_code_cell, new_markdown_cell, new_output
+from PIL import Image
+from pptx import Presentation
+
+from jupdeck.core import inspector, parser, serialization
+from jupdeck.core.preview import HtmlPreviewRenderer
+from jupdeck.core.renderer import PowerPointRenderer, RendererBackend, render_with_backends
+
+
+def _png(size=(80, 60)) -> str:
+    buffer = io.BytesIO()
+    Image.effect_noise(size, 64).convert("RGB").save(buffer, "PNG")  # large enough to be lazy
+    return base64.b64encode(buffer.getvalue()).decode("ascii")
+
+
+@pytest.fixture
+def parse(write_notebook):
+    return lambda cells: parser.parse_notebook(write_notebook(cells))
+
+
+def _figure(title, payload, mime_type="image/png"):
+    return [new_markdown_cell(f"# {title}\n- a point\n\nSay why."),
+            new_code_cell("plot()", outputs=[
+                new_output("display_data", data={mime_type: payload}),
+                new_output("stream", name="stdout", text="loss 0.1\n")])]
+
+
+def test_preview_and_deck_share_one_parse(tmp_path, parse):
+    payload = _png()
+    long_text = new_markdown_cell("# Long\n" + "\n".join(f"- point {i} " + "word " * 30
+                                                         for i in range(40)))
+    parsed = parse(_figure("One", payload) + _figure("Two", _png()) + [long_text])
+    deck = PowerPointRenderer(tmp_path / "deck.pptx")
+    preview = HtmlPreviewRenderer(tmp_path / "deck.html")
+
+    render_with_backends(parsed, [deck, preview])
+
+    slides = Presentation(tmp_path / "deck.pptx").slides
+    assert len(preview.slides) == len(slides) == 4  # attribution included
+    assert preview.overflowing_slides == deck.overflowing_slides == [3]
+    page = (tmp_path / "deck.html").read_text(encoding="utf-8")
+    assert parsed["cells"][1].images[0].span is not None
+    assert f'src="data:image/png;base64,{payload}"' in page
+    assert 'class="slide overflow"' in page
+    assert "using JupDeck.</p>" in page
+    assert inspector.compare_with_notebook(inspector.inspect_deck(tmp_path / "deck.pptx"),
+                                           parsed) == []
+
+
+def test_speaker_notes(tmp_path, parse):
+    parsed = parse(_figure("One", _png()))
+
+    def notes(**options):
+        preview = HtmlPreviewRenderer(tmp_path / "p.html", include_attribution=False, **options)
+        preview.render_presentation(parsed)
+        return (tmp_path / "p.html").read_text(encoding="utf-8")
+
+    assert "<aside>Say why.</aside>" in notes()
+    assert "<aside>Say why.\nOutput:\nloss 0.1</aside>" in notes(output_notes=True)
+    assert "<aside>" not in notes(include_speaker_notes=False)
+
+
+def test_raw_image_bytes_are_written_to_a_sidecar_directory(tmp_path, parse):
+    parsed = parse(_figure("One", _png()) + _figure("Two", _png()))
+    serialization.save(parsed, tmp_path / "nb.jdeck")
+    loaded = serialization.load(tmp_path / "nb.jdeck")
+    assert loaded["cells"][1].images[0].blob is not None
+
+    preview = HtmlPreviewRenderer(tmp_path / "out" / "nb.html", include_attribution=False)
+    (tmp_path / "out").mkdir()
+    preview.render_presentation(loaded)
+
+    files = sorted((tmp_path / "out" / "nb_media").iterdir())
+    assert len(files) == 2 and all(path.suffix == ".png" for path in files)
+    assert files[0].read_bytes() in (image.to_bytes() for cell in parsed["cells"]
+                                     for image in cell.images)
+    page = (tmp_path / "out" / "nb.html").read_text(encoding="utf-8")
+    assert f'src="nb_media/{files[0].name}"' in page
+
+
+def test_figures_browsers_cannot_show_become_a_labelled_box(tmp_path, parse):
+    parsed = parse([
+        new_markdown_cell("# PDF"),
+        new_code_cell("plot()", outputs=[new_output(
+            "display_data", data={"application/pdf": base64.b64encode(b"%PDF-1.4").decode()})]),
+    ])
+    preview = HtmlPreviewRenderer(tmp_path / "p.html", include_attribution=False)
+    preview.render_presentation(parsed)
+    page = (tmp_path / "p.html").read_text(encoding="utf-8")
+    assert "application/pdf figure</div>" in page and "<img" not in page
+
+
+def test_tagged_tables_are_labelled_as_charts(tmp_path, parse):
+    table = ("<table><tr><th>month</th><th>north</th></tr>"
+             "<tr><td>Jan</td><td>10</td></tr><tr><td>Feb</td><td>12</td></tr></table>")
+    cell = new_code_cell("df", outputs=[new_output("execute_result", data={"text/html": table})])
+    cell.metadata["tags"] = ["jupdeck-chart-line"]
+    parsed = parse([new_markdown_cell("# Sales"), cell])
+
+    def render(**options):
+        preview = HtmlPreviewRenderer(tmp_path / "p.html", include_attribution=False, **options)
+        preview.render_presentation(parsed)
+        return (tmp_path / "p.html").read_text(encoding="utf-8")
+
+    assert "line chart: north (2 points)</div>" in render()
+    assert "<td>Feb</td>" in render(charts="off")
+
+
+def test_backend_interface_is_abstract():
+    with pytest.raises(TypeError):
+        RendererBackend()
+    assert isinstance(HtmlPreviewRenderer(), RendererBackend)
+    assert isinstance(PowerPointRenderer(), RendererBackend)
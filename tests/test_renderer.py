@@ -220,6 +220,9 @@ def test_render_multiple_images_on_slide(tmp_path):
 
     pictures = [shape for shape in slide.shapes if shape.shape_type == MSO_SHAPE_TYPE.PICTURE]
     assert len(pictures) == 3, f"Expected 3 images, found {len(pictures)}"
+    # One part for the three copies, indexed by a digest rather than the payload
+    assert len(set(renderer._image_parts.values())) == 1
+    assert minimal_png not in renderer._image_parts
 
 def test_can_render_presentation(tmp_path):
     minimal_png = (
@@ -0,0 +1,82 @@
+import hashlib
+import io
+import zipfile
+
+import pytest
+from nbformat.v4 import new_code_cell, new_markdown_cell, new_output
+
+from jupdeck.core import parser, reproducible
+from jupdeck.core.renderer import PowerPointRenderer
+from jupdeck.core.slide_cache import SlideCache
+
+CORE_XML = (b'<cp:coreProperties><dcterms:created xsi:type="dcterms:W3CDTF">'
+            b'2024-05-01T10:00:00Z</dcterms:created><dcterms:modified xsi:type="dcterms:W3CDTF">'
+            b"2024-05-02T11:30:00Z</dcterms:modified></cp:coreProperties>")
+
+
+@pytest.fixture
+def parsed(write_notebook, minimal_png):
+    rows = "".join(f"<tr><td>{i}</td><td>{i * 2}</td></tr>" for i in range(40))
+    cells = []
+    for i in range(4):
+        cells.append(new_markdown_cell(f"# Slide {i}\n\n- a point"))
+        cells.append(new_code_cell("plot()", outputs=[
+            new_output("display_data", data={"image/png": minimal_png})]))
+    cells.append(new_markdown_cell("# Long table"))
+    cells.append(new_code_cell("df", outputs=[new_output("execute_result", data={
+        "text/html": f"<table><tr><th>a</th><th>b</th></tr>{rows}</table>"})]))
+    return parser.parse_notebook(write_notebook(cells))
+
+
+def _zip(entries, date_time):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as z:
+        for name, blob in entries:
+            z.writestr(zipfile.ZipInfo(name, date_time=date_time), blob)
+    return buffer.getvalue()
+
+
+def _digests(directory):
+    return {path.name: hashlib.sha256(path.read_bytes()).hexdigest()
+            for path in sorted(directory.iterdir())}
+
+
+def test_normalize_package_ignores_times_and_entry_order():
+    entries = [("[Content_Types].xml", b"<Types/>"), ("ppt/b.xml", b"b"),
+               ("docProps/core.xml", CORE_XML), ("ppt/a.xml", b"a")]
+    first = reproducible.normalize_package(_zip(entries, (2024, 5, 1, 10, 0, 0)))
+    second = reproducible.normalize_package(
+        _zip(entries[:1] + entries[:0:-1], (2025, 1, 2, 3, 4, 6)))
+    assert first == second
+
+    with zipfile.ZipFile(io.BytesIO(first)) as z:
+        assert z.namelist() == ["[Content_Types].xml", "docProps/core.xml", "ppt/a.xml",
+                                "ppt/b.xml"]
+        assert {info.date_time for info in z.infolist()} == {(1980, 1, 1, 0, 0, 0)}
+        core = z.read("docProps/core.xml")
+    assert b">1980-01-01T00:00:00Z</dcterms:created>" in core
+    assert b">1980-01-01T00:00:00Z</dcterms:modified>" in core
+
+
+def test_source_date_epoch_sets_the_timestamp(monkeypatch):
+    monkeypatch.setenv("SOURCE_DATE_EPOCH", "1700000000")
+    data = reproducible.normalize_package(_zip([("docProps/core.xml", CORE_XML)],
+                                               (2024, 5, 1, 10, 0, 0)))
+    with zipfile.ZipFile(io.BytesIO(data)) as z:
+        assert z.infolist()[0].date_time == (2023, 11, 14, 22, 13, 20)
+        assert b"2023-11-14T22:13:20Z" in z.read("docProps/core.xml")
+
+
+def test_decks_and_table_files_are_identical_across_runs_and_workers(tmp_path, parsed):
+    digests = []
+    runs = [(1, None), (1, None), (2, None), (3, None),
+            (1, SlideCache(tmp_path / "cache")), (2, SlideCache(tmp_path / "cache"))]
+    for run, (workers, cache) in enumerate(runs):
+        output = tmp_path / f"run{run}" / "deck.pptx"
+        output.parent.mkdir()
+        PowerPointRenderer(output, input_path=tmp_path / "nb.ipynb", workers=workers,
+                           slide_cache=cache, reproducible=True).render_presentation(parsed)
+        digests.append(_digests(output.parent))
+
+    assert len(digests[0]) == 2  # the deck and the exported table
+    assert all(digest == digests[0] for digest in digests)
@@ -0,0 +1,122 @@
+import os
+import sys
+import time
+
+import pytest
+from nbformat.v4 import new_code_cell, new_markdown_cell, new_output
+from pptx import Presentation
+
+from jupdeck import cli
+from jupdeck.core import scheduler
+from jupdeck.core.scheduler import MB, JobCost
+
+TABLE_HTML = "<table><tr><th>a</th></tr><tr><td>1</td></tr></table>"
+
+
+def _timed_job(input_path, output_path):
+    """Records when it ran, for checking which jobs overlapped."""
+    start = time.time()
+    time.sleep(0.3)
+    return start, time.time()
+
+
+def _failing_job(input_path, output_path):
+    if "bad" in str(input_path):
+        raise ValueError("cannot convert")
+    return "ok"
+
+
+@pytest.fixture
+def fake_costs(monkeypatch):
+    """Predicted memory per job, by file name, instead of scanning the files."""
+    sizes = {}
+    monkeypatch.setattr(scheduler, "estimate_cost",
+                        lambda path: JobCost(file_bytes=sizes[str(path)]))
+    monkeypatch.setattr(scheduler, "BASE_BYTES", 0)
+    monkeypatch.setattr(scheduler, "TEXT_FACTOR", 1.0)
+    return sizes
+
+
+def test_estimate_cost_counts_cells_images_and_tables(write_notebook, minimal_png):
+    path = write_notebook([
+        new_markdown_cell("# Title"),
+        new_code_cell("plot()", outputs=[new_output("display_data",
+                                                     data={"image/png": minimal_png})]),
+        new_code_cell("df", outputs=[new_output("execute_result",
+                                                 data={"text/html": TABLE_HTML})]),
+    ])
+    cost = scheduler.estimate_cost(path)
+    assert cost.cells == 3
+    assert cost.image_bytes == len(minimal_png)
+    assert cost.table_bytes == len(TABLE_HTML) - len("</table>")
+    assert cost.file_bytes == path.stat().st_size
+    assert cost.predicted_bytes > scheduler.BASE_BYTES
+
+
+@pytest.fixture(params=[True, False], ids=["max_tasks_per_child", "pool_per_job"])
+def process_per_job(request, monkeypatch):
+    """Run the scheduler with and without max_tasks_per_child (Python 3.10 has none)."""
+    if request.param and sys.version_info < (3, 11):
+        pytest.skip("max_tasks_per_child needs Python 3.11")
+    monkeypatch.setattr(scheduler, "_HAS_MAX_TASKS_PER_CHILD", request.param)
+
+
+def _pid(input_path, output_path):
+    return os.getpid()
+
+
+def test_every_job_runs_in_a_fresh_process(tmp_path, fake_costs, process_per_job):
+    fake_costs.update({f"job{i}": MB for i in range(4)})
+    jobs = [(f"job{i}", tmp_path / f"{i}.pptx") for i in range(4)]
+    reports = scheduler.run_scheduled(jobs, _pid, workers=2)
+    assert [report.error for report in reports] == [None] * 4
+    assert len({report.result for report in reports}) == 4
+
+
+def test_largest_jobs_first_and_memory_ceiling_respected(tmp_path, fake_costs):
+    fake_costs.update({"small": 100 * MB, "large": 300 * MB, "medium": 200 * MB})
+    jobs = [(name, tmp_path / f"{name}.pptx") for name in ("small", "large", "medium")]
+
+    reports = scheduler.run_scheduled(jobs, _timed_job, workers=3, memory_limit=350 * MB)
+    runs = {report.input_path.name: report.result for report in reports}
+    assert [report.input_path.name for report in reports] == ["small", "large", "medium"]
+
+    # large (300) runs alone, since neither other job fits beside it; then medium + small
+    assert runs["large"][0] <= runs["medium"][0]
+    assert runs["large"][1] <= runs["medium"][0]
+    assert runs["large"][1] <= runs["small"][0]
+    assert all(report.peak_bytes > 0 for report in reports)
+
+
+def test_job_larger_than_ceiling_runs_alone(tmp_path, fake_costs):
+    fake_costs.update({"huge": 900 * MB, "small": 10 * MB})
+    jobs = [("small", tmp_path / "s.pptx"), ("huge", tmp_path / "h.pptx")]
+
+    reports = scheduler.run_scheduled(jobs, _timed_job, workers=2, memory_limit=500 * MB)
+    small, huge = (report.result for report in reports)
+    assert huge[0] >= small[1] or small[0] >= huge[1]  # never overlapping
+
+
+def test_failed_job_is_reported_and_others_finish(tmp_path, fake_costs):
+    fake_costs.update({"bad": MB, "good": MB})
+    reports = scheduler.run_scheduled([("bad", tmp_path / "b"), ("good", tmp_path / "g")],
+                                      _failing_job, workers=2)
+    assert reports[0].error == "ValueError: cannot convert"
+    assert (reports[1].result, reports[1].error) == ("ok", None)
+    assert "failed: ValueError" in scheduler.format_report(reports)
+
+
+def test_batch_with_memory_limit(tmp_path, write_notebook, monkeypatch, capsys):
+    inputs = [write_notebook([new_markdown_cell(f"# Deck {i}")], f"nb{i}.ipynb")
+              for i in range(3)]
+    argv = ["jupdeck", "batch", *map(str, inputs), "-o", str(tmp_path / "out"),
+            "--parallel", "2", "--memory-limit", "4096", "--memory-report"]
+    monkeypatch.setattr(sys, "argv", argv)
+    cli.main()
+    out = capsys.readouterr().out
+    assert "Built 3, skipped 0 up-to-date notebook(s)" in out
+    assert out.count("actual peak") == 3
+    assert Presentation(tmp_path / "out" / "nb2.pptx").slides[0].shapes.title.text == "Deck 2"
+
+    cli.main()
+    assert "Built 0, skipped 3 up-to-date notebook(s)" in capsys.readouterr().out
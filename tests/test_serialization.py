@@ -0,0 +1,114 @@
+import base64
+import json
+import sys
+
+import pytest
+from nbformat.v4 import new_code_cell, new_markdown_cell, new_output
+from pptx import Presentation
+
+from jupdeck import cli
+from jupdeck.core import parser, serialization
+from jupdeck.core.models import ImageData, ParsedCell
+from jupdeck.core.renderer import PowerPointRenderer
+
+
+@pytest.fixture
+def parsed_notebook(minimal_png):
+    return {
+        "metadata": {"kernelspec": {"name": "python3"}},
+        "skipped_cells": 1,
+        "cells": [
+            ParsedCell(type="markdown", title="Results", bullets=["One", "Two"],
+                       paragraphs=["Note"], images=[ImageData("image/png", minimal_png)],
+                       metadata={"new_slide": True}),
+            ParsedCell(type="code", code="df", table=[{"a": 1, "b": "x"}],
+                       images=[ImageData("image/png", minimal_png)],
+                       raw_outputs=[{"output_type": "stream", "text": "hi"}]),
+        ],
+    }
+
+
+class TestJson:
+    def test_round_trip(self, tmp_path, parsed_notebook):
+        path = tmp_path / "parsed.json"
+        serialization.dump_json(parsed_notebook, path)
+        loaded = serialization.load(path)
+
+        assert loaded["metadata"] == parsed_notebook["metadata"]
+        assert loaded["skipped_cells"] == 1
+        assert loaded["cells"][0] == parsed_notebook["cells"][0]
+        assert loaded["cells"][1].raw_outputs is None  # dropped unless requested
+        assert json.loads(path.read_text())["schema_version"] == serialization.SCHEMA_VERSION
+
+    def test_include_raw_outputs(self, parsed_notebook):
+        data = serialization.notebook_to_dict(parsed_notebook, include_raw_outputs=True)
+        assert data["cells"][1]["raw_outputs"] == [{"output_type": "stream", "text": "hi"}]
+
+    def test_newer_schema_is_rejected(self, tmp_path, parsed_notebook):
+        data = serialization.notebook_to_dict(parsed_notebook)
+        data["schema_version"] = serialization.SCHEMA_VERSION + 1
+        with pytest.raises(ValueError, match="schema version"):
+            serialization.notebook_from_dict(data)
+
+
+class TestBinary:
+    def test_round_trip(self, tmp_path, parsed_notebook, minimal_png):
+        path = tmp_path / "parsed.jdeck"
+        serialization.save(parsed_notebook, path)
+        assert serialization.is_binary(path)
+
+        loaded = serialization.load(path)
+        cells = loaded["cells"]
+        assert loaded["metadata"] == parsed_notebook["metadata"]
+        assert cells[0].title == "Results"
+        assert cells[0].metadata == {"new_slide": True}
+        assert cells[1].table == [{"a": 1, "b": "x"}]
+        assert isinstance(cells[0].images[0].blob, memoryview)
+        assert cells[0].images[0].to_bytes() == base64.b64decode(minimal_png)
+
+    def test_identical_images_are_stored_once(self, tmp_path, parsed_notebook, minimal_png):
+        path = tmp_path / "parsed.jdeck"
+        serialization.dump_binary(parsed_notebook, path)
+        assert path.read_bytes().count(base64.b64decode(minimal_png)) == 1
+        assert minimal_png.encode() not in path.read_bytes()
+
+    def test_without_mmap(self, tmp_path, parsed_notebook, minimal_png):
+        path = tmp_path / "parsed.jdeck"
+        serialization.dump_binary(parsed_notebook, path)
+        loaded = serialization.load_binary(path, use_mmap=False)
+        assert loaded["cells"][1].images[0].to_bytes() == base64.b64decode(minimal_png)
+
+    def test_not_a_container(self, tmp_path):
+        path = tmp_path / "other.jdeck"
+        path.write_bytes(b"not a jupdeck file")
+        with pytest.raises(ValueError, match="not a jupdeck binary file"):
+            serialization.load_binary(path)
+
+    def test_loaded_cells_can_be_rendered(self, tmp_path, parsed_notebook):
+        path = tmp_path / "parsed.jdeck"
+        serialization.dump_binary(parsed_notebook, path)
+        output = tmp_path / "deck.pptx"
+        PowerPointRenderer(output, include_attribution=False).render_presentation(
+            serialization.load(path))
+        assert len(Presentation(output).slides) == 1
+
+
+def test_cli_parse_then_render(tmp_path, write_notebook, minimal_png, monkeypatch):
+    input_nb = write_notebook([
+        new_markdown_cell("# Plot"),
+        new_code_cell("plot()", outputs=[
+            new_output("display_data", data={"image/png": minimal_png})]),
+    ], "analysis.ipynb")
+    parsed_file = tmp_path / "analysis.jdeck"
+    output_pptx = tmp_path / "analysis.pptx"
+
+    monkeypatch.setattr(sys, "argv", ["jupdeck", "parse", str(input_nb), str(parsed_file)])
+    cli.main()
+    monkeypatch.setattr(sys, "argv", ["jupdeck", "render", str(parsed_file), str(output_pptx)])
+    cli.main()
+
+    prs = Presentation(output_pptx)
+    assert len(prs.slides) == 2  # content + attribution
+    attribution = " ".join(s.text for s in prs.slides[1].shapes if s.has_text_frame)
+    assert "analysis.ipynb" in attribution
+    assert len(parser.parse_notebook(input_nb)["cells"]) == 2
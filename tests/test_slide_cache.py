@@ -0,0 +1,159 @@
+import base64
+import io
+import pickle
+import random
+import sys
+
+from nbformat.v4 import new_markdown_cell
+from PIL import Image
+from pptx import Presentation
+from pptx.enum.shapes import MSO_SHAPE_TYPE
+
+from jupdeck import cli
+from jupdeck.core import slide_cache
+from jupdeck.core.assembly import SlidePart
+from jupdeck.core.models import ImageData, ParsedCell
+from jupdeck.core.renderer import PowerPointRenderer
+from jupdeck.core.slide_cache import SlideCache
+
+
+def _image(seed: int) -> ImageData:
+    rng = random.Random(seed)
+    buffer = io.BytesIO()
+    Image.frombytes("RGB", (32, 24), rng.randbytes(32 * 24 * 3)).save(buffer, "PNG")
+    return ImageData("image/png", base64.b64encode(buffer.getvalue()).decode("ascii"))
+
+
+def _slides(n: int = 4, changed: int | None = None):
+    return [
+        ParsedCell(
+            type="markdown",
+            title=f"Slide {i}" + (" (edited)" if i == changed else ""),
+            bullets=[f"Point {i}.{j}" for j in range(3)],
+            paragraphs=[f"Note {i}"],
+            images=[_image(i)],
+            table=[{"metric": f"m{r}", "value": r * i} for r in range(3)],
+        )
+        for i in range(n)
+    ]
+
+
+def _describe(path):
+    slides = []
+    for slide in Presentation(path).slides:
+        texts = [shape.text_frame.text for shape in slide.shapes if shape.has_text_frame]
+        pictures = [shape.image.sha1 for shape in slide.shapes
+                    if shape.shape_type == MSO_SHAPE_TYPE.PICTURE]
+        tables = [[cell.text for row in shape.table.rows for cell in row.cells]
+                  for shape in slide.shapes if shape.has_table]
+        notes = slide.notes_slide.notes_text_frame.text if slide.has_notes_slide else None
+        slides.append((slide.slide_id, texts, pictures, tables, notes))
+    return slides
+
+
+def _render(path, cache, slides, workers=1):
+    renderer = PowerPointRenderer(output_path=path, include_attribution=False,
+                                  workers=workers, slide_cache=cache)
+    renderer.render_slides(slides)
+    return renderer
+
+
+def test_second_run_reuses_every_slide(tmp_path):
+    _render(tmp_path / "first.pptx", SlideCache(tmp_path / "cache"), _slides())
+    cache = SlideCache(tmp_path / "cache")
+    _render(tmp_path / "second.pptx", cache, _slides())
+
+    assert (cache.hits, cache.misses) == (4, 0)
+    assert cache.hit_rate == 1.0
+    assert _describe(tmp_path / "second.pptx") == _describe(tmp_path / "first.pptx")
+    assert "4 hit(s), 0 miss(es) (100% hit rate)" in cache.format_stats()
+
+
+def test_changed_slide_is_rendered_again(tmp_path):
+    _render(tmp_path / "first.pptx", SlideCache(tmp_path / "cache"), _slides())
+    cache = SlideCache(tmp_path / "cache")
+    _render(tmp_path / "second.pptx", cache, _slides(changed=2))
+
+    assert (cache.hits, cache.misses) == (3, 1)
+    assert "Slide 2 (edited)" in _describe(tmp_path / "second.pptx")[2][1]
+
+
+def test_options_are_part_of_the_key(tmp_path):
+    cache = SlideCache(tmp_path / "cache")
+    _render(tmp_path / "first.pptx", cache, _slides(1))
+    renderer = PowerPointRenderer(output_path=tmp_path / "no_notes.pptx",
+                                  include_speaker_notes=False, slide_cache=cache)
+    key = renderer.slide_cache_key(_slides(1)[0])
+    assert cache.get(key) is None
+
+
+def test_parallel_render_uses_cache(tmp_path):
+    _render(tmp_path / "sequential.pptx", SlideCache(tmp_path / "cache"), _slides(6))
+    cache = SlideCache(tmp_path / "cache")
+    _render(tmp_path / "parallel.pptx", cache, _slides(6, changed=4), workers=2)
+
+    assert (cache.hits, cache.misses) == (5, 1)
+    sequential = _describe(tmp_path / "sequential.pptx")
+    parallel = _describe(tmp_path / "parallel.pptx")
+    assert [s for i, s in enumerate(parallel) if i != 4] == \
+        [s for i, s in enumerate(sequential) if i != 4]
+
+
+def test_exported_tables_are_not_cached(tmp_path):
+    cache = SlideCache(tmp_path / "cache")
+    large = ParsedCell(type="markdown", title="Big", table=[{"a": i} for i in range(50)])
+    renderer = _render(tmp_path / "deck.pptx", cache, [large])
+    assert renderer.slide_cache_key(large) is None
+    assert (cache.hits, cache.misses) == (0, 0)
+
+
+def test_cache_is_bounded(tmp_path):
+    cache = SlideCache(tmp_path / "cache", max_bytes=1)
+    _render(tmp_path / "deck.pptx", cache, _slides(3))
+    assert cache.evictions >= 3
+    assert not list((tmp_path / "cache").glob("*.slide"))
+
+
+class _WritesAFile:
+    def __init__(self, path):
+        self.path = path
+
+    def __reduce__(self):
+        return open, (str(self.path), "w")
+
+
+def test_entries_are_data_only(tmp_path):
+    cache = SlideCache(tmp_path / "cache")
+    part = SlidePart(2, b"<p:spTree/>", image_rels={"rId2": "ab"},
+                     chart_rels={"rId3": (b"<c:chartSpace/>", None)}, notes_xml=b"<p:txBody/>")
+    cache.put("key", part, {"ab": b"\x89PNG", "unused": b"x"})
+    assert cache.get("key") == (part, {"ab": b"\x89PNG"})
+
+    # A pickle planted in a shared cache directory is never loaded
+    marker = tmp_path / "pwned"
+    (tmp_path / "cache" / "planted.slide").write_bytes(pickle.dumps(_WritesAFile(marker)))
+    (tmp_path / "cache" / "cut.slide").write_bytes(
+        (tmp_path / "cache" / "key.slide").read_bytes()[:-3])
+    assert cache.get("planted") is None and cache.get("cut") is None
+    assert not marker.exists()
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_fingerprint_depends_on_content_and_options():
+    cell = ParsedCell(type="markdown", title="T", images=[_image(1)])
+    same = ParsedCell(type="markdown", title="T", images=[_image(1)])
+    other = ParsedCell(type="markdown", title="T", images=[_image(2)])
+    assert slide_cache.fingerprint(cell, {}) == slide_cache.fingerprint(same, {})
+    assert slide_cache.fingerprint(cell, {}) != slide_cache.fingerprint(other, {})
+    assert slide_cache.fingerprint(cell, {}) != slide_cache.fingerprint(cell, {"x": 1})
+
+
+def test_cli_reports_hit_rate(tmp_path, write_notebook, monkeypatch, capsys):
+    notebook = write_notebook([new_markdown_cell("# A"), new_markdown_cell("# B")])
+    argv = ["jupdeck", "convert", str(notebook), str(tmp_path / "nb.pptx"), "--force",
+            "--slide-cache", str(tmp_path / "cache")]
+
+    monkeypatch.setattr(sys, "argv", argv)
+    cli.main()
+    cli.main()
+    assert "2 hit(s), 0 miss(es)" in capsys.readouterr().out
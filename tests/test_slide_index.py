@@ -0,0 +1,106 @@
+import sys
+from unittest import mock
+
+import pytest
+from nbformat.v4 import new_code_cell, new_markdown_cell, new_notebook, new_output, new_raw_cell
+from pptx import Presentation
+
+from jupdeck import cli
+from jupdeck.core import parser, slide_index
+from jupdeck.core.renderer import merge_slide_groups
+from jupdeck.core.slide_index import SlideSelectionError
+
+TABLE_HTML = "<table><tr><th>a</th></tr><tr><td>1</td></tr></table>"
+
+
+@pytest.fixture
+def notebook(write_notebook):
+    return write_notebook([
+        new_code_cell("setup()"),
+        new_markdown_cell("# Intro\n\n- hello"),
+        new_markdown_cell("Title\n=====\n\n- setext heading"),
+        new_markdown_cell("## Not a slide\n\n```\n# a comment in a fence\n```"),
+        new_markdown_cell("<!-- jupdeck: section -->\n# Results\n\n- what we found"),
+        new_code_cell("df", outputs=[new_output("execute_result",
+                                                data={"text/html": TABLE_HTML})]),
+        new_markdown_cell("# Hidden\n\n- skipped", metadata={"tags": ["jupdeck-hide"]}),
+        new_markdown_cell("<!-- jupdeck: new-slide -->\n- continued"),
+        new_markdown_cell("<!-- jupdeck: section -->\n# Outlook"),
+    ], "long.ipynb")
+
+
+def _full_groups(path):
+    return merge_slide_groups(parser.parse_notebook(path)["cells"])
+
+
+def test_index_matches_merge_slide_groups(notebook):
+    index = slide_index.build_index(parser.load_notebook(notebook))
+    groups = _full_groups(notebook)
+    assert len(index.slides) == len(groups)
+    assert [s.title for s in index.slides] == [g.title or "" for g in groups]
+    assert [s.cell for s in index.slides] == [0, 1, 2, 4, 7, 8]
+
+
+def test_raw_cells_never_start_a_slide():
+    nb = new_notebook(cells=[new_raw_cell("---\ntitle: draft\n---"),
+                             new_code_cell("setup()"), new_markdown_cell("# Intro")])
+    index = slide_index.build_index(nb)
+    assert [(s.slide, s.cell, s.title) for s in index.slides] == [(1, 1, ""), (2, 2, "Intro")]
+    assert len(merge_slide_groups(parser.parse_notebook_node(nb)["cells"])) == 2
+
+
+def test_selected_slides_equal_the_same_slides_of_a_full_parse(notebook):
+    full = _full_groups(notebook)
+    parsed = slide_index.parse_notebook_slides(notebook, slides=[(3, 4)])
+    assert parsed["selected_slides"] == [3, 4]
+    assert parsed["total_slides"] == 6
+    assert merge_slide_groups(parsed["cells"]) == full[2:4]
+
+
+def test_only_selected_cells_are_parsed(notebook):
+    with mock.patch.object(parser.pd, "read_html") as read_html:
+        slide_index.parse_notebook_slides(notebook, slides=[(1, 2)])
+    read_html.assert_not_called()
+
+
+def test_sections(notebook):
+    index = slide_index.build_index(parser.load_notebook(notebook))
+    assert [(title, list(numbers)) for title, numbers in index.sections()] == \
+        [("", [1, 2, 3]), ("Results", [4, 5]), ("Outlook", [6])]
+    assert index.select(sections=["results"]) == [4, 5]
+    with pytest.raises(SlideSelectionError, match="no section titled 'Methods'"):
+        index.select(sections=["Methods"])
+    with pytest.raises(SlideSelectionError, match="out of range"):
+        index.select(slides=[(9, None)])
+
+
+def test_parse_and_format_ranges():
+    assert slide_index.parse_slide_ranges("10-20, 3,40-") == [(10, 20), (3, 3), (40, None)]
+    assert slide_index.format_slide_numbers([1, 2, 3, 7, 9, 10]) == "1-3, 7, 9-10"
+    for text in ("0", "5-2", "a-b", ""):
+        with pytest.raises(ValueError):
+            slide_index.parse_slide_ranges(text)
+
+
+def test_cached_index_is_reused_until_the_notebook_changes(notebook, write_notebook):
+    nb = parser.load_notebook(notebook)
+    first = slide_index.load_index(notebook, nb)
+    assert slide_index.index_path(notebook).exists()
+
+    with mock.patch.object(slide_index, "build_index") as build:
+        assert slide_index.load_index(notebook, nb) == first
+    build.assert_not_called()
+
+    nb.cells.append(new_markdown_cell("# Appendix"))
+    write_notebook(nb, notebook.name)
+    assert len(slide_index.load_index(notebook, nb).slides) == len(first.slides) + 1
+
+
+def test_cli_converts_a_section(notebook, tmp_path, monkeypatch, capsys):
+    output = tmp_path / "results.pptx"
+    monkeypatch.setattr(sys, "argv", ["jupdeck", "convert", str(notebook), str(output),
+                                      "--section", "Results", "--no-attribution",
+                                      "--cache-index"])
+    cli.main()
+    assert [s.shapes.title.text for s in Presentation(output).slides] == ["Results", ""]
+    assert "Selected slide(s) 4-5 of 6" in capsys.readouterr().out
@@ -0,0 +1,117 @@
+import json
+import sys
+
+import pandas as pd
+from nbformat.v4 import new_markdown_cell
+from pptx import Presentation
+
+from jupdeck import cli
+from jupdeck.core import split
+from jupdeck.core.models import ImageData, ParsedCell
+from jupdeck.core.split import SplitPolicy
+
+
+def _notebook(n_slides: int, sections=()):
+    cells = []
+    for i in range(n_slides):
+        if i in sections:
+            cells.append(ParsedCell(type="markdown", title=f"Slide {i}", bullets=[f"point {i}"],
+                                    metadata={"section": True}))
+        else:
+            cells.append(ParsedCell(type="markdown", title=f"Slide {i}", bullets=[f"point {i}"]))
+    return {"metadata": {}, "cells": cells}
+
+
+def _titles(path):
+    return [slide.shapes.title.text for slide in Presentation(path).slides]
+
+
+def test_plan_by_slide_count():
+    groups = _notebook(7)["cells"]
+    assert split.plan_parts(groups, SplitPolicy(max_slides=3)) == \
+        [range(0, 3), range(3, 6), range(6, 7)]
+
+
+def test_plan_by_sections():
+    groups = _notebook(6, sections=(0, 2, 5))["cells"]
+    assert split.plan_parts(groups, SplitPolicy(by_section=True)) == \
+        [range(0, 2), range(2, 5), range(5, 6)]
+
+
+def test_plan_by_bytes_keeps_oversized_slides_whole():
+    image = ImageData("image/png", "A" * 40_000)  # ~30 kB decoded
+    groups = [ParsedCell(type="markdown", title=f"S{i}", images=[image]) for i in range(4)]
+    assert split.plan_parts(groups, SplitPolicy(max_bytes=70_000)) == \
+        [range(0, 2), range(2, 4)]
+    assert split.plan_parts(groups, SplitPolicy(max_bytes=1)) == \
+        [range(i, i + 1) for i in range(4)]
+
+
+def test_split_writes_parts_and_index(tmp_path):
+    output = tmp_path / "deck.pptx"
+    index = split.split_presentation(_notebook(5), output, SplitPolicy(max_slides=2),
+                                     workers=2, input_path=tmp_path / "big.ipynb")
+
+    assert [part.path for part in index.parts] == \
+        ["deck_part1.pptx", "deck_part2.pptx", "deck_part3.pptx"]
+    assert _titles(tmp_path / "deck_part1.pptx") == ["Slide 0", "Slide 1"]
+    assert _titles(tmp_path / "deck_part3.pptx")[0] == "Slide 4"
+    assert len(Presentation(tmp_path / "deck_part3.pptx").slides) == 2  # plus attribution
+    assert not output.exists()
+
+    saved = json.loads((tmp_path / "deck_parts.json").read_text())
+    assert saved["source"] == "big.ipynb"
+    assert saved["slides"] == 6
+    assert [(p["first_slide"], p["last_slide"]) for p in saved["parts"]] == \
+        [(1, 2), (3, 4), (5, 6)]
+    assert saved["parts"][1]["title"] == "Slide 2"
+
+
+def test_large_tables_in_different_parts_export_to_different_files(tmp_path):
+    cells = [ParsedCell(type="markdown", title=f"Table {i}",
+                        table=[{"part": i, "row": row} for row in range(30)]) for i in range(4)]
+    index = split.split_presentation({"cells": cells}, tmp_path / "deck.pptx",
+                                     SplitPolicy(max_slides=2), workers=2,
+                                     include_attribution=False)
+
+    assert len(index.parts) == 2
+    exported = sorted(tmp_path.glob("slide_*_table_1.xlsx"))
+    assert len(exported) == 4
+    assert sorted(pd.read_excel(path)["part"][0] for path in exported) == [0, 1, 2, 3]
+    for part in index.parts:
+        for slide in Presentation(tmp_path / part.path).slides:
+            note = next(shape.text_frame.text for shape in slide.shapes
+                        if shape.has_text_frame and "truncated" in shape.text_frame.text)
+            assert f"slide_{slide.slide_id}_table_1.xlsx" in note
+            table = pd.read_excel(tmp_path / f"slide_{slide.slide_id}_table_1.xlsx")
+            assert f"Table {table['part'][0]}" == slide.shapes.title.text
+
+
+def test_fewer_parts_remove_stale_ones(tmp_path):
+    output = tmp_path / "deck.pptx"
+    split.split_presentation(_notebook(4), output, SplitPolicy(max_slides=1))
+    assert (tmp_path / "deck_part4.pptx").exists()
+    split.split_presentation(_notebook(4), output, SplitPolicy(max_slides=2))
+    assert sorted(p.name for p in tmp_path.glob("*.pptx")) == \
+        ["deck_part1.pptx", "deck_part2.pptx"]
+
+
+def test_section_directive_starts_a_slide_and_a_part(tmp_path, write_notebook, monkeypatch,
+                                                     capsys):
+    notebook = write_notebook([
+        new_markdown_cell("# Intro\n\n- hello"),
+        new_markdown_cell("# Method\n\n- how"),
+        new_markdown_cell("<!-- jupdeck: section -->\n# Results\n\n- what"),
+        new_markdown_cell("- more results"),
+    ], "report.ipynb")
+
+    monkeypatch.setattr(sys, "argv", ["jupdeck", "convert", str(notebook),
+                                      str(tmp_path / "report.pptx"), "--split-sections",
+                                      "--no-attribution"])
+    cli.main()
+    assert _titles(tmp_path / "report_part1.pptx") == ["Intro", "Method"]
+    assert _titles(tmp_path / "report_part2.pptx") == ["Results"]
+    assert "report_part2.pptx: slides 3-3" in capsys.readouterr().out
+
+    cli.main()
+    assert "Up to date" in capsys.readouterr().out
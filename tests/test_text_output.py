@@ -0,0 +1,112 @@
+import tracemalloc
+
+from nbformat.v4 import new_code_cell, new_markdown_cell, new_output
+from pptx import Presentation
+
+from jupdeck.core import parser
+from jupdeck.core.renderer import PowerPointRenderer
+from jupdeck.core.text_output import HeadTailBuffer, capture_text_outputs
+
+
+def _stream(text, name="stdout"):
+    return new_output("stream", name=name, text=text)
+
+
+def test_buffer_keeps_head_and_tail_lines():
+    buffer = HeadTailBuffer(head=2, tail=3)
+    buffer.write("".join(f"line {i}\n" for i in range(100)))
+    assert buffer.lines() == ["line 0", "line 1", "[... 95 line(s) omitted ...]",
+                              "line 97", "line 98", "line 99"]
+
+
+def test_buffer_joins_lines_across_writes_and_cuts_long_lines():
+    buffer = HeadTailBuffer(max_line_chars=5)
+    for piece in ["ab", "c\nde", "fghij", "k\nlast"]:
+        buffer.write(piece)
+    assert buffer.lines() == ["abc", "defgh…", "last"]
+
+
+def test_carriage_return_keeps_the_final_state_of_a_line():
+    buffer = HeadTailBuffer()
+    buffer.write("progress 10%\rprogress 50%")
+    buffer.write("\rprogress 100%\ndone\n")
+    assert buffer.getvalue() == "progress 100%\ndone"
+
+
+def test_crlf_line_endings_keep_their_lines():
+    buffer = HeadTailBuffer()
+    buffer.write("hello\r\nworld\r\n")
+    assert buffer.getvalue() == "hello\nworld"
+
+    buffer = HeadTailBuffer()
+    for piece in ["step 1\r", "\nstep 2\r", "step 3\r"]:  # "\r\n" split across writes
+        buffer.write(piece)
+    assert buffer.getvalue() == "step 1\nstep 3"
+
+
+def test_buffer_memory_is_bounded_by_its_size():
+    buffer = HeadTailBuffer()
+    chunk = "".join(f"log line {i} " + "x" * 100 + "\n" for i in range(1000))
+    tracemalloc.start()
+    try:
+        for _ in range(200):  # about 22 MB of output
+            buffer.write(chunk)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert peak < 100 * 1024
+    assert buffer.omitted == 200 * 1000 - 20
+
+
+def test_capture_covers_streams_and_plain_text_results_only():
+    outputs = [
+        _stream("fitting\n"),
+        _stream("warning: slow", name="stderr"),
+        new_output("execute_result", data={"text/plain": "0.93"}),
+        new_output("execute_result", data={"text/plain": "df", "text/html": "<table/>"}),
+        new_output("display_data", data={"text/plain": "<Figure>", "image/png": "iVBOR"}),
+        new_output("error", ename="E", evalue="", traceback=[]),
+    ]
+    assert capture_text_outputs(outputs) == "fitting\nwarning: slow\n0.93"
+    assert capture_text_outputs([new_output("execute_result", data={"text/html": "x"})]) is None
+
+
+def test_parsed_cell_keeps_an_excerpt_instead_of_the_streams():
+    cell = new_code_cell("train()", outputs=[
+        _stream("".join(f"epoch {i}\n" for i in range(10000))),
+        new_output("execute_result", data={"text/plain": "'done'"}),
+    ])
+    parsed = parser.parse_code_cell(cell)
+    lines = parsed.text_output.split("\n")
+    assert lines[:2] == ["epoch 0", "epoch 1"] and lines[-2:] == ["epoch 9999", "'done'"]
+    assert len(lines) == 21
+    assert parsed.raw_outputs[0] == {"output_type": "stream", "name": "stdout"}
+
+
+def test_raw_outputs_drop_plain_text_kept_in_the_excerpt():
+    result = new_output("execute_result", data={"text/plain": "x" * 10_000},
+                        execution_count=1)
+    figure = new_output("display_data", data={"text/plain": "<Figure>", "image/png": "iVBOR"})
+    parsed = parser.parse_code_cell(new_code_cell("big", outputs=[result, figure]))
+    assert parsed.text_output == "x" * 200 + "…"
+    assert parsed.raw_outputs[0]["data"] == {}
+    assert parsed.raw_outputs[0]["execution_count"] == 1
+    assert parsed.raw_outputs[1]["data"] == figure["data"]  # not in the excerpt
+    assert result["data"]["text/plain"] == "x" * 10_000  # the notebook is not modified
+
+
+def test_output_notes(tmp_path, write_notebook):
+    parsed = parser.parse_notebook(write_notebook([
+        new_markdown_cell("# Training"),
+        new_code_cell("train()", outputs=[_stream("epoch 1\nepoch 2\n")]),
+    ]))
+
+    def notes(**options):
+        deck = tmp_path / "deck.pptx"
+        PowerPointRenderer(deck, include_attribution=False, **options).render_presentation(parsed)
+        slide = Presentation(deck).slides[0]
+        return slide.notes_slide.notes_text_frame.text if slide.has_notes_slide else ""
+
+    assert "epoch" not in notes()
+    assert notes(output_notes=True).endswith("Output:\nepoch 1\nepoch 2")
+    assert notes(output_notes=True, workers=2).endswith("Output:\nepoch 1\nepoch 2")
@@ -0,0 +1,87 @@
+from lxml import etree
+from pptx import Presentation
+from pptx.util import Pt
+
+from jupdeck.core.models import ParsedCell
+from jupdeck.core.renderer import PowerPointRenderer
+from jupdeck.core.textframe import ParagraphStyle, paragraph_xml, write_paragraphs
+
+TEXTS = [
+    "Plain bullet",
+    "",
+    "Two\nlines",
+    "Vertical\vtab and trailing break\n",
+    "Markup <b> & \"quotes\" 'too'",
+    "Control\x01chars\x1f and\ttab\rreturn",
+    "Unicode: ünïcødé → ✓ 🎉",
+]
+
+
+def _text_frame():
+    slide = Presentation().slides.add_slide(Presentation().slide_layouts[1])
+    return slide.placeholders[1].text_frame
+
+
+def _xml(text_frame) -> bytes:
+    return etree.tostring(text_frame._txBody)
+
+
+def _write_bullets_per_paragraph(text_frame, texts, font_size):
+    """How the renderer wrote bullets before the bulk writer."""
+    for i, text in enumerate(texts):
+        p = text_frame.paragraphs[0] if i == 0 else text_frame.add_paragraph()
+        p.text = text
+        p.level = 0
+        p.font.size = Pt(font_size)
+        p.space_after = Pt(6)
+        p.space_before = Pt(2)
+
+
+def test_bullets_match_python_pptx():
+    expected, actual = _text_frame(), _text_frame()
+    _write_bullets_per_paragraph(expected, TEXTS, 18)
+    write_paragraphs(actual._txBody, TEXTS,
+                     ParagraphStyle(font_size=18, space_before=2, space_after=6))
+    assert _xml(actual) == _xml(expected)
+
+
+def test_appended_notes_match_python_pptx():
+    expected, actual = _text_frame(), _text_frame()
+    for text in TEXTS:
+        expected.add_paragraph().text = text
+    write_paragraphs(actual._txBody, TEXTS, append=True)
+    assert _xml(actual) == _xml(expected)
+
+
+def test_replacing_removes_existing_paragraphs():
+    text_frame = _text_frame()
+    text_frame.text = "old\nparagraphs"
+    write_paragraphs(text_frame._txBody, ["new"])
+    assert [p.text for p in text_frame.paragraphs] == ["new"]
+
+
+def test_nothing_to_write_leaves_text_frame_alone():
+    text_frame = _text_frame()
+    before = _xml(text_frame)
+    write_paragraphs(text_frame._txBody, [])
+    assert _xml(text_frame) == before
+
+
+def test_paragraph_xml():
+    assert paragraph_xml("") == "<a:p/>"
+    assert paragraph_xml("a\nb") == \
+        "<a:p><a:r><a:t>a</a:t></a:r><a:br/><a:r><a:t>b</a:t></a:r></a:p>"
+
+
+def test_rendered_slide_keeps_bullets_and_notes(tmp_path):
+    cell = ParsedCell(type="markdown", title="T", bullets=["one", "two"],
+                      paragraphs=["note one", "note two"])
+    path = tmp_path / "deck.pptx"
+    PowerPointRenderer(output_path=path, include_attribution=False).render_slides([cell])
+
+    slide = Presentation(path).slides[0]
+    paragraphs = slide.placeholders[1].text_frame.paragraphs
+    assert [p.text for p in paragraphs] == ["one", "two"]
+    assert paragraphs[0].font.size == Pt(18)
+    assert paragraphs[1].space_after == Pt(6)
+    assert slide.notes_slide.notes_text_frame.text == "\nnote one\nnote two"
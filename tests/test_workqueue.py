@@ -0,0 +1,153 @@
+import multiprocessing
+import os
+import sys
+import time
+
+import pytest
+from nbformat.v4 import new_markdown_cell
+from pptx import Presentation
+
+from jupdeck import cli
+from jupdeck.core import workqueue
+from jupdeck.core.workqueue import WorkQueue
+
+
+@pytest.fixture
+def notebooks(write_notebook):
+    return [write_notebook([new_markdown_cell(f"# Notebook {i}")], f"notebooks/nb{i}.ipynb")
+            for i in range(6)]
+
+
+def _work(queue_dir):
+    workqueue.run_worker(WorkQueue(queue_dir), poll_interval=0.01, exit_when_idle=True)
+
+
+def _make_stale(queue, job):
+    old = time.time() - 3600
+    os.utime(queue.directory / "claimed" / f"{job.id}.json", (old, old))
+
+
+def test_workers_in_several_processes_convert_each_job_once(tmp_path, notebooks):
+    queue = WorkQueue(tmp_path / "queue")
+    jobs = [queue.submit(path, tmp_path / "out" / f"{path.stem}.pptx") for path in notebooks]
+
+    processes = [multiprocessing.Process(target=_work, args=(queue.directory,))
+                 for _ in range(3)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(timeout=120)
+        assert process.exitcode == 0
+
+    assert queue.counts() == {"pending": 0, "claimed": 0, "done": 6, "failed": 0}
+    for i, job in enumerate(jobs):
+        status = queue.status(job.id)
+        assert (status.state, status.attempts, status.slides) == ("done", 1, 2)
+        assert Presentation(status.output_path).slides[0].shapes.title.text == f"Notebook {i}"
+
+
+def test_claims_are_oldest_first_and_exclusive(tmp_path, notebooks):
+    queue = WorkQueue(tmp_path / "queue")
+    first = queue.submit(notebooks[0], tmp_path / "a.pptx")
+    second = queue.submit(notebooks[1], tmp_path / "b.pptx")
+
+    assert queue.claim("w1").id == first.id
+    assert queue.claim("w2").id == second.id
+    assert queue.claim("w3") is None
+    assert queue.status(first.id).worker == "w1"
+
+
+def test_stale_claim_is_retried(tmp_path, notebooks):
+    queue = WorkQueue(tmp_path / "queue")
+    job = queue.submit(notebooks[0], tmp_path / "deck.pptx")
+    _make_stale(queue, queue.claim("crashed"))  # a worker that died mid-job
+
+    assert workqueue.run_worker(queue, stale_after=60, exit_when_idle=True) == 1
+    status = queue.status(job.id)
+    assert (status.state, status.attempts, status.error) == ("done", 2, None)
+    assert (tmp_path / "deck.pptx").exists()
+
+
+def test_fresh_claim_is_left_alone(tmp_path, notebooks):
+    queue = WorkQueue(tmp_path / "queue")
+    queue.submit(notebooks[0], tmp_path / "deck.pptx")
+    queue.claim("busy")
+    assert queue.requeue_stale(stale_after=60) == 0
+    assert queue.counts()["claimed"] == 1
+
+
+def test_claim_of_an_old_submission_is_not_stale(tmp_path, notebooks, monkeypatch):
+    queue = WorkQueue(tmp_path / "queue")
+    job = queue.submit(notebooks[0], tmp_path / "deck.pptx")
+    old = time.time() - 3600  # submitted an hour ago
+    os.utime(queue.directory / "pending" / f"{job.id}.json", (old, old))
+    rename, requeued = os.rename, []
+
+    def rename_then_requeue(src, dst):  # another worker checks for stale claims meanwhile
+        rename(src, dst)
+        if os.path.basename(os.path.dirname(dst)) == "claimed":
+            requeued.append(queue.requeue_stale(stale_after=60))
+
+    monkeypatch.setattr(workqueue.os, "rename", rename_then_requeue)
+    assert queue.claim("w1").id == job.id
+    assert requeued == [0]
+
+
+def test_stale_claim_moves_straight_back_to_pending(tmp_path, notebooks):
+    queue = WorkQueue(tmp_path / "queue")
+    job = queue.submit(notebooks[0], tmp_path / "deck.pptx")
+    _make_stale(queue, queue.claim("crashed"))
+
+    assert queue.requeue_stale(stale_after=60) == 1
+    assert queue.counts() == {"pending": 1, "claimed": 0, "done": 0, "failed": 0}
+    assert sorted(path.name for path in queue.directory.rglob("*")
+                  if path.is_file()) == [f"{job.id}.json"]
+    assert queue.status(job.id).state == "pending"
+
+    retried = queue.claim("w2")
+    assert (retried.attempts, retried.error) == (2, "claim by crashed went stale")
+
+
+def test_job_fails_after_max_attempts(tmp_path, notebooks):
+    queue = WorkQueue(tmp_path / "queue")
+    job = queue.submit(notebooks[0], tmp_path / "deck.pptx")
+    for _ in range(2):
+        _make_stale(queue, queue.claim("crashed"))
+        queue.requeue_stale(stale_after=60, max_attempts=2)
+
+    status = queue.status(job.id)
+    assert status.state == "failed"
+    assert "went stale" in status.error
+
+
+def test_conversion_error_marks_job_failed(tmp_path):
+    broken = tmp_path / "broken.ipynb"
+    broken.write_text("not json")
+    queue = WorkQueue(tmp_path / "queue")
+    job = queue.submit(broken, tmp_path / "broken.pptx")
+
+    assert workqueue.run_worker(queue, exit_when_idle=True) == 1
+    status = queue.status(job.id)
+    assert status.state == "failed"
+    assert status.error
+    assert not (tmp_path / "broken.pptx").exists()
+
+
+def test_submit_and_worker_commands(tmp_path, notebooks, monkeypatch, capsys):
+    queue_dir = tmp_path / "queue"
+    monkeypatch.setattr(sys, "argv", ["jupdeck", "submit", *map(str, notebooks[:2]),
+                                      "--queue", str(queue_dir), "-o", str(tmp_path / "out"),
+                                      "--no-attribution", "--max-table-rows", "10"])
+    cli.main()
+    assert capsys.readouterr().out.count("Queued ") == 2
+    job = WorkQueue(queue_dir).claim("peek")
+    assert job.options["budget"]["max_table_rows"] == 10
+    assert job.options["include_attribution"] is False
+    _make_stale(WorkQueue(queue_dir), job)
+
+    monkeypatch.setattr(sys, "argv", ["jupdeck", "worker", "--queue", str(queue_dir),
+                                      "--exit-when-idle", "--stale-after", "1"])
+    cli.main()
+    out = capsys.readouterr().out
+    assert "Ran 2 job(s); queue: 0 pending, 0 claimed, 2 done, 0 failed" in out
+    assert len(Presentation(tmp_path / "out" / "nb0.pptx").slides) == 1